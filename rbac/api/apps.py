@@ -27,3 +27,9 @@ class ApiConfig(AppConfig):
     """API application configuration."""
 
     name = "api"
+
+    def ready(self):
+        """Connect the database connection metrics."""
+        from rbac.db_connections import connect_signals
+
+        connect_signals()
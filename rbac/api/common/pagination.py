@@ -17,24 +17,100 @@
 
 """Common pagination class."""
 
+import json
 import logging
 import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from urllib.parse import urlparse
 
-from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from management.cache import ListCountCache
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework.response import Response
-from rest_framework.utils.urls import replace_query_param
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 PATH_INFO = "PATH_INFO"
+ESTIMATED_COUNT = "estimated"
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
+def estimate_count(queryset):
+    """Return an estimate of the number of rows of the queryset, as PAGINATION_ESTIMATED_COUNT_STRATEGY chooses.
+
+    The "planner" strategy returns the number of rows the query planner expects, counting exactly below
+    PAGINATION_ESTIMATED_COUNT_EXACT_BELOW rows where the estimate is least reliable and counting is cheap. The
+    "cached" strategy counts exactly and caches the count for PAGINATION_COUNT_CACHE_LIFETIME seconds.
+    """
+    if queryset.query.is_empty():
+        return 0
+    if settings.PAGINATION_ESTIMATED_COUNT_STRATEGY == "cached":
+        sql, params = queryset.order_by().query.sql_with_params()
+        query = f"{sql} {params}"
+        cache = ListCountCache()
+        count = cache.get_count(query)
+        if count is None:
+            count = queryset.count()
+            cache.save_count(query, count)
+        return count
+
+    # psycopg2 parses the JSON plan, which Django dumps back as the plan object rather than a one-element list.
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    plan = plan[0] if isinstance(plan, list) else plan
+    estimate = int(plan["Plan"]["Plan Rows"])
+    if estimate < settings.PAGINATION_ESTIMATED_COUNT_EXACT_BELOW:
+        return queryset.count()
+    return estimate
+
+
 class StandardResultsSetPagination(LimitOffsetPagination):
     """Create standard pagination class with page size."""
 
     default_limit = 10
     max_limit = 1000
+    count_query_param = "count"
+
+    count_estimated = False
+
+    def get_count(self, queryset):
+        """Count the queryset, or estimate the count when the request passes count=estimated."""
+        self.count_estimated = isinstance(queryset, QuerySet) and (
+            self.request.query_params.get(self.count_query_param) == ESTIMATED_COUNT
+        )
+        if self.count_estimated:
+            return estimate_count(queryset)
+        return super().get_count(queryset)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of the queryset, fitting an estimated count to the rows found around the page.
+
+        An estimate may fall short of or beyond the rows there are, so the page reads one more row to tell whether
+        another page follows, and the count becomes exact once a page reaches the last row.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = self.get_count(queryset)
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if not self.count_estimated:
+            if self.count == 0 or self.offset > self.count:
+                return []
+            return list(queryset[self.offset : self.offset + self.limit])  # noqa: E203
+
+        rows = list(queryset[self.offset : self.offset + self.limit + 1])  # noqa: E203
+        if len(rows) > self.limit:
+            self.count = max(self.count, self.offset + len(rows))
+        elif rows or not self.offset:
+            self.count = self.offset + len(rows)
+        else:
+            self.count = min(self.count, self.offset)
+        return rows[: self.limit]
 
     @staticmethod
     def link_rewrite(request, link):
@@ -119,6 +195,185 @@ class V2ResultsSetPagination(StandardResultsSetPagination):
         return super().paginate_queryset(queryset, request, view)
 
 
+class KeysetResultsSetPagination(StandardResultsSetPagination):
+    """Standard pagination walking a unique ordering with keyset cursors instead of OFFSET.
+
+    A page is selected by comparing the ordering columns with the ones of the row ending the previous page, so deep
+    pages cost as much as the first one. Requests passing an offset, or ordered by anything but a prefix of
+    keyset_ordering, keep using limit and offset. The response has the standard meta and links, with the links
+    carrying a cursor and meta.offset being null when it is unknown.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    # None of the columns may be null, and the last one must be unique.
+    keyset_ordering = ("-created", "-id")
+
+    keyset = False
+
+    def get_keyset_ordering(self, queryset, request, view=None):
+        """Return the unique ordering to walk with cursors, or None to use limit and offset."""
+        ordering = tuple(queryset.query.order_by)
+        if self.offset_query_param in request.query_params or ordering != self.keyset_ordering[: len(ordering)]:
+            return None
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of the queryset following the cursor, or the offset page if no keyset applies."""
+        keyset_ordering = self.get_keyset_ordering(queryset, request, view)
+        self.keyset = keyset_ordering is not None
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.columns = [order.lstrip("-") for order in keyset_ordering]
+        self.fields = [self._keyset_field(queryset, column) for column in self.columns]
+        self.reverse, position = self.decode_cursor(request)
+        self.count = self.get_count(queryset)
+
+        ordering = keyset_ordering
+        if self.reverse:
+            ordering = tuple(order[1:] if order.startswith("-") else f"-{order}" for order in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._following(ordering, position))
+
+        rows = list(queryset[: self.limit + 1])
+        has_more = len(rows) > self.limit
+        self.page = rows[: self.limit]
+        if self.reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, position is not None
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if position is None and not (self.reverse and self.count_estimated):
+            self.offset = self.count - len(self.page) if self.reverse else 0
+        else:
+            self.offset = None
+        return self.page
+
+    @staticmethod
+    def _keyset_field(queryset, column):
+        """Return the model field or annotation output field of an ordering column."""
+        if column in queryset.query.annotations:
+            return queryset.query.annotations[column].output_field
+        return queryset.model._meta.get_field(column)
+
+    def _following(self, ordering, position):
+        """Return the condition selecting the rows after position in ordering.
+
+        The redundant bound on the first column lets the database start an index scan at the position.
+        """
+        following = Q()
+        equal = Q()
+        for order, value in zip(ordering, position):
+            name = order.lstrip("-")
+            following |= equal & Q(**{f"{name}__{'lt' if order.startswith('-') else 'gt'}": value})
+            equal &= Q(**{name: value})
+        first = ordering[0]
+        bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": position[0]})
+        return bound & following
+
+    def decode_cursor(self, request):
+        """Return whether the cursor walks backwards, and the position it starts after."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = cursor["p"]
+            if position is not None:
+                if len(position) != len(self.fields):
+                    raise ValueError(position)
+                position = [field.to_python(value) for field, value in zip(self.fields, position)]
+            return bool(cursor["r"]), position
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _cursor_value(value):
+        """Return the cursor representation of a column value, which the column field parses back."""
+        return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+    def encode_cursor(self, reverse, row=None):
+        """Return the link to the page before or after the given row, or to the last page if there is no row."""
+        position = None
+        if row is not None:
+            position = [self._cursor_value(getattr(row, column)) for column in self.columns]
+        cursor = urlsafe_b64encode(json.dumps({"r": reverse, "p": position}).encode("ascii")).decode("ascii")
+        url = replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return StandardResultsSetPagination.link_rewrite(self.request, url)
+
+    def get_first_link(self):
+        """Create first link, without a cursor when walking keysets."""
+        if not self.keyset:
+            return super().get_first_link()
+        url = remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return StandardResultsSetPagination.link_rewrite(self.request, url)
+
+    def get_next_link(self):
+        """Create next link, with the cursor following the last row of the page when walking keysets."""
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return self.encode_cursor(False, self.page[-1] if self.page else None)
+
+    def get_previous_link(self):
+        """Create previous link, with the cursor preceding the first row of the page when walking keysets."""
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(True, self.page[0] if self.page else None)
+
+    def get_last_link(self):
+        """Create last link, with a cursor walking back from the end when walking keysets."""
+        if not self.keyset:
+            return super().get_last_link()
+        return self.encode_cursor(True)
+
+
+class OptInKeysetResultsSetPagination(KeysetResultsSetPagination):
+    """Standard pagination walking keyset cursors for the requests passing a cursor, even an empty one.
+
+    The keyset is the ordering of the list followed by the primary key, as long as the list is ordered by the
+    columns the view names in keyset_ordering_fields, none of which may be null. Other requests keep using limit and
+    offset. The first link carries an empty cursor so that following it stays on keysets.
+    """
+
+    def get_keyset_ordering(self, queryset, request, view=None):
+        """Return the ordering of the list followed by the primary key, or None to use limit and offset."""
+        if (
+            self.cursor_query_param not in request.query_params
+            or self.offset_query_param in request.query_params
+            or not isinstance(queryset, QuerySet)
+            or queryset.query.values_select
+            or queryset.query.combinator
+        ):
+            return None
+        ordering = tuple(queryset.query.order_by) or tuple(queryset.model._meta.ordering)
+        keyset_fields = getattr(view, "keyset_ordering_fields", ())
+        if not all(isinstance(order, str) and order.lstrip("-") in keyset_fields for order in ordering):
+            return None
+        pk = queryset.model._meta.pk.name
+        return (*ordering, f"-{pk}" if ordering and ordering[-1].startswith("-") else pk)
+
+    def get_first_link(self):
+        """Create first link, with an empty cursor when walking keysets."""
+        if not self.keyset:
+            return super().get_first_link()
+        url = replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, "")
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return StandardResultsSetPagination.link_rewrite(self.request, url)
+
+
 class V2CursorPagination(CursorPagination):
     """Cursor-based pagination for V2 APIs.
 
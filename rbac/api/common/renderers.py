@@ -25,3 +25,10 @@ class ProblemJSONRenderer(JSONRenderer):
 
     media_type = "application/problem+json"
     format = "json"
+
+
+class NDJSONRenderer(JSONRenderer):
+    """Renderer for accepting application/x-ndjson in Accept header on streaming exports."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
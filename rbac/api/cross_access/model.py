@@ -43,6 +43,16 @@ class CrossAccountRequest(models.Model):
     status = models.CharField(max_length=10, default="pending")
     roles = models.ManyToManyField("management.Role", through="RequestsRoles")
 
+    class Meta:
+        indexes = [
+            # Lets the daily expiry job find the requests that are due without scanning the live ones.
+            models.Index(
+                fields=["end_date"],
+                condition=models.Q(status__in=["pending", "approved"]),
+                name="api_car_expiry_candidates_idx",
+            )
+        ]
+
     def validate_date(self, date):
         """Validate that end dates are not in the past."""
         if isinstance(date, datetime.datetime) and date.date() < timezone.now().date():
@@ -18,47 +18,124 @@
 """Handler for cross-account request clean up."""
 
 import logging
+from collections import defaultdict
+from typing import Optional
 
-from django.db.models import Q
 from django.utils import timezone
 from management.atomic_transactions import atomic_block
 from management.models import Principal
-from management.relation_replicator.relation_replicator import ReplicationEventType
+from management.relation_replicator.logging_replicator import stringify_spicedb_relationship
+from management.relation_replicator.outbox_replicator import OutboxReplicator
+from management.relation_replicator.relation_replicator import (
+    PartitionKey,
+    RelationReplicator,
+    ReplicationEvent,
+    ReplicationEventType,
+    WorkspaceEvent,
+)
 
 from api.cross_access.relation_api_dual_write_cross_access_handler import RelationApiDualWriteCrossAccessHandler
 from api.models import CrossAccountRequest, Tenant
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+EXPIRY_BATCH_SIZE = 500
 
-def check_cross_request_expiry():
-    """Check if a cross-account requests have expired, tag them if so."""
-    expired_cars = []
-    cars = CrossAccountRequest.objects.filter(Q(status="pending") | Q(status="approved"))
-    logger.info("Running expiry check on %d cross-account requests.", len(cars))
-    for car in cars:
+
+class _ExpiryReplicator(RelationReplicator):
+    """Collect the relations of expiring requests so that they are replicated once per target org."""
+
+    def __init__(self):
+        self.events: dict[str, dict] = defaultdict(lambda: {"request_ids": [], "remove": [], "add": []})
+
+    def replicate(self, event: ReplicationEvent):
+        collected = self.events[event.event_info["org_id"]]
+        collected["remove"].extend(event.remove)
+        collected["add"].extend(event.add)
+
+    def replicate_workspace(self, event: WorkspaceEvent):
+        raise NotImplementedError("workspace events not supported")
+
+
+def _unique(relationships):
+    """Drop relationships already generated by another request of the same batch."""
+    return list({stringify_spicedb_relationship(rel): rel for rel in relationships}.values())
+
+
+def check_cross_request_expiry(replicator: Optional[RelationReplicator] = None):
+    """Tag the pending and approved cross-account requests whose end date has passed as expired.
+
+    Only the requests due are selected, in batches ordered by primary key. Each batch is locked with SKIP LOCKED
+    so that requests being changed concurrently are left for the next run instead of blocking it.
+    """
+    now = timezone.now()
+    replicator = replicator if replicator else OutboxReplicator()
+    expired = 0
+    last_pk = None
+    while True:
         # This can operate on V2 tenants, so we must use a SERIALIZABLE transaction here.
         with atomic_block():
-            logger.debug("Checking for expiration of cross-account request %s.", car.pk)
-            # Lock CAR so that the status and roles do not concurrently change
-            car = CrossAccountRequest.objects.select_for_update().get(pk=car.pk)
-            if car.end_date < timezone.now():
-                logger.info("Expiring cross-account request with uuid: %s", car.pk)
-                create_cross_principal(car.user_id, car.target_org)
-                cross_account_roles = car.roles.all()
-                if car.status == "approved" and any(True for _ in cross_account_roles):
-                    dual_write_handler = RelationApiDualWriteCrossAccessHandler(
-                        car, ReplicationEventType.EXPIRE_CROSS_ACCOUNT_REQUEST
-                    )
-                    dual_write_handler.generate_relations_to_remove_roles(cross_account_roles)
-                    dual_write_handler.replicate()
-
-                car.status = "expired"
-                expired_cars.append(car.pk)
-
-                car.save()
-
-    logger.info("Completed clean up of %d cross-account requests, %d expired.", len(cars), len(expired_cars))
+            # Lock CARs so that the status and roles do not concurrently change
+            candidates = CrossAccountRequest.objects.select_for_update(skip_locked=True).filter(
+                status__in=["pending", "approved"], end_date__lt=now
+            )
+            if last_pk is not None:
+                candidates = candidates.filter(pk__gt=last_pk)
+            batch = list(candidates.order_by("pk")[:EXPIRY_BATCH_SIZE])
+            if not batch:
+                break
+            _expire_cross_account_requests(batch, now, replicator)
+
+        expired += len(batch)
+        last_pk = batch[-1].pk
+
+    logger.info("Completed clean up of cross-account requests, %d expired.", expired)
+
+
+def _expire_cross_account_requests(cars, now, replicator: RelationReplicator):
+    """Expire a locked batch of cross-account requests, replicating the removed bindings once per target org."""
+    tenants = Tenant.objects.in_bulk({car.target_org for car in cars}, field_name="org_id")
+    Principal.objects.bulk_create(
+        [
+            Principal(
+                username=get_cross_principal_name(car.target_org, car.user_id),
+                cross_account=True,
+                tenant=tenants[car.target_org],
+            )
+            for car in cars
+        ],
+        ignore_conflicts=True,
+    )
+
+    collector = _ExpiryReplicator()
+    for car in cars:
+        logger.info("Expiring cross-account request with uuid: %s", car.pk)
+        cross_account_roles = car.roles.all()
+        if car.status == "approved" and any(True for _ in cross_account_roles):
+            dual_write_handler = RelationApiDualWriteCrossAccessHandler(
+                car, ReplicationEventType.EXPIRE_CROSS_ACCOUNT_REQUEST, replicator=collector
+            )
+            dual_write_handler.generate_relations_to_remove_roles(cross_account_roles)
+            dual_write_handler.replicate()
+            if car.target_org in collector.events:
+                collector.events[car.target_org]["request_ids"].append(str(car.pk))
+
+    CrossAccountRequest.objects.filter(pk__in=[car.pk for car in cars]).update(status="expired", modified=now)
+
+    for org_id, collected in collector.events.items():
+        replicator.replicate(
+            ReplicationEvent(
+                event_type=ReplicationEventType.EXPIRE_CROSS_ACCOUNT_REQUEST,
+                info={
+                    "org_id": org_id,
+                    "target_org": org_id,
+                    "request_ids": collected["request_ids"],
+                },
+                partition_key=PartitionKey.byEnvironment(),
+                remove=_unique(collected["remove"]),
+                add=_unique(collected["add"]),
+            )
+        )
 
 
 def create_cross_principal(user_id, target_org=None):
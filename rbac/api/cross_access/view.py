@@ -28,6 +28,7 @@ from management.principal.proxy import PrincipalProxy
 from management.relation_replicator.relation_replicator import ReplicationEventType
 from management.utils import raise_validation_error, validate_and_get_key, validate_uuid
 from rest_framework import mixins, viewsets
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import OrderingFilter
 
 from api.cross_access.access_control import CrossAccountRequestAccessPermission
@@ -157,9 +158,9 @@ class CrossAccountRequestViewSet(
 
         if validate_and_get_key(self.request.query_params, QUERY_BY_KEY, VALID_QUERY_BY_KEY, ORG_ID) == ORG_ID:
             user_id = result.data.pop("user_id")
-            principal = PROXY.request_filtered_principals(
-                [user_id], org_id=None, options={"query_by": "user_id", "return_id": True}
-            ).get("data")[0]
+            principal = PROXY.request_principal_profiles([user_id]).get(str(user_id))
+            if principal is None:
+                raise NotFound(f"The requester {user_id} of the cross-account request could not be found.")
 
             # Replace the user_id with user's info
             result.data.update(
@@ -175,18 +176,16 @@ class CrossAccountRequestViewSet(
         """Replace user id with user's info."""
         # Get principals through user_ids from BOP
         user_ids = [element["user_id"] for element in result.data["data"]]
-        bop_resp = PROXY.request_filtered_principals(
-            user_ids, org_id=None, options={"query_by": "user_id", "return_id": True}
-        )
+        profiles = PROXY.request_principal_profiles(user_ids)
 
         # Make a mapping: user_id => principal
         principals = {
-            str(principal["user_id"]): {
+            user_id: {
                 "first_name": principal["first_name"],
                 "last_name": principal["last_name"],
                 "email": principal["email"],
             }
-            for principal in bop_resp["data"]
+            for user_id, principal in profiles.items()
         }
 
         # Replace the user_id with user's info
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-18 12:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("api", "0016_tenant_relations_consistency_token"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="crossaccountrequest",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "approved"])),
+                fields=["end_date"],
+                name="api_car_expiry_candidates_idx",
+            ),
+        ),
+    ]
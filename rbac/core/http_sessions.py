@@ -0,0 +1,116 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Pooled keep-alive HTTP sessions for the upstream services RBAC calls."""
+
+import os
+import threading
+
+import requests
+from django.conf import settings
+from prometheus_client import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BOP_UPSTREAM = "bop"
+IT_UPSTREAM = "it"
+JWKS_UPSTREAM = "jwks"
+
+RETRY_STATUS_CODES = (502, 503, 504)
+
+http_requests_total = Counter(
+    "rbac_http_requests_total",
+    "Number of requests sent to an upstream service, by whether they reused a pooled connection",
+    ["upstream", "connection"],
+)
+http_pool_exhausted_total = Counter(
+    "rbac_http_pool_exhausted_total",
+    "Number of requests that found every pooled connection to an upstream service in use",
+    ["upstream"],
+)
+
+
+class UpstreamAdapter(HTTPAdapter):
+    """An HTTPAdapter applying a default timeout and recording connection reuse for one upstream service."""
+
+    def __init__(self, upstream: str, timeout: float, **kwargs):
+        """Create the adapter for the given upstream."""
+        self.upstream = upstream
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send the request, using the upstream's timeout unless the caller gave one."""
+        pool = self.get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+        if pool.pool is not None and pool.pool.empty():
+            # Every connection is checked out, so this request has to open one that will not be kept.
+            http_pool_exhausted_total.labels(upstream=self.upstream).inc()
+
+        opened = pool.num_connections
+        try:
+            return super().send(
+                request,
+                stream=stream,
+                timeout=self.timeout if timeout is None else timeout,
+                verify=verify,
+                cert=cert,
+                proxies=proxies,
+            )
+        finally:
+            connection = "reused" if pool.num_connections == opened else "new"
+            http_requests_total.labels(upstream=self.upstream, connection=connection).inc()
+
+
+def _build_session(upstream: str, timeout: float) -> requests.Session:
+    retry = Retry(
+        total=settings.HTTP_RETRY_TOTAL,
+        backoff_factor=settings.HTTP_RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = UpstreamAdapter(upstream, timeout, pool_maxsize=settings.HTTP_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def upstream_session(upstream: str, timeout: float) -> requests.Session:
+    """Return this process's session for the given upstream, creating it on first use.
+
+    Connections are kept alive in a pool shared by the threads of the process. Only idempotent requests are retried
+    on gateway errors, while connection failures are retried for every method since nothing was sent yet.
+    """
+    with _sessions_lock:
+        session = _sessions.get(upstream)
+        if session is None:
+            session = _sessions[upstream] = _build_session(upstream, timeout)
+        return session
+
+
+def _reset_sessions():
+    """Forget the sessions inherited from the parent, so that a forked worker opens its own connections."""
+    global _sessions_lock
+
+    _sessions.clear()
+    _sessions_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_sessions)
@@ -16,15 +16,43 @@
 #
 """Producer to send messages to kafka server."""
 
+import atexit
 import json
 import logging
+import os
+import queue
+import threading
+import time
 
 from django.conf import settings
+from django.db import transaction
 from kafka import KafkaProducer
 from kafka.errors import KafkaError
+from prometheus_client import Counter, Gauge
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+kafka_producer_queue_depth = Gauge(
+    "rbac_kafka_producer_queue_depth",
+    "Messages waiting in the background delivery queue",
+    multiprocess_mode="livesum",
+)
+kafka_producer_messages_dropped_total = Counter(
+    "rbac_kafka_producer_messages_dropped_total",
+    "Messages dropped because the background delivery queue was full",
+    ["topic"],
+)
+kafka_producer_messages_coalesced_total = Counter(
+    "rbac_kafka_producer_messages_coalesced_total",
+    "Duplicate messages skipped because an identical message was already pending",
+    ["topic"],
+)
+kafka_producer_delivery_total = Counter(
+    "rbac_kafka_producer_delivery_total",
+    "Delivery reports received from the broker",
+    ["topic", "status"],
+)
+
 
 class FakeKafkaProducer:
     """Fake kafka producer to enable local development without kafka server."""
@@ -33,6 +61,95 @@ class FakeKafkaProducer:
         """No operation method."""
         pass
 
+    def flush(self, timeout=None):
+        """No operation method."""
+        pass
+
+
+class KafkaDeliveryQueue:
+    """
+    Deliver Kafka messages from a background thread.
+
+    Messages are collected for a short window before being handed to the producer, and messages sharing a
+    coalesce key within that window are only sent once. The worker thread is started lazily and restarted
+    after a fork, since threads do not survive into gunicorn workers. When the process exits, the queue is drained
+    and the producers flushed, so that messages queued after a commit are not lost when a worker restarts.
+    """
+
+    def __init__(self, max_size, coalesce_window_seconds):
+        """Create the queue without starting the worker."""
+        self._queue = queue.Queue(maxsize=max_size)
+        self._coalesce_window_seconds = coalesce_window_seconds
+        self._lock = threading.Lock()
+        self._pid = None
+        self._producers = set()
+
+    def put(self, producer, topic, value, headers=None, coalesce_key=None):
+        """Queue a message for delivery, dropping it if the queue is full."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((producer, topic, value, headers, coalesce_key))
+        except queue.Full:
+            kafka_producer_messages_dropped_total.labels(topic=topic).inc()
+            logger.error(f"Kafka delivery queue is full, dropping message for topic {topic}")
+            return
+        kafka_producer_queue_depth.inc()
+
+    def drain(self, timeout):
+        """Wait for the queued messages to be handed to the producers and flush them, for up to timeout seconds."""
+        if self._pid != os.getpid():
+            return
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(
+                        f"Gave up draining the Kafka delivery queue with {self._queue.unfinished_tasks} messages"
+                    )
+                    break
+                self._queue.all_tasks_done.wait(remaining)
+        for producer in list(self._producers):
+            try:
+                producer.get_producer().flush(timeout=max(deadline - time.monotonic(), 0))
+            except Exception as e:
+                logger.error(f"Failed to flush Kafka producer: {e}")
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="rbac-kafka-delivery", daemon=True).start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._coalesce_window_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        kafka_producer_queue_depth.dec(len(batch))
+        return batch
+
+    def _run(self):
+        while True:
+            pending = set()
+            for producer, topic, value, headers, coalesce_key in self._next_batch():
+                try:
+                    if coalesce_key is not None:
+                        if (topic, coalesce_key) in pending:
+                            kafka_producer_messages_coalesced_total.labels(topic=topic).inc()
+                            continue
+                        pending.add((topic, coalesce_key))
+                    self._producers.add(producer)
+                    producer.deliver(topic, value, headers)
+                except Exception as e:
+                    logger.error(f"Failed to deliver Kafka message for topic {topic}: {e}")
+                finally:
+                    self._queue.task_done()
+
 
 class RBACProducer:
     """Kafka message producer to emit events to notification service."""
@@ -49,13 +166,15 @@ class RBACProducer:
                 while retries <= max_retries:
                     try:
                         if settings.KAFKA_AUTH:
-                            self.producer = KafkaProducer(**settings.KAFKA_AUTH)
+                            self.producer = KafkaProducer(**settings.KAFKA_AUTH, **settings.KAFKA_PRODUCER_CONFIG)
                             logger.info("Kafka producer initialized successfully")
                             return self.producer
                         elif not settings.KAFKA_SERVERS:
                             raise AttributeError("Empty servers list")
                         else:
-                            self.producer = KafkaProducer(bootstrap_servers=settings.KAFKA_SERVERS)
+                            self.producer = KafkaProducer(
+                                bootstrap_servers=settings.KAFKA_SERVERS, **settings.KAFKA_PRODUCER_CONFIG
+                            )
                             return self.producer
                     except KafkaError as e:
                         logger.error(f"Kafka error during initialization of Kafka producer: {e}")
@@ -65,13 +184,47 @@ class RBACProducer:
                         retries += 1
         return self.producer
 
-    def send_kafka_message(self, topic, message, headers=None):
-        """Send message to kafka server."""
-        producer = self.get_producer()
+    def send_kafka_message(self, topic, message, headers=None, coalesce_key=None):
+        """
+        Send message to kafka server.
+
+        With KAFKA_PRODUCER_ASYNC_ENABLED the message is queued once the current transaction commits and sent
+        from a background thread; messages with the same coalesce_key are collapsed within the batching window.
+        """
         json_data = json.dumps(message).encode("utf-8")
         if headers and not isinstance(headers, list):
             headers = [headers]
-        producer.send(topic, value=json_data, headers=headers)
+        if settings.KAFKA_PRODUCER_ASYNC_ENABLED:
+            transaction.on_commit(lambda: _delivery_queue().put(self, topic, json_data, headers, coalesce_key))
+            return
+        self.deliver(topic, json_data, headers)
+
+    def deliver(self, topic, value, headers=None):
+        """Hand an encoded message to the producer and record its delivery report."""
+        future = self.get_producer().send(topic, value=value, headers=headers)
+        if future is not None:
+            future.add_callback(lambda _: kafka_producer_delivery_total.labels(topic=topic, status="success").inc())
+            future.add_errback(lambda e: _delivery_failed(topic, e))
+
+
+def _delivery_failed(topic, error):
+    kafka_producer_delivery_total.labels(topic=topic, status="failure").inc()
+    logger.error(f"Kafka message delivery to topic {topic} failed: {error}")
+
+
+_shared_queue = None
+_shared_queue_lock = threading.Lock()
+
+
+def _delivery_queue():
+    global _shared_queue
+    with _shared_queue_lock:
+        if _shared_queue is None:
+            _shared_queue = KafkaDeliveryQueue(
+                settings.KAFKA_PRODUCER_QUEUE_MAX_SIZE, settings.KAFKA_PRODUCER_COALESCE_WINDOW_SECONDS
+            )
+            atexit.register(_shared_queue.drain, settings.KAFKA_PRODUCER_SHUTDOWN_TIMEOUT_SECONDS)
+        return _shared_queue
 
 
 """
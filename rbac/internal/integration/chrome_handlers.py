@@ -17,6 +17,7 @@
 
 """Notification handlers of object change."""
 
+import copy
 import json
 import logging
 import os
@@ -36,7 +37,7 @@ with open(os.path.join(settings.BASE_DIR, "internal", "integration", "chrome_mes
 
 def build_chrome_message(event_type, uuid, org_id):
     """Create message based on template."""
-    message = message_template
+    message = copy.deepcopy(message_template)
     message["id"] = str(uuid4())
     message["time"] = timezone.now().isoformat()
     message["data"]["organizations"] = [org_id]
@@ -17,9 +17,12 @@
 
 """Model for audit logging."""
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from management.audit_log import sink
 from management.group.model import Group
 from management.permission.model import PermissionValue
 from management.role.model import Role
@@ -83,12 +86,14 @@ class AuditLog(TenantAwareModel):
         """Metadata for audit log model."""
 
         indexes = [
-            # Composite index for common query pattern: tenant + created (for ordering)
-            models.Index(fields=["tenant", "created"]),
+            # Composite index for common query pattern: tenant + created, id (for keyset pagination)
+            models.Index(fields=["tenant", "created", "id"], name="auditlog_tenant_created_id_idx"),
             # Index for filtering by tenant and resource_type
             models.Index(fields=["tenant", "resource_type"]),
             # Index for filtering by tenant and action
             models.Index(fields=["tenant", "action"]),
+            # Trigram index for principal username substring search, which compares upper-cased values
+            GinIndex(OpClass(Upper("principal_username"), name="gin_trgm_ops"), name="auditlog_username_trgm_idx"),
         ]
 
     @staticmethod
@@ -105,9 +110,15 @@ class AuditLog(TenantAwareModel):
         return resource_type
 
     def get_tenant_id(self, request):
-        """Retrieve tenant id from request."""
-        tenant_object = get_object_or_404(Tenant, org_id=request._user.org_id)
-        return tenant_object.id
+        """Retrieve tenant id from request, looking it up once per request."""
+        org_id = request._user.org_id
+        cached = getattr(request, "_audit_log_tenant", None)
+        if cached is None or cached[0] != org_id:
+            tenant = getattr(request, "tenant", None)
+            if not isinstance(tenant, Tenant) or tenant.org_id != org_id:
+                tenant = get_object_or_404(Tenant, org_id=org_id)
+            cached = request._audit_log_tenant = (org_id, tenant.id)
+        return cached[1]
 
     def get_resource_item(self, r_type, request, *args, **kwargs):
         """Find related information (eg, name, id, etc...) for each resource item."""
@@ -188,7 +199,7 @@ class AuditLog(TenantAwareModel):
         self.description = description[:255]
         self.action = action
         self.tenant_id = self.get_tenant_id(request)
-        super(AuditLog, self).save()
+        sink.record(self)
 
     def log_create(self, request, resource):
         """Audit Log when a role or a group is created."""
@@ -201,7 +212,7 @@ class AuditLog(TenantAwareModel):
 
         self.action = AuditLog.CREATE
         self.tenant_id = self.get_tenant_id(request)
-        super(AuditLog, self).save()
+        sink.record(self)
 
     def log_delete(self, request, resource, object):
         """Audit Log when a role or a group is deleted."""
@@ -216,7 +227,7 @@ class AuditLog(TenantAwareModel):
 
         self.action = AuditLog.DELETE
         self.tenant_id = self.get_tenant_id(request)
-        super(AuditLog, self).save()
+        sink.record(self)
 
     def log_edit(self, request, resource, object):
         """Audit Log when a role or a group is edit."""
@@ -231,7 +242,7 @@ class AuditLog(TenantAwareModel):
         self.description = more_information
         self.action = AuditLog.EDIT
         self.tenant_id = self.get_tenant_id(request)
-        super(AuditLog, self).save()
+        sink.record(self)
 
     def log_group_assignment(
         self, request, resource_type, resource, secondary_resource_object, assigned_resource_type
@@ -261,7 +272,7 @@ class AuditLog(TenantAwareModel):
 
         self.action = AuditLog.ADD
         self.tenant_id = self.get_tenant_id(request)
-        super(AuditLog, self).save()
+        sink.record(self)
 
     def log_group_remove(self, request, resource_type, resource, secondary_resource_object, assigned_resource_type):
         """Audit Log when a role, user/principal, or service account is removed from a group."""
@@ -291,4 +302,4 @@ class AuditLog(TenantAwareModel):
 
         self.action = AuditLog.REMOVE
         self.tenant_id = self.get_tenant_id(request)
-        super(AuditLog, self).save()
+        sink.record(self)
@@ -0,0 +1,141 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Maintenance of the monthly partitions of the audit log table."""
+
+import datetime
+import logging
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+TABLE_NAME = "management_auditlog"
+DEFAULT_PARTITION_NAME = f"{TABLE_NAME}_default"
+PARTITION_NAME_PATTERN = re.compile(rf"^{TABLE_NAME}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value: datetime.datetime, months: int = 0) -> datetime.datetime:
+    """Return the start of the month of the given time in UTC, moved by the given number of months."""
+    value = value.astimezone(datetime.timezone.utc)
+    year, month = divmod(value.year * 12 + value.month - 1 + months, 12)
+    return datetime.datetime(year, month + 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def partition_name(month: datetime.datetime) -> str:
+    """Return the name of the partition holding the entries created in the given month."""
+    return f"{TABLE_NAME}_p{month.year:04d}_{month.month:02d}"
+
+
+def existing_partitions() -> dict[datetime.datetime, str]:
+    """Return the monthly partitions of the audit log table by the month they hold."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [TABLE_NAME],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match:
+            partitions[datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.timezone.utc)] = name
+    return partitions
+
+
+def create_partition(month: datetime.datetime):
+    """Create the partition for the given month.
+
+    Entries of that month which were written to the default partition, because their partition did not exist yet,
+    are moved to the new one.
+    """
+    name = partition_name(month)
+    bounds = [month, month_start(month, 1)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION_NAME} WHERE created >= %s AND created < %s)", bounds
+        )
+        (has_default_rows,) = cursor.fetchone()
+        if has_default_rows:
+            cursor.execute(f"ALTER TABLE {TABLE_NAME} DETACH PARTITION {DEFAULT_PARTITION_NAME}")
+        cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE_NAME} FOR VALUES FROM (%s) TO (%s)", bounds)
+        if has_default_rows:
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION_NAME} WHERE created >= %s AND created < %s RETURNING *
+                )
+                INSERT INTO {TABLE_NAME} SELECT * FROM moved
+                """,
+                bounds,
+            )
+            cursor.execute(f"ALTER TABLE {TABLE_NAME} ATTACH PARTITION {DEFAULT_PARTITION_NAME} DEFAULT")
+    logger.info(f"Created audit log partition {name}.")
+
+
+def ensure_partitions(months_ahead: int | None = None) -> list[str]:
+    """Create the partitions of the current month and of the given number of months ahead that are missing."""
+    if months_ahead is None:
+        months_ahead = settings.AUDIT_LOG_PARTITION_PREMAKE_MONTHS
+    existing = existing_partitions()
+    current = month_start(timezone.now())
+    created = []
+    for months in range(months_ahead + 1):
+        month = month_start(current, months)
+        if month not in existing:
+            create_partition(month)
+            created.append(partition_name(month))
+    return created
+
+
+def drop_expired_partitions(retention_months: int | None = None) -> list[str]:
+    """Drop the partitions only holding entries older than the retention period.
+
+    A retention of 0 months keeps every entry. Expired entries left in the default partition are deleted.
+    """
+    if retention_months is None:
+        retention_months = settings.AUDIT_LOG_RETENTION_MONTHS
+    if retention_months <= 0:
+        return []
+
+    cutoff = month_start(timezone.now(), -retention_months)
+    dropped = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(existing_partitions().items()):
+            if month_start(month, 1) > cutoff:
+                continue
+            cursor.execute(f"DROP TABLE {name}")
+            dropped.append(name)
+            logger.info(f"Dropped audit log partition {name}.")
+        cursor.execute(f"DELETE FROM {DEFAULT_PARTITION_NAME} WHERE created < %s", [cutoff])
+    return dropped
+
+
+def maintain_partitions() -> dict[str, list[str]]:
+    """Create the upcoming partitions of the audit log table and drop the expired ones."""
+    created = ensure_partitions()
+    dropped = drop_expired_partitions()
+    return {"created": created, "dropped": dropped}
@@ -0,0 +1,200 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Batched writing of audit log entries."""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+audit_log_buffered_entries = Gauge(
+    "rbac_audit_log_buffered_entries",
+    "Audit log entries handed to the writer but not yet written",
+    multiprocess_mode="livesum",
+)
+audit_log_flush_seconds = Histogram(
+    "rbac_audit_log_flush_seconds",
+    "Time spent writing a batch of audit log entries",
+    ["mode"],
+)
+audit_log_entries_dropped_total = Counter(
+    "rbac_audit_log_entries_dropped_total",
+    "Audit log entries dropped because the out-of-band queue was full",
+)
+
+
+class PendingAuditLogs:
+    """The entries recorded within one transaction or savepoint, written together once it commits."""
+
+    def __init__(self):
+        """Create an empty batch."""
+        self.entries = []
+        self.flushed = False
+
+    def flush(self):
+        """Write the collected entries."""
+        entries, self.entries = self.entries, []
+        self.flushed = True
+        write(entries)
+
+
+def record(entry):
+    """Record an unsaved AuditLog to be written when the current transaction commits.
+
+    Entries recorded in the same transaction and savepoint share a single transaction.on_commit callback, so they are
+    written with one bulk_create. Entries recorded outside a transaction are written immediately, and entries of a
+    rolled back transaction are discarded along with its callbacks.
+    """
+    if not connection.in_atomic_block:
+        write([entry])
+        return
+
+    # The batches are only referenced weakly here: the callback Django holds keeps a batch alive, so a batch whose
+    # savepoint or transaction is rolled back goes away with its callback instead of collecting further entries.
+    batches = _pending_batches()
+    key = tuple(connection.savepoint_ids)
+    pending = batches.get(key)
+    # A batch run early, as captureOnCommitCallbacks does in tests, is not run again on commit.
+    if pending is None or pending.flushed:
+        pending = PendingAuditLogs()
+        batches[key] = pending
+        transaction.on_commit(pending.flush, robust=True)
+    pending.entries.append(entry)
+
+
+_local = threading.local()
+
+
+def _pending_batches():
+    """Return the unwritten batches of the current thread's connection by the savepoints they were recorded in."""
+    if not hasattr(_local, "batches"):
+        _local.batches = weakref.WeakValueDictionary()
+    return _local.batches
+
+
+def write(entries):
+    """Write entries now, or hand them to the out-of-band writer when AUDIT_LOG_OUT_OF_BAND_ENABLED is set."""
+    if not entries:
+        return
+    audit_log_buffered_entries.inc(len(entries))
+    if settings.AUDIT_LOG_OUT_OF_BAND_ENABLED:
+        _writer().put(entries)
+        return
+    _bulk_create(entries, mode="inline")
+
+
+def _bulk_create(entries, mode):
+    from management.audit_log.model import AuditLog
+
+    try:
+        with audit_log_flush_seconds.labels(mode=mode).time():
+            AuditLog.objects.bulk_create(entries, batch_size=settings.AUDIT_LOG_BATCH_SIZE)
+    finally:
+        audit_log_buffered_entries.dec(len(entries))
+
+
+class OutOfBandAuditLogWriter:
+    """
+    Write audit log entries from a background thread.
+
+    Meant for high-volume internal jobs, where entries are coalesced into batches of up to AUDIT_LOG_BATCH_SIZE
+    instead of being written by the job itself. The worker thread is started lazily and restarted after a fork.
+    """
+
+    def __init__(self, max_size):
+        """Create the queue without starting the worker."""
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def put(self, entries):
+        """Queue entries for writing, dropping them if the queue is full."""
+        self._ensure_worker()
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                audit_log_entries_dropped_total.inc()
+                audit_log_buffered_entries.dec()
+                logger.error(f"Audit log queue is full, dropping entry: {entry.description}")
+
+    def join(self):
+        """Wait until every queued entry has been written."""
+        self._queue.join()
+
+    def drain(self, timeout):
+        """Wait for the queued entries to be written, for up to timeout seconds."""
+        if self._pid != os.getpid():
+            return
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(f"Gave up draining the audit log queue with {self._queue.unfinished_tasks} entries")
+                    break
+                self._queue.all_tasks_done.wait(remaining)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="rbac-audit-log-writer", daemon=True).start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < settings.AUDIT_LOG_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                _bulk_create(batch, mode="out_of_band")
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} audit log entries: {e}")
+            finally:
+                close_old_connections()
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_shared_writer = None
+_shared_writer_lock = threading.Lock()
+
+
+def _writer():
+    global _shared_writer
+    with _shared_writer_lock:
+        if _shared_writer is None:
+            _shared_writer = OutOfBandAuditLogWriter(settings.AUDIT_LOG_QUEUE_MAX_SIZE)
+            atexit.register(_shared_writer.drain, settings.AUDIT_LOG_SHUTDOWN_TIMEOUT_SECONDS)
+        return _shared_writer
@@ -26,6 +26,8 @@ from management.utils import filter_queryset_by_tenant
 from rest_framework import mixins, viewsets
 from rest_framework.filters import OrderingFilter
 
+from api.common.pagination import KeysetResultsSetPagination
+
 
 class AuditLogViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     """Audit Logs View.
@@ -38,6 +40,7 @@ class AuditLogViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     permission_classes = (AuditLogAccessPermission,)
     filter_backends = (filters.DjangoFilterBackend, OrderingFilter)
     filterset_class = AuditLogFilter
+    pagination_class = KeysetResultsSetPagination
     ordering_fields = ("created", "principal_username", "resource_type", "action")
     ordering = ("-created",)
 
@@ -22,6 +22,8 @@ from json import JSONDecodeError
 from typing import Protocol
 
 import requests
+from core.http_sessions import JWKS_UPSTREAM, upstream_session
+from django.conf import settings
 from management.authorization.unable_meet_prerequisites import UnableMeetPrerequisitesError
 from management.cache import JWKSCache
 from requests import Response
@@ -113,7 +115,7 @@ class JWKSCacheSource(JWKSSource):
 def _request_json(url: str) -> dict:
     """Perform an JWKS related GET request and return the JSON response."""
     try:
-        response: Response = requests.get(url=url)
+        response: Response = upstream_session(JWKS_UPSTREAM, settings.IT_SERVICE_TIMEOUT_SECONDS).get(url=url)
     except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as ce:
         logger.error("Unable to fetch %s to validate the token: %s", url, ce)
 
@@ -1,9 +1,11 @@
 """Redis-based caching of per-Principal per-app access policy."""
 
 import contextlib
+import hashlib
 import json
 import logging
 import pickle
+import time
 
 from django.conf import settings
 from prometheus_client import Counter
@@ -196,6 +198,15 @@ class AccessCache(BasicCache):
         """Purge the given user's policy from the cache."""
         super().delete_cached(uuid, "policy")
 
+    def delete_policies(self, uuids):
+        """Purge the given users' policies from the cache with a single command."""
+        keys = [self.key_for(uuid) for uuid in uuids]
+        if not keys:
+            return
+        with self.delete_handler(f"Error deleting policies for {len(keys)} principals"):
+            logger.info(f"Deleting policy cache for {len(keys)} principals")
+            self.connection.delete(*keys)
+
     def delete_all_policies_for_tenant(self):
         """Purge users' policies for a given tenant from the cache."""
         if not settings.ACCESS_CACHE_ENABLED:
@@ -301,6 +312,36 @@ class JWTCacheOptimized(JWTCache):
         return None
 
 
+class PermissionCatalogCache(BasicCache):
+    """Redis-based storage of the permission seeding generation shared by all processes."""
+
+    GENERATION_KEY = "rbac::permissions::generation"
+
+    def key_for(self):
+        """Redis key for the permission catalog generation."""
+        return self.GENERATION_KEY
+
+    def get_generation(self):
+        """Get the current generation, or None if Redis is unavailable."""
+        try:
+            generation = self.connection.get(self.key_for())
+            if generation is None:
+                # Seed from the clock rather than 0 so that a flushed Redis never repeats an earlier generation.
+                self.connection.set(self.key_for(), int(time.time() * 1000), nx=True)
+                generation = self.connection.get(self.key_for())
+        except exceptions.RedisError:
+            logger.warning("Unable to fetch the permission catalog generation from Redis")
+            return None
+        return int(generation) if generation is not None else None
+
+    def bump_generation(self):
+        """Start a new generation so every process rebuilds its permission catalog."""
+        with self.delete_handler("Error bumping the permission catalog generation"):
+            if not self.connection.exists(self.key_for()):
+                self.connection.set(self.key_for(), int(time.time() * 1000), nx=True)
+            self.connection.incr(self.key_for())
+
+
 class PrincipalCache(BasicCache):
     """Redis-based caching for storing the principals."""
 
@@ -368,6 +409,65 @@ class PrincipalCache(BasicCache):
             logger.info(f"Deleted {count} principals for tenant {org_id}")
 
 
+class PrincipalProfileCache(BasicCache):
+    """Redis-based caching of the principal profiles BOP returns, keyed by user_id.
+
+    User ids unknown to BOP are cached too, for a shorter time, so that looking them up again does not reach BOP.
+    """
+
+    def key_for(self, user_id: str) -> str:
+        """Redis key for the profile of a user id."""
+        return f"rbac::principal_profile::{user_id}"
+
+    def get_profiles(self, user_ids: list[str]) -> dict:
+        """Return the cached profile of each of the user ids found in the cache, or None if BOP does not know it."""
+        try:
+            values = self.connection.mget([self.key_for(user_id) for user_id in user_ids])
+        except exceptions.RedisError:
+            logger.warning("Unable to fetch principal profiles from cache")
+            return {}
+        return {user_id: json.loads(value) for user_id, value in zip(user_ids, values) if value is not None}
+
+    def save_profiles(self, profiles: dict):
+        """Cache the given profiles by user id, where None marks a user id unknown to BOP."""
+        try:
+            with self.connection.pipeline() as pipe:
+                for user_id, profile in profiles.items():
+                    lifetime = (
+                        settings.PRINCIPAL_PROFILE_CACHE_LIFETIME
+                        if profile is not None
+                        else settings.PRINCIPAL_PROFILE_NEGATIVE_CACHE_LIFETIME
+                    )
+                    pipe.set(self.key_for(user_id), json.dumps(profile), ex=lifetime)
+                pipe.execute()
+        except exceptions.RedisError:
+            logger.exception("Error writing principal profiles to cache")
+
+
+class ListCountCache(BasicCache):
+    """Redis-based caching of the exact counts of paginated lists, keyed by a hash of the counted query."""
+
+    def key_for(self, query: str) -> str:
+        """Redis key for the count of a query."""
+        return f"rbac::list_count::{hashlib.sha256(query.encode()).hexdigest()}"
+
+    def get_count(self, query: str):
+        """Return the cached count of the query, or None if it is not cached."""
+        try:
+            value = self.connection.get(self.key_for(query))
+        except exceptions.RedisError:
+            logger.warning("Unable to fetch list count from cache")
+            return None
+        return None if value is None else int(value)
+
+    def save_count(self, query: str, count: int):
+        """Cache the count of the query for PAGINATION_COUNT_CACHE_LIFETIME seconds."""
+        try:
+            self.connection.set(self.key_for(query), count, ex=settings.PAGINATION_COUNT_CACHE_LIFETIME)
+        except exceptions.RedisError:
+            logger.exception("Error writing list count to cache")
+
+
 def skip_purging_cache_for_public_tenant(tenant):
     """Skip purging cache for public tenant."""
     # Cache is by tenant org_id and user_id, we don't have to purge cache for public tenant
@@ -0,0 +1,76 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Streaming exports of list endpoints as newline-delimited JSON."""
+
+import itertools
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.common.renderers import NDJSONRenderer
+
+
+def export_response(queryset, serialize, filename):
+    """Stream the rows of a queryset as newline-delimited JSON.
+
+    The rows are read through a server-side cursor and serialized a chunk at a time, so only one chunk of the export is
+    held in memory and the database scans the queryset once, without counting it.
+
+    Memory is only bounded while server-side cursors are enabled. With DATABASE_DISABLE_SERVER_SIDE_CURSORS set, as is
+    usual behind pgbouncer, psycopg2 fetches the whole result set into the client before the first chunk is streamed.
+    The rows are not paged by primary key instead, since exports keep the ordering of their list, which can be on
+    nullable, related or computed columns that a keyset cannot walk.
+    """
+    rows = queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+    def lines():
+        for chunk in itertools.batched(rows, settings.EXPORT_CHUNK_SIZE):
+            yield "".join(json.dumps(item, cls=JSONEncoder) + "\n" for item in serialize(chunk))
+
+    response = StreamingHttpResponse(lines(), content_type=NDJSONRenderer.media_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.ndjson"'
+    return response
+
+
+class ExportMixin:
+    """Add an export action streaming the whole filtered list of a viewset as newline-delimited JSON.
+
+    Views customize the rows through get_export_queryset() and their representation through serialize_export().
+    """
+
+    def get_renderers(self):
+        """Accept application/x-ndjson on exports."""
+        renderers = super().get_renderers()
+        if self.action == "export":
+            renderers.append(NDJSONRenderer())
+        return renderers
+
+    def get_export_queryset(self):
+        """Return the rows of the export, filtered as on the list."""
+        return self.filter_queryset(self.get_queryset())
+
+    def serialize_export(self, rows):
+        """Return the representations of a chunk of exported rows."""
+        return self.get_serializer(rows, many=True).data
+
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        """Stream every row of the list as newline-delimited JSON, without pagination."""
+        return export_response(self.get_export_queryset(), self.serialize_export, self.basename)
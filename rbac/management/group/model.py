@@ -113,8 +113,7 @@ def group_deleted_cache_handler(sender=None, instance=None, using=None, **kwargs
         return
     logger.info("Handling signal for deleted group %s - invalidating policy cache for users in group", instance)
     cache = AccessCache(instance.tenant.org_id)
-    for principal in instance.principals.all():
-        cache.delete_policy(principal.uuid)
+    cache.delete_policies(list(instance.principals.values_list("uuid", flat=True)))
 
 
 def principals_to_groups_cache_handler(
@@ -128,8 +127,7 @@ def principals_to_groups_cache_handler(
         logger.info("Handling signal for %s group membership change - invalidating policy cache", instance)
         if isinstance(instance, Group):
             # One or more principals was added to/removed from the group
-            for principal in Principal.objects.filter(pk__in=pk_set):
-                cache.delete_policy(principal.uuid)
+            cache.delete_policies(list(Principal.objects.filter(pk__in=pk_set).values_list("uuid", flat=True)))
         elif isinstance(instance, Principal):
             # One or more groups was added to/removed from the principal
             cache.delete_policy(instance.uuid)
@@ -137,8 +135,7 @@ def principals_to_groups_cache_handler(
         logger.info("Handling signal for %s group membership clearing - invalidating policy cache", instance)
         if isinstance(instance, Group):
             # All principals are being removed from this group
-            for principal in instance.principals.all():
-                cache.delete_policy(principal.uuid)
+            cache.delete_policies(list(instance.principals.values_list("uuid", flat=True)))
         elif isinstance(instance, Principal):
             # All groups are being removed from this principal
             cache.delete_policy(instance.uuid)
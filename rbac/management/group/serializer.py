@@ -63,6 +63,14 @@ def _v2_description_override(data, request):
             return
 
 
+def _role_count(group):
+    """Return the group's role count, preferring the roleCount annotation from get_annotated_groups."""
+    role_count = getattr(group, "roleCount", None)
+    if role_count is None:
+        return group.role_count()
+    return role_count
+
+
 class GroupInputSerializer(SerializerCreateOverrideMixin, serializers.ModelSerializer):
     """Serializer for Group input model."""
 
@@ -79,7 +87,7 @@ class GroupInputSerializer(SerializerCreateOverrideMixin, serializers.ModelSeria
 
     def get_roleCount(self, obj):
         """Role count for the serializer."""
-        return obj.role_count()
+        return _role_count(obj)
 
     def to_representation(self, obj):
         """Override representation to update description for v2 tenants."""
@@ -163,14 +171,20 @@ class GroupSerializer(SerializerCreateOverrideMixin, serializers.ModelSerializer
         _v2_description_override(formatted, self.context.get("request"))
         return formatted
 
+    def _roles_with_access(self, obj):
+        """Return the group's roles with their access, fetched once per group however many fields use them."""
+        roles_by_group = self.context.setdefault("_roles_with_access", {})
+        if obj.pk not in roles_by_group:
+            roles_by_group[obj.pk] = list(obj.roles_with_access())
+        return roles_by_group[obj.pk]
+
     def get_roleCount(self, obj):
         """Role count for the serializer."""
-        return obj.role_count()
+        return len(self._roles_with_access(obj))
 
     def get_roles(self, obj):
         """Role constructor for the serializer."""
-        serialized_roles = [RoleMinimumSerializer(role).data for role in obj.roles_with_access()]
-        return serialized_roles
+        return [RoleMinimumSerializer(role).data for role in self._roles_with_access(obj)]
 
 
 class GroupPrincipalInputSerializer(serializers.Serializer):
@@ -24,13 +24,15 @@ from uuid import UUID
 import requests
 from django.conf import settings
 from django.db import IntegrityError, transaction
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.db.models.aggregates import Count
+from django.db.models.functions import Lower
 from django.http import Http404
 from django.utils.translation import gettext as _
 from django_filters import rest_framework as filters
 from management.authorization.scope_claims import ScopeClaims
 from management.authorization.token_validator import ITSSOTokenValidator
+from management.export import ExportMixin
 from management.filters import CommonFilters
 from management.group.definer import (
     _roles_by_query_or_ids,
@@ -49,10 +51,10 @@ from management.group.serializer import (
     GroupSerializer,
     RoleMinimumSerializer,
 )
-from management.models import AuditLog, Group, Role
+from management.models import AuditLog, Group, Policy, Role
 from management.notifications.notification_handlers import (
     group_obj_change_notification_handler,
-    group_principal_change_notification_handler,
+    group_principals_change_notification_handler,
 )
 from management.permissions import GroupAccessPermission
 from management.permissions.v2_edit_api_access import is_v2_edit_enabled_for_request
@@ -64,6 +66,7 @@ from management.principal.view import ADMIN_ONLY_KEY, USERNAME_ONLY_KEY, VALID_B
 from management.querysets import (
     get_group_queryset,
     get_role_queryset,
+    role_policy_count,
 )
 from management.relation_replicator.relation_replicator import ReplicationEventType
 from management.role.view import RoleViewSet
@@ -76,7 +79,7 @@ from rest_framework.filters import OrderingFilter
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from api.common.pagination import StandardResultsSetPagination
+from api.common.pagination import OptInKeysetResultsSetPagination, StandardResultsSetPagination
 from api.models import Tenant, User
 from .insufficient_privileges import InsufficientPrivilegesError
 from .service_account_not_found_error import ServiceAccountNotFoundError
@@ -172,6 +175,7 @@ class GroupFilter(CommonFilters):
 
 
 class GroupViewSet(
+    ExportMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -182,7 +186,7 @@ class GroupViewSet(
     """Group View.
 
     A viewset that provides default `create()`, `destroy`, `retrieve()`,
-    and `list()` actions.
+    `list()` and `export()` actions.
 
     """
 
@@ -196,6 +200,8 @@ class GroupViewSet(
     filterset_class = GroupFilter
     ordering_fields = ("name", "modified", "principalCount", "policyCount")
     ordering = ("name",)
+    pagination_class = OptInKeysetResultsSetPagination
+    keyset_ordering_fields = ("name", "modified")
     proxy = PrincipalProxy()
 
     def get_queryset(self):
@@ -221,6 +227,8 @@ class GroupViewSet(
 
     def get_serializer_class(self):
         """Get serializer based on route."""
+        if self.action == "export":
+            return GroupInputSerializer
         if "principals" in self.request.path:
             return GroupPrincipalInputSerializer
         if ROLES_KEY in self.request.path.split("/") and self.request.method == "GET":
@@ -540,25 +548,58 @@ class GroupViewSet(
     def add_users(self, group, principals_from_response, org_id=None):
         """Add principals to the group."""
         tenant = self.request.tenant
-        new_principals = []
-        for item in principals_from_response:
-            # cross-account request principals won't be in the resp from BOP since they don't exist
-            username = item["username"]
-            try:
-                principal = Principal.objects.get(username__iexact=username, tenant=tenant)
-                if principal.user_id is None and "user_id" in item:
-                    # Some lazily created Principals may not have user_id.
-                    user_id = item["user_id"]
-                    principal.user_id = user_id
-                    principal.save()
-            except Principal.DoesNotExist:
-                principal = Principal.objects.create(username=username, tenant=tenant, user_id=item["user_id"])
-                logger.info("Created new principal %s for org_id %s.", username, org_id)
-            group.principals.add(principal)
-            new_principals.append(principal)
-            group_principal_change_notification_handler(self.request.user, group, username, "added")
+        # cross-account request principals won't be in the resp from BOP since they don't exist
+        usernames = [item["username"] for item in principals_from_response]
+        new_principals = self._get_or_create_principals(
+            tenant,
+            [{"username": item["username"], "user_id": item.get("user_id")} for item in principals_from_response],
+            org_id=org_id,
+        )
+        group.principals.add(*new_principals)
+        group_principals_change_notification_handler(self.request.user, group, usernames, "added")
         return group, new_principals
 
+    def _get_or_create_principals(self, tenant: Tenant, specified: Iterable[dict], org_id=None) -> List[Principal]:
+        """Return the principals with the given attributes, creating the missing ones in bulk.
+
+        Existing principals are matched case-insensitively by username in a single query, and lazily created ones
+        without a user_id get the specified one. The principals are returned in the order they were specified.
+        """
+        specified_by_username: dict[str, dict] = {}
+        for item in specified:
+            specified_by_username.setdefault(item["username"].lower(), item)
+
+        principals = {
+            principal.username.lower(): principal
+            for principal in Principal.objects.alias(username_lower=Lower("username")).filter(
+                tenant=tenant, username_lower__in=specified_by_username
+            )
+        }
+
+        # Some lazily created Principals may not have user_id.
+        missing_user_ids = []
+        for username, principal in principals.items():
+            user_id = specified_by_username[username].get("user_id")
+            if principal.user_id is None and user_id is not None:
+                principal.user_id = user_id
+                missing_user_ids.append(principal)
+        Principal.objects.bulk_update(missing_user_ids, ["user_id"])
+
+        created = Principal.objects.bulk_create(
+            [
+                Principal(tenant=tenant, **{**item, "username": username})
+                for username, item in specified_by_username.items()
+                if username not in principals
+            ]
+        )
+        if created:
+            logger.info(
+                "Created new principals %s for org_id %s.", [principal.username for principal in created], org_id
+            )
+        principals.update((principal.username, principal) for principal in created)
+
+        return [principals[username] for username in specified_by_username]
+
     def ensure_id_for_service_accounts_exists(
         self,
         user: User,
@@ -600,40 +641,27 @@ class GroupViewSet(
         """Add service accounts to the group."""
         # Get the tenant in order to fetch or store the service account in the database.
         tenant: Tenant = self.request.tenant
-        new_service_accounts = []
-        # Fetch the service account from our database to add it to the group. If it doesn't exist, we create
-        # it.
-        for specified_sa in service_accounts:
-            client_id = specified_sa["clientId"]
-            user_id = specified_sa.get("userId")
-            try:
-                principal = Principal.objects.get(
-                    username__iexact=SERVICE_ACCOUNT_USERNAME_FORMAT.format(clientId=client_id),
-                    tenant=tenant,
-                )
-                if principal.user_id is None and user_id is not None:
-                    # May happen in case principal is lazily created without user ID.
-                    principal.user_id = user_id
-                    principal.save()
-            except Principal.DoesNotExist:
-                principal = Principal.objects.create(
-                    username=SERVICE_ACCOUNT_USERNAME_FORMAT.format(clientId=client_id),
-                    user_id=user_id,
-                    service_account_id=client_id,
-                    type=Principal.Types.SERVICE_ACCOUNT,
-                    tenant=tenant,
-                )
-
-                logger.info("Created new service account %s for org_id %s.", client_id, org_id)
-
-            group.principals.add(principal)
-            new_service_accounts.append(principal)
-            group_principal_change_notification_handler(
-                self.request.user,
-                group,
-                SERVICE_ACCOUNT_USERNAME_FORMAT.format(clientId=client_id),
-                "added",
-            )
+        # Fetch the service accounts from our database to add them to the group. The ones that don't exist are
+        # created.
+        usernames = [
+            SERVICE_ACCOUNT_USERNAME_FORMAT.format(clientId=specified_sa["clientId"])
+            for specified_sa in service_accounts
+        ]
+        new_service_accounts = self._get_or_create_principals(
+            tenant,
+            [
+                {
+                    "username": username,
+                    "user_id": specified_sa.get("userId"),
+                    "service_account_id": specified_sa["clientId"],
+                    "type": Principal.Types.SERVICE_ACCOUNT,
+                }
+                for username, specified_sa in zip(usernames, service_accounts)
+            ],
+            org_id=org_id,
+        )
+        group.principals.add(*new_service_accounts)
+        group_principals_change_notification_handler(self.request.user, group, usernames, "added")
 
         return group, new_service_accounts
 
@@ -663,14 +691,11 @@ class GroupViewSet(
                 ],
             }, []
 
-        principals_to_remove = []
-        for principal in valid_principals:
-            group.principals.remove(principal)
-            principals_to_remove.append(principal)
+        principals_to_remove = list(valid_principals)
+        group.principals.remove(*principals_to_remove)
 
         logger.info(f"[Request_id:{req_id}] {valid_usernames} removed from group {group.name} for org id {org_id}.")
-        for username in principals:
-            group_principal_change_notification_handler(self.request.user, group, username, "removed")
+        group_principals_change_notification_handler(self.request.user, group, principals, "removed")
         return group, principals_to_remove
 
     @action(detail=True, methods=["get", "post", "delete"])
@@ -1130,32 +1155,56 @@ class GroupViewSet(
 
     def _list_user_based_principals_in_group(self, request, group, options):
         """List user based principals in the group."""
-        principals_from_params = self.filtered_principals(group, request)
-        username_list = [principal.username for principal in principals_from_params]
+        self.paginate_queryset([])
+        resp = self._page_group_users(request, group, options, self.paginator.offset, self.paginator.limit)
+        if isinstance(resp, dict) and "errors" in resp:
+            return Response(status=resp.get("status_code"), data=resp.get("errors"))
+
+        self.paginator.count = resp.get("userCount")
+        return self.get_paginated_response(resp.get("data"))
+
+    def _page_group_users(self, request, group, options, offset, limit):
+        """Fetch one page of the group's user principals from BOP, along with the total user count.
+
+        Usernames are ordered and sliced in the database so that BOP is only asked about the requested page, and
+        the total is a COUNT(*) rather than the length of the whole membership. The count and the pages therefore
+        follow the membership stored in RBAC: members BOP does not return, such as unknown or disabled users, still
+        count, and are left out of their page, which then holds fewer than limit users. Only BOP knows which users
+        are org admins, so when filtering by admin_only the whole membership still has to be sent and is sliced
+        afterwards, and the count is that of the admins BOP returns.
+        """
+        principals = self.filtered_principals(group, request)
+        ordering = "-username" if options.get("sort_order") == "des" else "username"
+        usernames = principals.order_by(ordering, "id").values_list("username", flat=True)
+
+        proxy = PrincipalProxy()
+        org_id = request.user.org_id
 
         admin_only = validate_and_get_key(request.query_params, ADMIN_ONLY_KEY, VALID_BOOLEAN_VALUE, False, False)
         if admin_only == "true":
             options[ADMIN_ONLY_KEY] = True
-
-        proxy = PrincipalProxy()
-        org_id = self.request.user.org_id
-        resp = proxy.request_filtered_principals(username_list, org_id=org_id, options=options)
+            resp = proxy.request_filtered_principals(list(usernames), org_id=org_id, options=options)
+            if isinstance(resp, dict) and "errors" in resp:
+                return resp
+            data = resp.get("data")
+            return {**resp, "data": data[offset : offset + limit], "userCount": len(data)}  # noqa: E203
+
+        user_count = usernames.count()
+        page = list(usernames[offset : offset + limit]) if limit > 0 else []  # noqa: E203
+        if not page:
+            return {"status_code": status.HTTP_200_OK, "data": [], "userCount": user_count}
+
+        resp = proxy.request_filtered_principals(page, org_id=org_id, options=options)
         if isinstance(resp, dict) and "errors" in resp:
-            return Response(status=resp.get("status_code"), data=resp.get("errors"))
-
-        # For 'principal_type=all' we need to return before pagination is applied
-        if options["principal_type"] == ALL_KEY:
             return resp
-
-        page = self.paginate_queryset(resp.get("data"))
-        return self.get_paginated_response(page)
+        return {**resp, "userCount": user_count}
 
     def _list_both_principal_types_in_group(self, request, group, options):
         """
         List both principal types (user based, service account based) in the group.
 
-        First we try to list service account based principals and then user based principals.
-        For the second query we need to calculate new limit and offset.
+        Service accounts come first, followed by user based principals. The user based principals on the page are
+        then obtained with a new limit and offset, so only that slice of the membership is sent to BOP.
         Example:
             the group contains 3 SA + 4 U, limit = 2, offset = 0
             pagination:
@@ -1177,26 +1226,16 @@ class GroupViewSet(
         # Calculate new limit and offset for the user based principals query
         sa_count_total = int(response_sa.data.get("meta").get("count"))
         sa_count = len(response_sa.data.get("data", []))
-        remaining_limit = limit - sa_count
-        if remaining_limit == 0:
-            new_limit = 1
-            new_offset = 0
-        elif remaining_limit > 0:
-            if offset >= sa_count_total:
-                new_limit = limit
-                new_offset = offset - sa_count_total
-            else:
-                new_limit = remaining_limit
-                new_offset = 0
+        user_limit = limit - sa_count
+        user_offset = max(offset - sa_count_total, 0)
 
         # Get User based principals
-        response_user = self._list_user_based_principals_in_group(request, group, options)
-        if response_user.get("status_code") != status.HTTP_200_OK:
-            return response_user
+        response_user = self._page_group_users(request, group, options, user_offset, user_limit)
+        if isinstance(response_user, dict) and "errors" in response_user:
+            return Response(status=response_user.get("status_code"), data=response_user.get("errors"))
 
         # Calculate the total count and save it for pagination
-        user_count_total = len(response_user.get("data"))
-        self.paginator.count = sa_count_total + user_count_total
+        self.paginator.count = sa_count_total + response_user.get("userCount")
 
         # Put together the final response
         response_data = {}
@@ -1204,8 +1243,8 @@ class GroupViewSet(
         if response_sa.data.get("data", []):
             response_data["serviceAccounts"] = response_sa.data.get("data")
 
-        if response_user.get("data", []) and remaining_limit:
-            response_data["users"] = response_user.get("data")[new_offset : new_offset + new_limit]  # noqa: E203
+        if response_user.get("data", []):
+            response_data["users"] = response_user.get("data")
 
         return self.get_paginated_response(response_data)
 
@@ -1339,9 +1378,8 @@ class GroupViewSet(
                     )
 
         elif request.method == "GET":
-            serialized_roles = self.obtain_roles(request, group)
-            page = self.paginate_queryset(serialized_roles)
-            serializer = self.get_serializer(page, many=True)
+            page = self.paginate_queryset(self.obtain_roles(request, group))
+            serializer = self.get_serializer(RoleMinimumSerializer(page, many=True).data, many=True)
             return self.get_paginated_response(serializer.data)
         else:
             self.protect_default_admin_group_roles(group)
@@ -1424,25 +1462,31 @@ class GroupViewSet(
         return filters
 
     def obtain_roles(self, request, group):
-        """Obtain roles based on request, supports exclusion."""
+        """Obtain the queryset of roles based on request, supports exclusion.
+
+        The queryset is paginated before serialization, so only the requested page of roles is loaded.
+        """
         exclude = validate_and_get_key(request.query_params, EXCLUDE_KEY, VALID_EXCLUDE_VALUES, "false")
 
-        roles = group.roles_with_access() if exclude == "false" else self.obtain_roles_with_exclusion(request, group)
+        in_group = Exists(Policy.objects.filter(group=group, roles=OuterRef("pk")))
+        if exclude == "false":
+            roles = Role.objects.filter(in_group).prefetch_related("access__permission")
+        else:
+            roles = self.obtain_roles_with_exclusion(request, in_group)
         filtered_roles = self.filtered_roles(roles, request)
-        annotated_roles = filtered_roles.annotate(policyCount=Count("policies", distinct=True))
+        annotated_roles = filtered_roles.annotate(policyCount=role_policy_count())
 
         order_field = request.query_params.get(ORDERING_PARAM, NAME_KEY)
         ordered_roles = self.order_queryset(annotated_roles, VALID_ROLE_ORDER_FIELDS, order_field)
-        return [RoleMinimumSerializer(role).data for role in ordered_roles]
+        return ordered_roles.select_related("ext_relation__ext_tenant")
 
-    def obtain_roles_with_exclusion(self, request, group):
-        """Obtain the queryset for roles based on scope."""
+    def obtain_roles_with_exclusion(self, request, in_group):
+        """Obtain the queryset for roles based on scope, without the roles in the group."""
         # Get roles in principal or account scope
         roles = get_role_queryset(request)
 
         # Exclude the roles in the group
-        roles_for_group = group.roles().values("uuid")
-        return roles.exclude(uuid__in=roles_for_group)
+        return roles.filter(~in_group)
 
     def remove_service_accounts(self, user: User, group: Group, service_accounts: Iterable[str], org_id: str = ""):
         """Remove the given service accounts from the tenant."""
@@ -1476,17 +1520,14 @@ class GroupViewSet(
 
             raise Http404(f"Service account(s) {service_account_ids_diff} not found in the group '{group.name}'")
 
-        removed_service_accounts = []
         # Remove service accounts from the group.
-        for service_account in valid_service_accounts:
-            group.principals.remove(service_account)
-            removed_service_accounts.append(service_account)
+        removed_service_accounts = list(valid_service_accounts)
+        group.principals.remove(*removed_service_accounts)
 
         logger.info(
             f"[Request_id:{request_id}] {valid_service_account_ids} "
             f"removed from group {group.name} for org id {org_id}."
         )
-        for username in service_accounts:
-            group_principal_change_notification_handler(self.request.user, group, username, "removed")
+        group_principals_change_notification_handler(self.request.user, group, service_accounts, "removed")
 
         return removed_service_accounts
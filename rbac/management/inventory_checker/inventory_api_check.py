@@ -19,8 +19,10 @@
 
 import logging
 from collections.abc import Sequence
-from typing import List, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Union
 
+import grpc
 from django.conf import settings
 from google.protobuf import json_format
 from internal.jwt_utils import JWTManager, JWTProvider
@@ -30,16 +32,32 @@ from kessel.inventory.v1beta2 import (
     resource_reference_pb2,
     subject_reference_pb2,
 )
+from kessel.inventory.v1beta2.check_bulk_request_pb2 import CheckBulkRequest, CheckBulkRequestItem
 from kessel.inventory.v1beta2.check_request_pb2 import CheckRequest
 from management.cache import JWTCache
 from management.relation_replicator.types import RelationTuple
 from management.utils import create_client_channel_inventory
+from prometheus_client import Counter, Histogram
 
 jwt_cache = JWTCache()
 jwt_provider = JWTProvider()
 jwt_manager = JWTManager(jwt_provider, jwt_cache)
 logger = logging.getLogger(__name__)
 
+# Upper bound on the items sent in a single CheckBulk request.
+CHECK_BULK_MAX_ITEMS = 1000
+
+inventory_check_duration_seconds = Histogram(
+    "rbac_inventory_check_duration_seconds",
+    "Time spent on inventory api calls made by the consistency checks",
+    ["method"],
+)
+inventory_check_results_total = Counter(
+    "rbac_inventory_check_results_total",
+    "Relations verified by the consistency checks on inventory api, by outcome",
+    ["outcome"],
+)
+
 
 def relation_tuple_to_check_request(tuple_obj: RelationTuple) -> CheckRequest:
     """Convert a RelationTuple to a CheckRequest for inventory verification.
@@ -75,16 +93,86 @@ class InventoryApiBaseChecker:
         """
         Core method to check relation(s) via gRPC.
 
-        Accepts either a single check request or list of check requests.
+        Accepts either a single check request or list of check requests. Stops at the first missing relation.
         """
         if isinstance(checks, CheckRequest):
             checks = [checks]
 
+        return all(self.check_inventory_results(checks, stop_on_denial=True))
+
+    def check_inventory_results(
+        self, checks: Sequence[CheckRequest], stop_on_denial: bool = False
+    ) -> List[Optional[bool]]:
+        """
+        Check each relation via gRPC and return whether it exists, in the order of the requests.
+
+        Uses the CheckBulk RPC when INVENTORY_CHECK_BULK_ENABLED is set and inventory implements it, otherwise
+        individual Check calls run concurrently on one channel. With stop_on_denial, checking stops at the first
+        missing relation and the relations left unchecked are None.
+        """
+        results: List[Optional[bool]] = [None] * len(checks)
+        if not checks:
+            return results
+
         with create_client_channel_inventory(settings.INVENTORY_API_SERVER) as channel:
             stub = inventory_service_pb2_grpc.KesselInventoryServiceStub(channel)
 
-            responses = [stub.Check(req) for req in checks]
-            return all(self._is_allowed(res) for res in responses)
+            if not (settings.INVENTORY_CHECK_BULK_ENABLED and self._check_bulk(stub, checks, results, stop_on_denial)):
+                self._check_concurrently(stub, checks, results, stop_on_denial)
+
+        for result in results:
+            outcome = "skipped" if result is None else "allowed" if result else "denied"
+            inventory_check_results_total.labels(outcome=outcome).inc()
+        return results
+
+    def _check_bulk(self, stub, checks, results, stop_on_denial) -> bool:
+        """Fill in the results with CheckBulk calls, returning False if inventory does not implement the RPC."""
+        for start in range(0, len(checks), CHECK_BULK_MAX_ITEMS):
+            end = start + CHECK_BULK_MAX_ITEMS
+            request = CheckBulkRequest(
+                items=[
+                    CheckBulkRequestItem(object=check.object, relation=check.relation, subject=check.subject)
+                    for check in checks[start:end]
+                ]
+            )
+            try:
+                with inventory_check_duration_seconds.labels(method="CheckBulk").time():
+                    response = stub.CheckBulk(request)
+            except grpc.RpcError as err:
+                if isinstance(err, grpc.Call) and err.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    logger.warning("Inventory api does not implement CheckBulk, falling back to individual checks.")
+                    return False
+                raise
+
+            for index, pair in enumerate(response.pairs, start):
+                if pair.HasField("error") and pair.error.code:
+                    logger.warning(f"Inventory bulk check item failed: {pair.error.code}: {pair.error.message}")
+                    results[index] = False
+                else:
+                    results[index] = self._is_allowed(pair.item)
+            if stop_on_denial and False in results:
+                break
+        return True
+
+    def _check_concurrently(self, stub, checks, results, stop_on_denial) -> None:
+        """Fill in the missing results with Check calls run on a bounded pool of threads sharing the stub."""
+
+        def check(index):
+            with inventory_check_duration_seconds.labels(method="Check").time():
+                response = stub.Check(checks[index])
+            return index, self._is_allowed(response)
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        executor = ThreadPoolExecutor(max_workers=max(1, min(settings.INVENTORY_CHECK_CONCURRENCY, len(pending))))
+        try:
+            futures = [executor.submit(check, index) for index in pending]
+            for future in as_completed(futures):
+                index, allowed = future.result()
+                results[index] = allowed
+                if stop_on_denial and not allowed:
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _is_allowed(self, response):
         response_dict = json_format.MessageToDict(response)
@@ -97,9 +185,9 @@ class GroupPrincipalInventoryChecker(InventoryApiBaseChecker):
     def check_relationships(self, relationships):
         """Core logic to check group principal relations are correct."""
         inventory_relation_assignments = {"group_uuid": "", "principal_relations": []}
-        for r in relationships:
-            check_request = relation_tuple_to_check_request(r)
-            relation_exists = self.check_inventory_core(check_request)
+        relationships = list(relationships)
+        results = self.check_inventory_results([relation_tuple_to_check_request(r) for r in relationships])
+        for r, relation_exists in zip(relationships, results):
             inventory_relation_assignments["group_uuid"] = r.resource.id
             inventory_relation_assignments["principal_relations"].append(
                 {"id": r.subject.subject.id, "relation_exists": relation_exists}
@@ -219,7 +307,8 @@ class BootstrappedTenantInventoryChecker(InventoryApiBaseChecker):
                 ),
             ]
             checks = [check for _, check in checks_with_names]
-            bootstrapped_tenant_correct = self.check_inventory_core(checks)
+            results = self.check_inventory_results(checks)
+            bootstrapped_tenant_correct = all(results)
             if not bootstrapped_tenant_correct:
                 logger.warning(f'{mapping["org_id"]} does not have the expected hierarchy for bootstrapped tenant.')
             else:
@@ -227,7 +316,7 @@ class BootstrappedTenantInventoryChecker(InventoryApiBaseChecker):
 
             # Convert checks to readable format for logging in response
             check_list = []
-            for name, check in checks_with_names:
+            for (name, check), check_exists in zip(checks_with_names, results):
                 check_dict = json_format.MessageToDict(check)
                 obj = check_dict.get("object", {})
                 subject = check_dict.get("subject", {})
@@ -243,7 +332,6 @@ class BootstrappedTenantInventoryChecker(InventoryApiBaseChecker):
                     f"{relation}#{subject_reporter}/{subject_resource.get('resourceType', '')}:"
                     f"{subject_resource.get('resourceId', '')}{subject_relation_suffix}"
                 )
-                check_exists = self.check_inventory_core(check)
                 check_list.append({"name": name, "check": check_str, "exists": check_exists})
         return bootstrapped_tenant_correct, check_list
 
@@ -0,0 +1,33 @@
+"""Benchmark of the audit log list."""
+
+from django.core.management.base import BaseCommand
+from tests.performance.test_performance_audit_log import N_ENTRIES, setUp, tearDown, test_audit_log_list
+
+
+class Command(BaseCommand):
+    """Command to setup, run, and teardown the audit log benchmark."""
+
+    help = """
+    Run the audit log list benchmark. If running locally,
+    run the setup command first to seed the audit log.
+
+    Usage:
+        python manage.py audit_log_performance [setup|test|teardown] [--entries N]
+    """
+
+    def add_arguments(self, parser):
+        """Parse command arguments."""
+        parser.add_argument("mode", type=str, nargs="?", default="test", help="Choice of setup, test, or teardown")
+        parser.add_argument("--entries", type=int, default=N_ENTRIES, help="Number of entries seeded by setup")
+
+    def handle(self, **options):
+        """Run the command."""
+        mode = options["mode"]
+        if mode == "setup":
+            setUp(options["entries"])
+        elif mode == "teardown":
+            tearDown()
+        elif mode == "test":
+            test_audit_log_list()
+        else:
+            print("Invalid mode. Please choose from setup, test, or teardown.")
@@ -1,13 +1,18 @@
 """Command to handle tenant bootstrapping."""
 
+import dataclasses
 import enum
 import itertools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from django.core.management import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import QuerySet
+from django.db.models.functions import Mod
 from management.relation_replicator.outbox_replicator import OutboxReplicator
 from management.tenant_service import V2TenantBootstrapService
 from management.tenant_service.tenant_service import BootstrappedTenant
@@ -17,34 +22,120 @@ from api.models import Tenant
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
+# There is a limit of 1 k relationships per request: https://authzed.com/docs/spicedb/ops/data/bulk-operations At
+# time of writing (2025-11-04), there are 21 relations per bootstrapped tenant at most (when there is no custom default
+# group). This value may need to be updated if this script is used in the future.
+BATCH_SIZE = 40
+
+
 class _BootstrapError(enum.IntEnum):
     NO_SUCH_TENANT = 1
     FAILED = 2
+    # The tenant was locked by another transaction, so it was skipped to be bootstrapped later.
+    LOCKED = 3
 
 
 type _BootstrapResult = BootstrappedTenant | _BootstrapError
 type _BulkBootstrapResult = dict[Tenant, _BootstrapResult]
 
 
+@dataclasses.dataclass
+class _BootstrapSummary:
+    """The org IDs of the tenants processed so far by outcome, kept instead of the results of every tenant."""
+
+    # Only populated when the successful org IDs are checked against the requested ones.
+    track_successful: bool
+    successful_org_ids: set[str] = dataclasses.field(default_factory=set)
+    missing_org_ids: set[str] = dataclasses.field(default_factory=set)
+    failed_org_ids: set[str] = dataclasses.field(default_factory=set)
+    # The org IDs of the tenants deferred because they were locked, by tenant pk.
+    locked_tenants: dict[int, str] = dataclasses.field(default_factory=dict)
+
+    def add(self, tenant_pk: int, org_id: str, result: _BootstrapResult):
+        """Record the result of bootstrapping a tenant."""
+        if isinstance(result, BootstrappedTenant):
+            self.locked_tenants.pop(tenant_pk, None)
+            if self.track_successful:
+                self.successful_org_ids.add(result.tenant.org_id)
+        elif result == _BootstrapError.LOCKED:
+            self.locked_tenants[tenant_pk] = org_id
+        else:
+            self.locked_tenants.pop(tenant_pk, None)
+            if result == _BootstrapError.NO_SUCH_TENANT:
+                self.missing_org_ids.add(org_id)
+            elif result == _BootstrapError.FAILED:
+                self.failed_org_ids.add(org_id)
+            else:
+                raise ValueError(f"Unexpected result: {result}")
+
+    def merge(self, other: "_BootstrapSummary"):
+        """Add the outcomes recorded by another summary."""
+        self.successful_org_ids |= other.successful_org_ids
+        self.missing_org_ids |= other.missing_org_ids
+        self.failed_org_ids |= other.failed_org_ids
+        self.locked_tenants.update(other.locked_tenants)
+
+
+class _Progress:
+    """Thread-safe count of the tenants processed so far, logging the rate and estimated time remaining."""
+
+    def __init__(self, estimate: int):
+        """Start counting towards the estimated number of tenants."""
+        self._estimate = estimate
+        self._done = 0
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def advance(self, count: int):
+        """Count the given number of processed tenants and log the progress."""
+        with self._lock:
+            self._done += count
+            done = self._done
+
+        elapsed = time.monotonic() - self._start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self._estimate - done, 0)
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else "unknown"
+        logger.info(f"Processed {done}/{self._estimate} tenants in {elapsed:.0f}s ({rate:.1f} tenants/s, ETA {eta}).")
+
+
 def _try_bulk_bootstrap(
     bootstrap_service: V2TenantBootstrapService,
     raw_tenants: set[Tenant],
     force: bool,
+    skip_locked: bool,
 ) -> Optional[_BulkBootstrapResult]:
     try:
         with transaction.atomic():
-            tenants = Tenant.objects.select_for_update().filter(pk__in=(t.pk for t in raw_tenants))
+            tenants = list(
+                Tenant.objects.select_for_update(skip_locked=skip_locked).filter(pk__in=(t.pk for t in raw_tenants))
+            )
+
+            if skip_locked:
+                # Tenants locked elsewhere are skipped rather than waited for; they are retried once all workers
+                # finish.
+                results: _BulkBootstrapResult = {t: _BootstrapError.LOCKED for t in raw_tenants}
+
+                if not tenants:
+                    logger.info(f"All of {len(raw_tenants)} tenants are locked or gone; deferring them.")
+                    return results
 
-            # A tenant has vanished. Don't try to figure out which; just give up instead.
-            if len(tenants) != len(raw_tenants):
-                logger.info("Could not find a tenant about to be bootstrapped; refusing to bulk bootstrap.")
-                return None
+                if len(tenants) != len(raw_tenants):
+                    logger.info(f"Deferring {len(raw_tenants) - len(tenants)} tenants that are locked or gone.")
+            else:
+                results = {}
 
-            logger.info(f"Bootstrapping {len(raw_tenants)} tenants...")
+                # A tenant has vanished. Don't try to figure out which; just give up instead.
+                if len(tenants) != len(raw_tenants):
+                    logger.info("Could not find a tenant about to be bootstrapped; refusing to bulk bootstrap.")
+                    return None
+
+            logger.info(f"Bootstrapping {len(tenants)} tenants...")
             result = bootstrap_service.bootstrap_tenants(tenants, force=force)
 
             assert len(result) == len(tenants)
-            return {b.tenant: b for b in result}
+            results.update({b.tenant: b for b in result})
+            return results
     except Exception as e:
         logger.warning(f"Failed to bulk bootstrap tenants: pks={[t.pk for t in raw_tenants]}.", exc_info=e)
         return None
@@ -52,17 +143,17 @@ def _try_bulk_bootstrap(
 
 def _single_bootstrap_with_retry(
     bootstrap_service: V2TenantBootstrapService,
-    raw_tenant: Tenant,
+    tenant_pk: int,
     force: bool,
 ) -> _BootstrapResult:
     max_attempts = 5
 
     for attempt in range(max_attempts):
         with transaction.atomic():
-            tenant = Tenant.objects.select_for_update().filter(pk=raw_tenant.pk).first()
+            tenant = Tenant.objects.select_for_update().filter(pk=tenant_pk).first()
 
             if tenant is None:
-                logger.info(f"Tenant (pk={raw_tenant.pk!r}) no longer exists; not bootstrapping.")
+                logger.info(f"Tenant (pk={tenant_pk!r}) no longer exists; not bootstrapping.")
                 return _BootstrapError.NO_SUCH_TENANT
 
             tenant_desc = f"(pk={tenant.pk!r}, org_id={tenant.org_id!r})"
@@ -76,35 +167,81 @@ def _single_bootstrap_with_retry(
             except Exception as e:
                 logger.error(f"Failed to bootstrap tenant {tenant_desc}!", exc_info=e)
 
-    logger.error(f"Could not bootstrap tenant (pk={raw_tenant.pk!r}) after {max_attempts} attempts.")
+    logger.error(f"Could not bootstrap tenant (pk={tenant_pk!r}) after {max_attempts} attempts.")
     return _BootstrapError.FAILED
 
 
-def _bulk_bootstrap_with_retry(
+def _bulk_bootstrap_with_bisection(
     bootstrap_service: V2TenantBootstrapService,
-    raw_tenants: set[Tenant],
+    raw_tenants: list[Tenant],
     force: bool,
-) -> dict[Tenant, BootstrappedTenant | _BootstrapError]:
+    skip_locked: bool,
+) -> _BulkBootstrapResult:
+    """Bulk bootstrap the tenants, splitting a failed batch in halves until the failing tenants are isolated."""
     bulk_result = _try_bulk_bootstrap(
         bootstrap_service=bootstrap_service,
-        raw_tenants=raw_tenants,
+        raw_tenants=set(raw_tenants),
         force=force,
+        skip_locked=skip_locked,
     )
 
     if bulk_result is not None:
         return bulk_result
 
-    logger.info(f"Individually bootstrapping {len(raw_tenants)} tenants.")
-    results = {}
+    if len(raw_tenants) == 1:
+        return {
+            raw_tenants[0]: _single_bootstrap_with_retry(
+                bootstrap_service=bootstrap_service,
+                tenant_pk=raw_tenants[0].pk,
+                force=force,
+            )
+        }
+
+    middle = len(raw_tenants) // 2
+    logger.info(f"Bisecting {len(raw_tenants)} tenants into batches of {middle} and {len(raw_tenants) - middle}.")
+
+    return {
+        **_bulk_bootstrap_with_bisection(bootstrap_service, raw_tenants[:middle], force, skip_locked),
+        **_bulk_bootstrap_with_bisection(bootstrap_service, raw_tenants[middle:], force, skip_locked),
+    }
+
 
-    for raw_tenant in raw_tenants:
-        results[raw_tenant] = _single_bootstrap_with_retry(
+def _bootstrap_partition(
+    query: QuerySet,
+    worker: int,
+    workers: int,
+    force: bool,
+    progress: _Progress,
+    track_successful: bool,
+) -> _BootstrapSummary:
+    """Bootstrap the tenants whose id falls in the partition of the given worker."""
+    # Each worker replicates through its own replicator, so its events are batched with its own tenants.
+    bootstrap_service = V2TenantBootstrapService(replicator=OutboxReplicator())
+    partition = query.alias(partition=Mod("id", workers)).filter(partition=worker).order_by("id")
+    summary = _BootstrapSummary(track_successful=track_successful)
+
+    # These are "raw" because we haven't locked anything, and the tenant could vanish out from under us.
+    for raw_tenants in itertools.batched(partition.iterator(), BATCH_SIZE):
+        results = _bulk_bootstrap_with_bisection(
             bootstrap_service=bootstrap_service,
-            raw_tenant=raw_tenant,
+            raw_tenants=list(raw_tenants),
             force=force,
+            # With a single worker nothing else is expected to lock tenants, so waiting for a lock is fine.
+            skip_locked=workers > 1,
         )
+        for raw_tenant, result in results.items():
+            summary.add(raw_tenant.pk, raw_tenant.org_id, result)
+        progress.advance(len(raw_tenants))
+
+    return summary
 
-    return results
+
+def _bootstrap_partition_in_thread(*args) -> _BootstrapSummary:
+    """Bootstrap a partition from a worker thread, which has its own database connection."""
+    try:
+        return _bootstrap_partition(*args)
+    finally:
+        connection.close()
 
 
 class Command(BaseCommand):
@@ -133,6 +270,16 @@ class Command(BaseCommand):
             help="re-replicate bootstrap relations for bootstrapped tenants",
         )
 
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "number of concurrent workers, each with its own database connection; with more than one, tenants "
+                "locked by another transaction are skipped and bootstrapped once all workers finish"
+            ),
+        )
+
     def handle(self, **options):
         """Run the command."""
         use_all = options["all"]
@@ -156,49 +303,51 @@ class Command(BaseCommand):
             base_query: QuerySet = Tenant.objects.filter(org_id__in=requested_org_ids)
 
         force = options["force"]
-        bootstrap_service = V2TenantBootstrapService(replicator=OutboxReplicator())
+        workers = options["workers"]
+
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
 
         query = base_query.exclude(tenant_name="public")
         estimate = query.count()
 
-        logger.info(f"About to bootstrap an estimated {estimate} tenants...")
+        logger.info(f"About to bootstrap an estimated {estimate} tenants with {workers} workers...")
         logger.info(f"Running with {force=}.")
 
-        successful_org_ids = set[str]()  # Only populated if use_org_ids is true.
-        missing_org_ids = set[str]()
-        failed_org_ids = set[str]()
+        progress = _Progress(estimate)
 
-        tenants_seen = 0
-
-        # These are "raw" because we haven't locked anything, and the tenant could vanish out from under us.
-        #
-        # We use a batch size of 40 because there is a number limit relationships of 1 k:
-        # https://authzed.com/docs/spicedb/ops/data/bulk-operations At time of
-        # writing (2025-11-04), there are 21 relations per bootstrapped tenant at most (when there is no custom
-        # default group). This value may need to be updated if this script is used in the future.
-        for raw_tenants in itertools.batched(query.iterator(), 40):
-            logger.info(f"Bootstrapping tenant {tenants_seen + 1}-{tenants_seen + len(raw_tenants)}/{estimate}...")
-
-            bulk_result = _bulk_bootstrap_with_retry(
-                bootstrap_service=bootstrap_service,
-                raw_tenants=set(raw_tenants),
-                force=force,
+        if workers == 1:
+            summary = _bootstrap_partition(query, 0, 1, force, progress, use_org_ids)
+        else:
+            # Tenants are partitioned by id, so workers never contend for the same tenant.
+            summary = _BootstrapSummary(track_successful=use_org_ids)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rbac-bootstrap-tenants") as executor:
+                futures = [
+                    executor.submit(
+                        _bootstrap_partition_in_thread, query, worker, workers, force, progress, use_org_ids
+                    )
+                    for worker in range(workers)
+                ]
+                for future in futures:
+                    summary.merge(future.result())
+
+        if summary.locked_tenants:
+            logger.info(
+                f"Bootstrapping {len(summary.locked_tenants)} tenants which were locked, waiting for their locks."
             )
-
-            for raw_tenant, tenant_result in bulk_result.items():
-
-                if isinstance(tenant_result, BootstrappedTenant):
-                    if use_org_ids:
-                        successful_org_ids.add(tenant_result.tenant.org_id)
-                else:
-                    if tenant_result == _BootstrapError.NO_SUCH_TENANT:
-                        missing_org_ids.add(raw_tenant.org_id)
-                    elif tenant_result == _BootstrapError.FAILED:
-                        failed_org_ids.add(raw_tenant.org_id)
-                    else:
-                        raise ValueError(f"Unexpected result: {tenant_result}")
-
-            tenants_seen += len(raw_tenants)
+            bootstrap_service = V2TenantBootstrapService(replicator=OutboxReplicator())
+
+            for tenant_pk, org_id in list(summary.locked_tenants.items()):
+                result = _single_bootstrap_with_retry(
+                    bootstrap_service=bootstrap_service,
+                    tenant_pk=tenant_pk,
+                    force=force,
+                )
+                summary.add(tenant_pk, org_id, result)
+
+        successful_org_ids = summary.successful_org_ids
+        missing_org_ids = summary.missing_org_ids
+        failed_org_ids = summary.failed_org_ids
 
         if missing_org_ids:
             logger.warning(
@@ -19,6 +19,9 @@ class Command(BaseCommand):
         parser.add_argument("--skip_download", default="false", help="Skipping the download of file")
         parser.add_argument("--start_line", default=1, help="The line of records to start scanning")
         parser.add_argument("--batch_size", default=1000, help="The number of records to process as a batch")
+        parser.add_argument(
+            "--resume", default="false", help="Start after the last line imported by a previous run of the same file"
+        )
 
     def handle(self, *args, **options):
         """Handle method for command."""
@@ -29,5 +32,6 @@ class Command(BaseCommand):
         logger.info("*** Populating tenant and user data... ***")
         start_line = int(options["start_line"])
         batch_size = int(options["batch_size"])
-        populate_tenant_user_data(FILE_NAME, start_line=start_line, batch_size=batch_size)
+        resume = options["resume"].lower() == "true"
+        populate_tenant_user_data(FILE_NAME, start_line=start_line, batch_size=batch_size, resume=resume)
         logger.info("*** Data population completed. ***")
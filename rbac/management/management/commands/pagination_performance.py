@@ -0,0 +1,34 @@
+"""Benchmark of the group list pagination."""
+
+from django.core.management.base import BaseCommand
+from tests.performance.test_performance_export import N_GROUPS
+from tests.performance.test_performance_pagination import setUp, tearDown, test_group_pagination
+
+
+class Command(BaseCommand):
+    """Command to setup, run, and teardown the pagination benchmark."""
+
+    help = """
+    Run the group list pagination benchmark. If running locally,
+    run the setup command first to seed the groups.
+
+    Usage:
+        python manage.py pagination_performance [setup|test|teardown] [--groups N]
+    """
+
+    def add_arguments(self, parser):
+        """Parse command arguments."""
+        parser.add_argument("mode", type=str, nargs="?", default="test", help="Choice of setup, test, or teardown")
+        parser.add_argument("--groups", type=int, default=N_GROUPS, help="Number of groups seeded by setup")
+
+    def handle(self, **options):
+        """Run the command."""
+        mode = options["mode"]
+        if mode == "setup":
+            setUp(options["groups"])
+        elif mode == "teardown":
+            tearDown()
+        elif mode == "test":
+            test_group_pagination()
+        else:
+            print("Invalid mode. Please choose from setup, test, or teardown.")
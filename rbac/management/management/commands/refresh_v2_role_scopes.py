@@ -0,0 +1,36 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Command to backfill the derived scope columns of V2 roles."""
+
+import logging
+
+from django.core.management.base import BaseCommand
+from management.role.v2_role_scope import refresh_v2_role_scopes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Command class for recomputing V2 role scope columns."""
+
+    help = "Recomputes the highest_scope and out_of_scope columns of every V2 role from its permissions"
+
+    def handle(self, *args, **options):
+        """Handle method for command."""
+        logger.info("*** Refreshing V2 role scopes... ***")
+        updated = refresh_v2_role_scopes()
+        logger.info(f"*** Refreshed the scope columns of {updated} V2 roles. ***")
@@ -21,10 +21,11 @@ import os
 
 import boto3
 from botocore.exceptions import ClientError
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
 from management.principal.model import Principal
 from management.role.relation_api_dual_write_handler import OutboxReplicator
-from management.tenant_mapping.model import logger
+from management.tenant_mapping.model import TenantMapping, logger
+from management.tenant_service.tenant_service import BootstrappedTenant
 from management.tenant_service.v2 import V2TenantBootstrapService
 from management.workspace.model import Workspace
 
@@ -38,6 +39,11 @@ def get_file_path(file_name):
     return f"/tmp/{file_name}"
 
 
+def get_checkpoint_path(file_name):
+    """Get the path of the file recording the last imported line of the users data."""
+    return f"{get_file_path(file_name)}.checkpoint"
+
+
 def get_s3_client():
     """Create and return an S3 client."""
     return boto3.client(
@@ -55,6 +61,10 @@ def download_data_from_S3(file_name):
     if os.path.exists(file_path):
         os.remove(file_path)
         logger.info(f"Removed existing data file: {file_path}")
+    checkpoint_path = get_checkpoint_path(file_name)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+        logger.info(f"Removed checkpoint of the existing data file: {checkpoint_path}")
 
     bucket = os.environ.get("S3_AWS_BUCKET")
     logger.info(f"Downloading file from S3 bucket: {bucket}")
@@ -66,38 +76,152 @@ def download_data_from_S3(file_name):
         raise
 
 
-def populate_tenant_user_data(file_name, start_line=1, batch_size=1000):
+USER_STAGING_TABLE = "import_user_data_staging"
+SERVICE_ACCOUNT_STAGING_TABLE = "import_service_account_data_staging"
+ORG_ADMIN_PERMISSION = "admin:org:all"
+
+
+def read_checkpoint(file_name):
+    """Return the last line of the users data imported by a previous run, or 0."""
+    checkpoint_path = get_checkpoint_path(file_name)
+    if not os.path.exists(checkpoint_path):
+        return 0
+    with open(checkpoint_path, "r") as file:
+        return int(file.read().strip() or 0)
+
+
+def write_checkpoint(file_name, line):
+    """Record the last line of the users data that was imported."""
+    with open(get_checkpoint_path(file_name), "w") as file:
+        file.write(str(line))
+
+
+def stage_csv(cursor, file_path, table, columns):
+    """
+    Copy a CSV file with a header into a new temporary table.
+
+    Every column is text, and each row is numbered by its line in the file, starting from 1 after the header.
+    """
+    column_definitions = ", ".join(f"{column} text" for column in columns)
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE {table} (line bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY, {column_definitions})"
+    )
+    with open(file_path, "r") as file:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, HEADER true)", file)
+    cursor.execute(f"ANALYZE {table}")
+    cursor.execute(f"SELECT COALESCE(MAX(line), 0) FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def populate_tenant_user_data(file_name, start_line=1, batch_size=1000, resume=False):
     """
     Populate tenant and user data from the downloaded file.
 
+    The file is copied into a staging table, the tenants it refers to that are missing or not bootstrapped are
+    bootstrapped in bulk, and the users are then imported in batches. The last imported line is checkpointed after
+    each batch, so that an interrupted run can be resumed.
+
     Args:
         batch_size (int): Number of records to process in each batch.
         start_line(int): Line number to start processing from (1).
+        resume (bool): Whether to start after the last line checkpointed by a previous run, if further.
     """
-    file_path = get_file_path(file_name)
-    with open(file_path, "r") as file:
-        csv_reader = csv.reader(file)
-        # Skip lines until start
-        for _ in range(start_line):
-            next(csv_reader, None)
-        batch_data = []
-        for current_line, row in enumerate(csv_reader, start=start_line):
-            org_id, admin, principal_name, user_id = row
-            admin = admin == "admin:org:all"
-            batch_data.append((org_id, admin, principal_name, user_id))
-            if len(batch_data) >= batch_size:
-                process_batch(batch_data)
-                logger.info(f"Processed batch ending at line {current_line}")
-                batch_data = []
-        # Process any remaining records
-        if batch_data:
-            process_batch(batch_data)
-            logger.info(f"Processed final batch ending at line {current_line}")
+    if resume:
+        start_line = max(start_line, read_checkpoint(file_name) + 1)
+    with connection.cursor() as cursor:
+        last_line = stage_csv(
+            cursor, get_file_path(file_name), USER_STAGING_TABLE, ["org_id", "permission", "username", "user_id"]
+        )
+        logger.info(f"Staged {last_line} lines of tenant and user data")
+        bootstrap_staged_tenants(cursor, start_line, batch_size)
+
+        for first_line in range(start_line, last_line + 1, batch_size):
+            current_line = min(first_line + batch_size - 1, last_line)
+            cursor.execute(
+                f"""
+                SELECT org_id, permission IS NOT DISTINCT FROM %s, username, user_id
+                FROM {USER_STAGING_TABLE}
+                WHERE line BETWEEN %s AND %s
+                ORDER BY line
+                """,
+                [ORG_ADMIN_PERMISSION, first_line, current_line],
+            )
+            batch_data = cursor.fetchall()
+            with transaction.atomic():
+                update_staged_principal_user_ids(cursor, first_line, current_line)
+                process_batch(batch_data, staged=True)
+            write_checkpoint(file_name, current_line)
+            logger.info(f"Processed batch ending at line {current_line}")
     return
 
 
-def process_batch(batch_data):
-    """Process a batch of tenant and principal data."""
+def bootstrap_staged_tenants(cursor, start_line, batch_size):
+    """Bootstrap the staged tenants that do not exist or do not have a tenant mapping, in batches."""
+    cursor.execute(
+        f"""
+        SELECT DISTINCT staging.org_id
+        FROM {USER_STAGING_TABLE} staging
+        LEFT JOIN {Tenant._meta.db_table} tenant ON tenant.org_id = staging.org_id
+        LEFT JOIN {TenantMapping._meta.db_table} mapping ON mapping.tenant_id = tenant.id
+        WHERE staging.line >= %s AND staging.org_id IS NOT NULL AND mapping.id IS NULL
+        ORDER BY staging.org_id
+        """,
+        [start_line],
+    )
+    org_ids = [row[0] for row in cursor.fetchall()]
+    logger.info(f"Bootstrapping {len(org_ids)} tenants")
+    for index in range(0, len(org_ids), batch_size):
+        batch_end = index + batch_size
+        batch_org_ids = set(org_ids[index:batch_end])
+        try:
+            with transaction.atomic():
+                BOOT_STRAP_SERVICE.get_or_bootstrap_tenants(batch_org_ids)
+        except IntegrityError as e:
+            """Retry once if there is creation conflict."""
+            logger.info(f"IntegrityError: {e.__cause__}. Retrying bootstrap.")
+            with transaction.atomic():
+                BOOT_STRAP_SERVICE.get_or_bootstrap_tenants(batch_org_ids)
+
+
+def update_staged_principal_user_ids(cursor, first_line, last_line):
+    """Set the user_id of the existing principals of the staged users between the given lines."""
+    # Usernames are stored lower-cased, and the last line wins for a user listed several times.
+    cursor.execute(
+        f"""
+        UPDATE {Principal._meta.db_table} principal
+        SET user_id = staging.user_id
+        FROM (
+            SELECT DISTINCT ON (org_id, LOWER(username)) org_id, LOWER(username) AS username, user_id
+            FROM {USER_STAGING_TABLE}
+            WHERE line BETWEEN %s AND %s AND org_id IS NOT NULL AND username IS NOT NULL
+            ORDER BY org_id, LOWER(username), line DESC
+        ) staging
+        JOIN {Tenant._meta.db_table} tenant ON tenant.org_id = staging.org_id
+        WHERE principal.tenant_id = tenant.id
+            AND principal.username = staging.username
+            AND principal.user_id IS DISTINCT FROM staging.user_id
+        """,
+        [first_line, last_line],
+    )
+    return cursor.rowcount
+
+
+def get_bootstrapped_tenants(org_ids):
+    """Get the tenants with the given org_ids that are already bootstrapped, without locking them."""
+    return [
+        BootstrappedTenant(tenant=mapping.tenant, mapping=mapping)
+        for mapping in TenantMapping.objects.filter(tenant__org_id__in=org_ids).select_related("tenant")
+    ]
+
+
+def process_batch(batch_data, staged=False):
+    """
+    Process a batch of tenant and principal data.
+
+    If [staged] is True, the tenants of the batch have been bootstrapped by bootstrap_staged_tenants and the user_ids
+    of their principals set by update_staged_principal_user_ids, so only the default group relations are replicated.
+    """
     users = []
     for org_id, org_admin, principal_name, user_id in batch_data:
         user = User()
@@ -107,32 +231,45 @@ def process_batch(batch_data):
         user.user_id = user_id
         user.is_active = True
         users.append(user)
+    import_args = {}
+    if staged:
+        import_args = {
+            "bootstrapped_tenants": get_bootstrapped_tenants({user.org_id for user in users}),
+            "update_user_ids": False,
+        }
     try:
         # In atomic block so that if anything goes wrong, the whole batch is rolled back and can be retried
         # Otherwise we may have some partial tenant data, and a tenant may not get fully bootstrapped.
         with transaction.atomic():
-            BOOT_STRAP_SERVICE.import_bulk_users(users)
+            BOOT_STRAP_SERVICE.import_bulk_users(users, **import_args)
     except IntegrityError as e:
         """Retry once if there is creation conflict."""
         logger.info(f"IntegrityError: {e.__cause__}. Retrying import.")
         with transaction.atomic():
-            BOOT_STRAP_SERVICE.import_bulk_users(users)
+            BOOT_STRAP_SERVICE.import_bulk_users(users, **import_args)
 
 
 def populate_service_account_data(file_name):
-    """Populate service account data from the downloaded file."""
-    file_path = get_file_path(file_name)
-    id_mapping = {}
-    with open(file_path, "r") as file:
-        csv_reader = csv.reader(file)
-        next(csv_reader, None)  # Skip header
-        for row in csv_reader:
-            user_id, client_id = row
-            id_mapping[client_id] = user_id
-    for principal in Principal.objects.filter(type=Principal.Types.SERVICE_ACCOUNT):
-        if user_id := id_mapping.get(principal.service_account_id):
-            principal.user_id = user_id
-            principal.save()
+    """Populate service account data from the downloaded file with a single update from a staging table."""
+    with connection.cursor() as cursor:
+        stage_csv(cursor, get_file_path(file_name), SERVICE_ACCOUNT_STAGING_TABLE, ["user_id", "client_id"])
+        # The last line wins for a client listed several times.
+        cursor.execute(
+            f"""
+            UPDATE {Principal._meta.db_table} principal
+            SET user_id = staging.user_id
+            FROM (
+                SELECT DISTINCT ON (client_id) client_id, user_id
+                FROM {SERVICE_ACCOUNT_STAGING_TABLE}
+                ORDER BY client_id, line DESC
+            ) staging
+            WHERE principal.type = %s
+                AND principal.service_account_id = staging.client_id
+                AND principal.user_id IS DISTINCT FROM staging.user_id
+            """,
+            [Principal.Types.SERVICE_ACCOUNT],
+        )
+        logger.info(f"Updated the user_id of {cursor.rowcount} service account principals")
 
 
 def populate_workspace_data(file_name, batch_size=250):
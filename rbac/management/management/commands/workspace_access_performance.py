@@ -0,0 +1,40 @@
+"""Benchmark of the workspace access filter."""
+
+from django.core.management.base import BaseCommand
+from tests.performance.test_performance_workspace_access import (
+    N_WORKSPACES,
+    setUp,
+    tearDown,
+    test_workspace_access_filter,
+)
+
+
+class Command(BaseCommand):
+    """Command to setup, run, and teardown the workspace access filter benchmark."""
+
+    help = """
+    Run the workspace access filter benchmark. If running locally,
+    run the setup command first to seed the workspaces.
+
+    Usage:
+        python manage.py workspace_access_performance [setup|test|teardown] [--workspaces N]
+    """
+
+    def add_arguments(self, parser):
+        """Parse command arguments."""
+        parser.add_argument("mode", type=str, nargs="?", default="test", help="Choice of setup, test, or teardown")
+        parser.add_argument(
+            "--workspaces", type=int, default=N_WORKSPACES, help="Number of workspaces seeded by setup"
+        )
+
+    def handle(self, **options):
+        """Run the command."""
+        mode = options["mode"]
+        if mode == "setup":
+            setUp(options["workspaces"])
+        elif mode == "teardown":
+            tearDown()
+        elif mode == "test":
+            test_workspace_access_filter()
+        else:
+            print("Invalid mode. Please choose from setup, test, or teardown.")
@@ -40,17 +40,22 @@ from management.audit_log.view import AuditLogViewSet
 from management.group.view import GroupViewSet
 from management.models import Access, AuditLog
 from management.permission.view import PermissionViewSet
+from management.permissions.role_binding_access import RoleBindingSystemUserAccessPermission
+from management.permissions.role_v2_access import RoleV2KesselAccessPermission
 from management.principal.model import Principal
 from management.principal.proxy import PrincipalProxy
 from management.principal.view import PrincipalView
+from management.role.v2_model import RoleV2
 from management.role.v2_view import RoleV2ViewSet
 from management.role.view import RoleViewSet
+from management.role_binding.service import RoleBindingService
 from management.role_binding.view import RoleBindingViewSet
 from management.tenant_mapping.v2_activation import is_v2_write_activated
 from management.workspace.view import WorkspaceViewSet
 from mcp.server.fastmcp import FastMCP
 from prometheus_client import Counter, Histogram
 from redis import exceptions as redis_exceptions
+from rest_framework.request import Request
 
 from api.common import RH_IDENTITY_HEADER
 from api.cross_access.view import CrossAccountRequestViewSet
@@ -84,6 +89,9 @@ logger = logging.getLogger(__name__)
 
 PROTOCOL_VERSION = "2025-03-26"
 
+# Upper bound on the number of requests in a single JSON-RPC batch.
+MAX_BATCH_SIZE = 50
+
 # --- Prometheus metrics ---
 
 mcp_tool_call_total = Counter(
@@ -358,7 +366,7 @@ def _call_view(
 # │ get_role                         │ unified   │ V1: GET /api/v1/roles/{uuid}/ + /access/   │
 # │                                  │           │ V2: GET /api/v2/roles/{uuid}/              │
 # │ check_user_permission            │ unified   │ V1: GET /api/v1/access/                    │
-# │                                  │           │ V2: role-bindings → roles                  │
+# │                                  │           │ V2: role bindings resolved in-process      │
 # │ list_access                      │ v1        │ GET /api/v1/access/                        │
 # │ list_group_roles                 │ v1        │ GET /api/v1/groups/{uuid}/roles/           │
 # │ list_role_access                 │ v1        │ GET /api/v1/roles/{uuid}/access/           │
@@ -1301,8 +1309,6 @@ def check_user_permission(
     if not tenant or not is_v2_write_activated(tenant):
         return _check_user_permission_v1(request, username, permission)
 
-    from management.principal.model import Principal
-
     principal = Principal.objects.filter(username=username, tenant=tenant).first()
     if not principal:
         return json.dumps(
@@ -1315,21 +1321,17 @@ def check_user_permission(
             }
         )
 
-    bindings_path = reverse("v2_management:role-bindings-list")
-    raw = _call_view(
-        request,
-        _role_binding_list_view,
-        bindings_path,
-        {
-            "granted_subject_type": "user",
-            "granted_subject_id": str(principal.uuid),
-            "limit": "1000",
-        },
-    )
-    bindings_data = json.loads(raw)
-    bindings = bindings_data.get("data", [])
+    if not _can_read_v2_access(request):
+        return json.dumps(
+            {
+                "allowed": False,
+                "error": "You do not have permission to perform this action.",
+                "hint": "Requires permission to read roles in this organization.",
+            }
+        )
 
-    if not bindings:
+    roles = _granted_roles(request, tenant, principal)
+    if not roles:
         return json.dumps(
             {
                 "allowed": False,
@@ -1343,27 +1345,20 @@ def check_user_permission(
             }
         )
 
-    role_uuids = {b["role"]["id"] for b in bindings if b.get("role", {}).get("id")}
-
-    for role_uuid in role_uuids:
-        role_path = reverse("v2_management:roles-detail", kwargs={"uuid": role_uuid})
-        role_raw = _call_view(request, _role_v2_detail_view, role_path, {}, uuid=role_uuid)
-        role_data = json.loads(role_raw)
-
-        for perm in role_data.get("permissions", []):
-            perm_str = f"{perm['application']}:{perm['resource_type']}:{perm['operation']}"
-            if _permission_matches(perm_str, permission):
-                return json.dumps(
-                    {
-                        "allowed": True,
-                        "username": username,
-                        "permission": permission,
-                        "matched_permission": perm_str,
-                        "role_name": role_data.get("name"),
-                        "role_uuid": str(role_uuid),
-                        "org_version": "v2",
-                    }
-                )
+    for effective in RoleBindingService.effective_permissions(roles):
+        perm_str = effective.permission.permission
+        if _permission_matches(perm_str, permission):
+            return json.dumps(
+                {
+                    "allowed": True,
+                    "username": username,
+                    "permission": permission,
+                    "matched_permission": perm_str,
+                    "role_name": effective.role.name,
+                    "role_uuid": str(effective.role.uuid),
+                    "org_version": "v2",
+                }
+            )
 
     return json.dumps(
         {
@@ -1371,7 +1366,7 @@ def check_user_permission(
             "username": username,
             "permission": permission,
             "org_version": "v2",
-            "total_roles_checked": len(role_uuids),
+            "total_roles_checked": len(roles),
             "hint": f"User '{username}' does not have permission '{permission}' in this V2 organization. "
             f"Use list_role_bindings(granted_subject_type='user', "
             f"granted_subject_id='{principal.uuid}') to see all role bindings, "
@@ -1380,6 +1375,30 @@ def check_user_permission(
     )
 
 
+def _can_read_v2_access(request: HttpRequest) -> bool:
+    """Check the caller may read role bindings and roles, as the V2 REST views would require.
+
+    The result is kept on the request so a JSON-RPC batch of checks asks Kessel only once.
+    """
+    allowed = getattr(request, "_mcp_can_read_v2_access", None)
+    if allowed is None:
+        drf_request = Request(_clone_request(request, request.path))
+        drf_request.user = request.user
+        allowed = RoleBindingSystemUserAccessPermission().has_permission(
+            drf_request, None
+        ) and RoleV2KesselAccessPermission().has_permission(drf_request, None)
+        request._mcp_can_read_v2_access = allowed
+    return allowed
+
+
+def _granted_roles(request: HttpRequest, tenant: Any, principal: Principal) -> list[RoleV2]:
+    """Return the roles bound to a principal, resolved once per request for the whole batch."""
+    cache = request.__dict__.setdefault("_mcp_granted_roles", {})
+    if principal.pk not in cache:
+        cache[principal.pk] = list(RoleBindingService(tenant=tenant).get_roles_granted_to_principal(principal))
+    return cache[principal.pk]
+
+
 def _check_user_permission_v1(request: HttpRequest, username: str, permission: str) -> str:
     """Check user permission using V1 access endpoint."""
     application = permission.split(":")[0]
@@ -1463,20 +1482,20 @@ class JsonRpcRequest:
     params: dict[str, Any]
 
 
-def _parse_jsonrpc(body: bytes) -> JsonRpcRequest:
-    """Parse and validate a JSON-RPC 2.0 request body.
-
-    Returns a JsonRpcRequest on success. Raises JsonRpcError on validation failure.
-    Notifications (no id) return a JsonRpcRequest with request_id=None.
-    """
+def _load_jsonrpc(body: bytes) -> Any:
+    """Decode a JSON-RPC request body, which may hold a single request or a batch."""
     try:
-        payload = json.loads(body)
+        return json.loads(body)
     except (json.JSONDecodeError, ValueError):
         raise JsonRpcError(None, -32700, "Parse error")
 
-    if isinstance(payload, list):
-        raise JsonRpcError(None, -32600, "Invalid Request: batch requests are not supported")
 
+def _parse_jsonrpc_payload(payload: Any) -> JsonRpcRequest:
+    """Validate a decoded JSON-RPC 2.0 request object.
+
+    Returns a JsonRpcRequest on success. Raises JsonRpcError on validation failure.
+    Notifications (no id) return a JsonRpcRequest with request_id=None.
+    """
     if not isinstance(payload, dict):
         raise JsonRpcError(None, -32600, "Invalid Request: expected a JSON object")
 
@@ -1522,7 +1541,10 @@ class MCPView(View):
         req_id = getattr(request, "req_id", "unknown")
 
         try:
-            rpc_req = _parse_jsonrpc(request.body)
+            payload = _load_jsonrpc(request.body)
+            if isinstance(payload, list):
+                return self._post_batch(request, payload)
+            rpc_req = _parse_jsonrpc_payload(payload)
         except JsonRpcError as exc:
             logger.warning(
                 "mcp: parse error, org_id=%s, req_id=%s, code=%s, msg='%s'",
@@ -1533,20 +1555,44 @@ class MCPView(View):
             )
             return _error_response(exc.request_id, exc.code, exc.message)
 
-        logger.info("mcp: method=%s, org_id=%s, req_id=%s", rpc_req.method, org_id, req_id)
-
-        if rpc_req.request_id is None:
+        response = _dispatch(request, rpc_req)
+        if response is None:
             return HttpResponse(status=202, content_type="application/json")
+        return response
+
+    def _post_batch(self, request: HttpRequest, payloads: list[Any]) -> HttpResponse:
+        """Handle a JSON-RPC batch, answering with an array of the non-notification responses.
+
+        Requests run in order against the same Django request, so per-request caches (such as the roles
+        resolved for check_user_permission) are shared across the batch.
+        """
+        if not payloads:
+            raise JsonRpcError(None, -32600, "Invalid Request: batch must not be empty")
+        if len(payloads) > MAX_BATCH_SIZE:
+            raise JsonRpcError(None, -32600, f"Invalid Request: batch exceeds {MAX_BATCH_SIZE} requests")
+
+        logger.info(
+            "mcp: batch of %d, org_id=%s, req_id=%s",
+            len(payloads),
+            getattr(getattr(request, "user", None), "org_id", None),
+            getattr(request, "req_id", "unknown"),
+        )
 
-        if rpc_req.method == "initialize":
-            return _handle_initialize(request, rpc_req.request_id, rpc_req.params)
-        if rpc_req.method == "tools/list":
-            return _handle_tools_list(request, rpc_req.request_id, rpc_req.params)
-        if rpc_req.method == "tools/call":
-            return _handle_tools_call(request, rpc_req.request_id, rpc_req.params)
-
-        logger.warning("mcp: unknown method=%s, org_id=%s, req_id=%s", rpc_req.method, org_id, req_id)
-        return _error_response(rpc_req.request_id, -32601, f"Method not found: {rpc_req.method}")
+        contents = []
+        for payload in payloads:
+            try:
+                rpc_req = _parse_jsonrpc_payload(payload)
+                if rpc_req.method == "initialize":
+                    raise JsonRpcError(rpc_req.request_id, -32600, "Invalid Request: initialize cannot be batched")
+                response = _dispatch(request, rpc_req)
+            except JsonRpcError as exc:
+                response = _error_response(exc.request_id, exc.code, exc.message)
+            if response is not None:
+                contents.append(response.content)
+
+        if not contents:
+            return HttpResponse(status=202, content_type="application/json")
+        return HttpResponse(b"[" + b",".join(contents) + b"]", content_type="application/json")
 
     def get(self, request: HttpRequest) -> HttpResponse:
         """SSE streaming is not supported in WSGI mode."""
@@ -1560,6 +1606,26 @@ class MCPView(View):
 # --- JSON-RPC method handlers ---
 
 
+def _dispatch(request: HttpRequest, rpc_req: JsonRpcRequest) -> JsonResponse | None:
+    """Route a parsed JSON-RPC request to its handler, returning None for notifications."""
+    org_id = getattr(getattr(request, "user", None), "org_id", None)
+    req_id = getattr(request, "req_id", "unknown")
+    logger.info("mcp: method=%s, org_id=%s, req_id=%s", rpc_req.method, org_id, req_id)
+
+    if rpc_req.request_id is None:
+        return None
+
+    if rpc_req.method == "initialize":
+        return _handle_initialize(request, rpc_req.request_id, rpc_req.params)
+    if rpc_req.method == "tools/list":
+        return _handle_tools_list(request, rpc_req.request_id, rpc_req.params)
+    if rpc_req.method == "tools/call":
+        return _handle_tools_call(request, rpc_req.request_id, rpc_req.params)
+
+    logger.warning("mcp: unknown method=%s, org_id=%s, req_id=%s", rpc_req.method, org_id, req_id)
+    return _error_response(rpc_req.request_id, -32601, f"Method not found: {rpc_req.method}")
+
+
 def _handle_initialize(request: HttpRequest, request_id: Any, params: dict[str, Any]) -> JsonResponse:
     """Handle MCP initialize request."""
     client_info = params.get("clientInfo", {})
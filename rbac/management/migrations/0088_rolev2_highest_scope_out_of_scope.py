@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_v2_role_scopes(apps, schema_editor):
+    """Compute the derived scope columns of the existing V2 roles, which would otherwise keep their defaults.
+
+    highest_scope is the highest scope of any permission of the role, a malformed permission counting as the default
+    scope, and out_of_scope is whether any permission belongs to an application in V2_MIGRATION_APP_EXCLUDE_LIST.
+    """
+    from management.permission.scope_service import ImplicitResourceService, Scope
+
+    RoleV2 = apps.get_model("management", "RoleV2")
+    RoleV2Permissions = RoleV2.permissions.through
+
+    scope_service = ImplicitResourceService.from_settings()
+    excluded_applications = {app.strip() for app in settings.V2_MIGRATION_APP_EXCLUDE_LIST if app and app.strip()}
+
+    def scope_for(permission):
+        try:
+            return int(scope_service.scope_for_permission(permission))
+        except ValueError:
+            return int(Scope.DEFAULT)
+
+    scopes = {}
+    rows = RoleV2Permissions.objects.values_list("rolev2_id", "permission__permission", "permission__application")
+    for role_id, permission, application in rows.iterator(chunk_size=BATCH_SIZE):
+        highest_scope, out_of_scope = scopes.get(role_id, (int(Scope.DEFAULT), False))
+        scopes[role_id] = (
+            max(highest_scope, scope_for(permission)),
+            out_of_scope or application in excluded_applications,
+        )
+
+    role_ids = sorted(scopes)
+    for start in range(0, len(role_ids), BATCH_SIZE):
+        roles = RoleV2.objects.filter(pk__in=role_ids[start : start + BATCH_SIZE]).only(  # noqa: E203
+            "pk", "highest_scope", "out_of_scope"
+        )
+        changed = []
+        for role in roles:
+            if (role.highest_scope, role.out_of_scope) != scopes[role.pk]:
+                role.highest_scope, role.out_of_scope = scopes[role.pk]
+                changed.append(role)
+        RoleV2.objects.bulk_update(changed, ["highest_scope", "out_of_scope"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("management", "0087_alter_extrolerelation_ext_id_alter_exttenant_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rolev2",
+            name="highest_scope",
+            field=models.PositiveSmallIntegerField(db_index=True, default=1),
+        ),
+        migrations.AddField(
+            model_name="rolev2",
+            name="out_of_scope",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(backfill_v2_role_scopes, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 5.2.12 on 2026-10-19
+
+from django.db import migrations, models
+
+# The columns of the audit log table, shared by both directions of the conversion.
+COLUMNS = """
+    created timestamp with time zone NOT NULL,
+    principal_username text NOT NULL,
+    description text NOT NULL,
+    resource_type varchar(32) NOT NULL,
+    resource_id integer NULL,
+    action varchar(32) NOT NULL,
+    tenant_id integer NULL,
+    resource_uuid uuid NULL,
+    secondary_resource_uuid uuid NULL
+"""
+COLUMN_NAMES = (
+    "id, created, principal_username, description, resource_type, resource_id, action, tenant_id, resource_uuid, "
+    "secondary_resource_uuid"
+)
+
+# The indexes created by earlier migrations, besides the (tenant, created) one this migration replaces.
+INDEXES = """
+CREATE INDEX management_auditlog_tenant_id_54368f1c ON management_auditlog (tenant_id);
+CREATE INDEX management__tenant__9132ca_idx ON management_auditlog (tenant_id, resource_type);
+CREATE INDEX management__tenant__130cc6_idx ON management_auditlog (tenant_id, action);
+ALTER TABLE management_auditlog ADD CONSTRAINT management_auditlog_tenant_id_54368f1c_fk_api_tenant_id
+    FOREIGN KEY (tenant_id) REFERENCES api_tenant (id) DEFERRABLE INITIALLY DEFERRED;
+"""
+
+# Move the audit log into a table range-partitioned by month on created. A partitioned table can only enforce
+# uniqueness on columns including the partition key, so the primary key becomes (id, created); ids still come from a
+# single sequence. A partition is created for every month holding entries up to three months ahead, and a default
+# partition catches anything outside of them until management.audit_log.partitions creates its month. The old table is
+# locked against writes first, so entries written by running pods are neither lost with it nor given ids that the new
+# sequence hands out again; they wait for the migration and then write to the new table.
+PARTITION_SQL = f"""
+LOCK TABLE management_auditlog IN SHARE ROW EXCLUSIVE MODE;
+CREATE SEQUENCE management_auditlog_partitioned_id_seq AS integer;
+CREATE TABLE management_auditlog_partitioned (
+    id integer NOT NULL DEFAULT nextval('management_auditlog_partitioned_id_seq'),
+    {COLUMNS},
+    PRIMARY KEY (id, created)
+) PARTITION BY RANGE (created);
+ALTER SEQUENCE management_auditlog_partitioned_id_seq OWNED BY management_auditlog_partitioned.id;
+CREATE TABLE management_auditlog_default PARTITION OF management_auditlog_partitioned DEFAULT;
+
+DO $$
+DECLARE
+    month timestamp;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE((SELECT min(created) FROM management_auditlog), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+            interval '1 month'
+        )
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF management_auditlog_partitioned FOR VALUES FROM (%L) TO (%L)',
+            'management_auditlog_p' || to_char(month, 'YYYY_MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END
+$$;
+
+INSERT INTO management_auditlog_partitioned ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM management_auditlog;
+SELECT setval(
+    'management_auditlog_partitioned_id_seq', COALESCE((SELECT max(id) FROM management_auditlog), 0) + 1, false
+);
+
+DROP TABLE management_auditlog;
+ALTER TABLE management_auditlog_partitioned RENAME TO management_auditlog;
+ALTER SEQUENCE management_auditlog_partitioned_id_seq RENAME TO management_auditlog_id_seq;
+ALTER INDEX management_auditlog_partitioned_pkey RENAME TO management_auditlog_pkey;
+{INDEXES}
+"""
+
+UNPARTITION_SQL = f"""
+LOCK TABLE management_auditlog IN SHARE ROW EXCLUSIVE MODE;
+CREATE TABLE management_auditlog_unpartitioned (
+    id integer NOT NULL GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    {COLUMNS}
+);
+INSERT INTO management_auditlog_unpartitioned ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM management_auditlog;
+SELECT setval(
+    pg_get_serial_sequence('management_auditlog_unpartitioned', 'id'),
+    COALESCE((SELECT max(id) FROM management_auditlog), 0) + 1,
+    false
+);
+
+DROP TABLE management_auditlog;
+ALTER TABLE management_auditlog_unpartitioned RENAME TO management_auditlog;
+ALTER INDEX management_auditlog_unpartitioned_pkey RENAME TO management_auditlog_pkey;
+{INDEXES}
+CREATE INDEX management__tenant__f20f75_idx ON management_auditlog (tenant_id, created);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("management", "0088_rolev2_highest_scope_out_of_scope"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunSQL(PARTITION_SQL, UNPARTITION_SQL)],
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="auditlog",
+                    name="management__tenant__f20f75_idx",
+                ),
+            ],
+        ),
+        # Serves the (created, id) keyset pagination of the audit log list within a tenant.
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(fields=["tenant", "created", "id"], name="auditlog_tenant_created_id_idx"),
+        ),
+    ]
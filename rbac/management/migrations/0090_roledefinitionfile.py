@@ -0,0 +1,22 @@
+# Generated by Django 5.2.12 on 2026-10-19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("management", "0089_partition_auditlog_by_month"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoleDefinitionFile",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("digest", models.CharField(max_length=64)),
+                ("modified", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.12 on 2026-10-19
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+INDEX_NAME = "auditlog_username_trgm_idx"
+INDEX_DEFINITION = "USING gin ((upper(principal_username)) gin_trgm_ops)"
+
+
+def create_username_trgm_index(apps, schema_editor):
+    """Build the trigram index of the audit log without blocking writes.
+
+    PostgreSQL cannot build an index concurrently on a partitioned table, so the index is created on the parent only,
+    which leaves it invalid, then built concurrently on every partition and attached to it; it becomes valid once all
+    partitions are attached. Partitions created later get the index from the parent.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON ONLY management_auditlog {INDEX_DEFINITION}")
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'management_auditlog'
+            """
+        )
+        for (partition,) in cursor.fetchall():
+            partition_index = f"{partition}_username_trgm_idx"
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {INDEX_DEFINITION}"
+            )
+            cursor.execute(f"ALTER INDEX {INDEX_NAME} ATTACH PARTITION {partition_index}")
+
+
+def drop_username_trgm_index(apps, schema_editor):
+    """Drop the trigram index of the audit log along with the indexes of its partitions."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    # The partition indexes are built concurrently, which cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("management", "0090_roledefinitionfile"),
+    ]
+
+    operations = [
+        # GIN trigram index (pg_trgm is enabled by 0084) on upper(principal_username), as icontains compares UPPER(column) LIKE UPPER(value).
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(create_username_trgm_index, drop_username_trgm_index)],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="auditlog",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("principal_username"), name="gin_trgm_ops"
+                        ),
+                        name=INDEX_NAME,
+                    ),
+                ),
+            ],
+        ),
+    ]
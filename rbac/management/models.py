@@ -27,6 +27,7 @@ from management.role.model import (
     ExtTenant,
     ResourceDefinition,
     Role,
+    RoleDefinitionFile,
     BindingMapping,
 )
 from management.role.v2_model import (
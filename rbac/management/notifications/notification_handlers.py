@@ -17,6 +17,7 @@
 
 """Notification handlers of object change."""
 
+import copy
 import json
 import logging
 import os
@@ -44,17 +45,28 @@ with open(os.path.join(settings.BASE_DIR, "management", "notifications", "messag
 
 def build_notifications_message(event_type, payload, org_id=None):
     """Create message based on template."""
-    message = message_template
+    return build_notifications_batch_message(event_type, [payload], org_id)
+
+
+def build_notifications_batch_message(event_type, payloads, org_id=None):
+    """Create a message based on template with one event per payload."""
+    message = copy.deepcopy(message_template)
     message["org_id"] = org_id
     message["event_type"] = event_type
     message["timestamp"] = datetime.now().isoformat()
-    message["events"][0]["payload"] = payload
+    event_template = message["events"][0]
+    message["events"] = [{**copy.deepcopy(event_template), "payload": payload} for payload in payloads]
     return message
 
 
 def notify(event_type, payload, org_id=None):
     """Actually send notifications message."""
-    noto_message = build_notifications_message(event_type, payload, org_id)
+    notify_batch(event_type, [payload], org_id)
+
+
+def notify_batch(event_type, payloads, org_id=None):
+    """Send a single notifications message carrying an event for each payload."""
+    noto_message = build_notifications_batch_message(event_type, payloads, org_id)
     noto_headers = [("rh-message-id", str(uuid4()).encode("utf-8"))]
     noto_producer.send_kafka_message(noto_topic, noto_message, noto_headers)
 
@@ -200,16 +212,18 @@ def group_role_change_notification_handler(user, group_obj, role_obj, operation)
     notify(event_type, payload, org_id)
 
 
-def group_principal_change_notification_handler(user, group_obj, principal, operation):
-    """Signal handler for sending notification message when principal of group changes."""
-    if not settings.NOTIFICATIONS_ENABLED:
+def group_principals_change_notification_handler(user, group_obj, principals, operation):
+    """Signal handler for sending one notification message when principals of group change."""
+    if not settings.NOTIFICATIONS_ENABLED or not principals:
         return
 
     org_id = user.org_id
-    payload = payload_builder(user.username, group_obj, operation, ("principal", principal))
+    payloads = [
+        payload_builder(user.username, group_obj, operation, ("principal", principal)) for principal in principals
+    ]
 
     event_type = "group-updated"
-    notify(event_type, payload, org_id)
+    notify_batch(event_type, payloads, org_id)
 
 
 def group_flag_change_notification_handler(user, group_obj):
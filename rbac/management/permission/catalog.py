@@ -0,0 +1,120 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as
+#    published by the Free Software Foundation, either version 3 of the
+#    License, or (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""In-process snapshot of the permission catalog, versioned by the seeding generation."""
+
+import hashlib
+import threading
+from typing import Iterable, Optional
+
+from management.cache import PermissionCatalogCache
+
+GLOBAL_VALUE = "*"
+
+
+class PermissionCatalog:
+    """An immutable snapshot of every permission, in the form PermissionSerializer returns.
+
+    Permissions only change when seeding runs, so a snapshot stays valid until the seeding generation moves on.
+    Rows are kept sorted by permission with the same byte-wise ordering as the "C" collation used by the view.
+    """
+
+    def __init__(self, generation: int, rows: Iterable[dict]):
+        """Create a snapshot from already serialized rows."""
+        self.generation = generation
+        self.rows = tuple(sorted(rows, key=lambda row: row["permission"]))
+
+    @classmethod
+    def build(cls, generation: int) -> "PermissionCatalog":
+        """Load the snapshot from the database."""
+        from management.permission.model import Permission
+
+        rows = [
+            {
+                "application": permission.application,
+                "resource_type": permission.resource_type,
+                "verb": permission.verb,
+                "permission": permission.permission,
+                "description": permission.description,
+                "requires": [required.permission for required in permission.permissions.all()],
+            }
+            for permission in Permission.objects.prefetch_related("permissions")
+        ]
+        return cls(generation, rows)
+
+    def filter(
+        self,
+        applications: Optional[list[str]] = None,
+        resource_types: Optional[list[str]] = None,
+        verbs: Optional[list[str]] = None,
+        permission_contains: Optional[str] = None,
+        exclude_globals: bool = False,
+        excluded_permissions: Iterable[str] = (),
+        excluded_applications: Iterable[str] = (),
+    ) -> list[dict]:
+        """Return the rows matching the same filters the permission view applies to its queryset."""
+        excluded_permissions = set(excluded_permissions)
+        excluded_applications = set(excluded_applications)
+        needle = permission_contains.lower() if permission_contains else None
+
+        def matches(row):
+            if applications and row["application"] not in applications:
+                return False
+            if resource_types and row["resource_type"] not in resource_types:
+                return False
+            if verbs and row["verb"] not in verbs:
+                return False
+            if needle and needle not in row["permission"].lower():
+                return False
+            if exclude_globals and GLOBAL_VALUE in (row["application"], row["resource_type"], row["verb"]):
+                return False
+            return row["permission"] not in excluded_permissions and row["application"] not in excluded_applications
+
+        return [row for row in self.rows if matches(row)]
+
+    @staticmethod
+    def order(rows: list[dict], fields: list[str]) -> list[dict]:
+        """Order rows by the given fields, each optionally prefixed with '-', with ties kept in permission order."""
+        ordered = list(rows)
+        for field in reversed(fields):
+            ordered.sort(key=lambda row: row[field.lstrip("-")], reverse=field.startswith("-"))
+        return ordered
+
+    def etag(self, *variant: object) -> str:
+        """Build a strong ETag for a response derived from this snapshot and the given request variant."""
+        digest = hashlib.sha256(repr((self.generation, variant)).encode("utf-8")).hexdigest()
+        return f'"{digest[:32]}"'
+
+
+_catalog: Optional[PermissionCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_permission_catalog() -> Optional[PermissionCatalog]:
+    """Return the snapshot for the current seeding generation, rebuilding it if seeding has run since.
+
+    Returns None when the generation cannot be determined, in which case callers should query the database.
+    """
+    global _catalog
+
+    generation = PermissionCatalogCache().get_generation()
+    if generation is None:
+        return None
+
+    with _catalog_lock:
+        if _catalog is None or _catalog.generation != generation:
+            _catalog = PermissionCatalog.build(generation)
+        return _catalog
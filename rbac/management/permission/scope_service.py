@@ -17,6 +17,7 @@
 """Helper for determining workspace/tenant binding levels for permissions."""
 
 import dataclasses
+import logging
 from enum import IntEnum
 from typing import Iterable, Self
 
@@ -28,6 +29,8 @@ from migration_tool.models import V2boundresource
 
 from api.models import Tenant
 
+logger = logging.getLogger(__name__)
+
 
 class Scope(IntEnum):
     """
@@ -374,10 +377,17 @@ class PermissionScopeCache:
 
         result: dict[Scope, set[int]] = {scope: set() for scope in Scope}
         for row in Permission.objects.values_list("id", "permission", named=True):
-            scope = self._scope_service.scope_for_permission(row.permission)
-            result[scope].add(row.id)
+            result[self._scope_for(row.permission)].add(row.id)
         return {s: frozenset(ids) for s, ids in result.items()}
 
+    def _scope_for(self, permission: str) -> Scope:
+        try:
+            return self._scope_service.scope_for_permission(permission)
+        except ValueError:
+            # Malformed permissions (e.g. partial wildcards) cannot be matched to a broader scope.
+            logger.warning("Unable to determine the scope of malformed permission %r", permission)
+            return Scope.DEFAULT
+
     @property
     def ids_by_scope(self) -> dict[Scope, frozenset[int]]:
         """Return the cached mapping, building it on first access."""
@@ -385,6 +395,13 @@ class PermissionScopeCache:
             self._ids_by_scope = self._build()
         return self._ids_by_scope
 
+    def scope_for_permission(self, permission_id: int, permission: str) -> Scope:
+        """Return the cached scope of a permission, computing it if the permission was added after the cache."""
+        for scope, ids in self.ids_by_scope.items():
+            if permission_id in ids:
+                return scope
+        return self._scope_for(permission)
+
     def ids_for_scopes(self, scopes: set[Scope]) -> frozenset[int]:
         """Return the union of Permission IDs for the given scopes."""
         return frozenset().union(*(self.ids_by_scope.get(s, frozenset()) for s in scopes))
@@ -20,9 +20,11 @@
 from django.conf import settings
 from django.db.models import Q
 from django.db.models.functions import Collate
+from django.utils.cache import parse_etags
 from django_filters import rest_framework as filters
 from management.filters import CommonFilters
 from management.models import Access, Permission, Role
+from management.permission.catalog import get_permission_catalog
 from management.permission.serializer import PermissionSerializer
 from management.permissions.permission_access import PermissionAccessPermission
 from management.permissions.v2_edit_api_access import is_v2_edit_enabled_for_request
@@ -32,9 +34,12 @@ from management.utils import (
     validate_and_get_key,
     validate_uuid,
 )
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
+
+from api.common.pagination import OptInKeysetResultsSetPagination
 
 PERMISSION_FIELD_KEYS = {"application", "resource_type", "verb"}
 VALID_BOOLEAN_PARAM_VALS = ["true", "false"]
@@ -101,22 +106,91 @@ class PermissionViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         "verb",
     )
     ordering = ("permission_collate",)
+    pagination_class = OptInKeysetResultsSetPagination
+    keyset_ordering_fields = ("permission_collate", "application", "resource_type", "verb")
 
     def get_queryset(self):
         """Override to filter out blocked permissions for v1 API and scope for v2 tenants."""
         queryset = super().get_queryset()
 
+        blocked_permissions, excluded_apps = self._request_exclusions()
+        if blocked_permissions:
+            queryset = queryset.exclude(permission__in=blocked_permissions)
+        if excluded_apps:
+            queryset = queryset.exclude(application__in=excluded_apps)
+
+        return queryset
+
+    def _request_exclusions(self):
+        """Return the permissions and applications hidden from this request."""
+        blocked_permissions = []
         if self.request.path.startswith(f"/{api_path_prefix()}v1/"):
-            blocked_permissions = settings.V1_ROLE_PERMISSION_BLOCK_LIST
-            if blocked_permissions:
-                queryset = queryset.exclude(permission__in=blocked_permissions)
+            blocked_permissions = sorted(settings.V1_ROLE_PERMISSION_BLOCK_LIST or [])
 
+        excluded_apps = []
         if is_v2_edit_enabled_for_request(self.request):
-            excluded_apps = v2_role_excluded_applications()
-            if excluded_apps:
-                queryset = queryset.exclude(application__in=list(excluded_apps))
+            excluded_apps = sorted(v2_role_excluded_applications() or [])
+
+        return blocked_permissions, excluded_apps
+
+    def _catalog_for_request(self):
+        """Return the permission catalog snapshot if it can answer this request without querying permissions."""
+        # Excluding the permissions of given roles depends on tenant data rather than on seeding.
+        if self.request.query_params.get("exclude_roles"):
+            return None
+        return get_permission_catalog()
+
+    def _catalog_rows(self, catalog):
+        """Apply the PermissionFilter filters to the catalog snapshot."""
+        params = self.request.query_params
+        blocked_permissions, excluded_apps = self._request_exclusions()
+
+        def values(key):
+            value = params.get(key)
+            return value.split(",") if value else None
+
+        applications = values("application")
+        for key in ("exclude_globals", "allowed_only"):
+            if params.get(key):
+                validate_and_get_key(params, key, VALID_BOOLEAN_PARAM_VALS, "false")
+        if params.get("allowed_only", "").lower() == "true":
+            allowed = settings.ROLE_CREATE_ALLOW_LIST
+            applications = [app for app in applications if app in allowed] if applications else list(allowed)
+
+        return catalog.filter(
+            applications=applications,
+            resource_types=values("resource_type"),
+            verbs=values("verb"),
+            permission_contains=params.get("permission"),
+            exclude_globals=params.get("exclude_globals", "").lower() == "true",
+            excluded_permissions=blocked_permissions,
+            excluded_applications=excluded_apps,
+        )
 
-        return queryset
+    def _catalog_etag(self, catalog):
+        """Build the ETag for this request's view of the catalog."""
+        query = sorted((key, sorted(values)) for key, values in self.request.query_params.lists())
+        return catalog.etag(self.request.path, query, *self._request_exclusions())
+
+    def _catalog_response(self, etag, page):
+        """Return 304 if the client already holds this ETag, otherwise the paginated page tagged with it."""
+        if_none_match = self.request.headers.get("If-None-Match")
+        if if_none_match:
+            tags = parse_etags(if_none_match)
+            if "*" in tags or etag in tags:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response = self.get_paginated_response(page())
+        response["ETag"] = etag
+        return response
+
+    def _catalog_ordering(self):
+        """Return the ordering the OrderingFilter would apply, falling back to the permission name."""
+        order_by = self.request.query_params.get("order_by", "")
+        fields = [term.strip() for term in order_by.split(",") if term.strip().lstrip("-") in self.ordering_fields]
+        if fields:
+            return fields
+        return ["-permission"] if order_by == "-permission" else ["permission"]
 
     def list(self, request, *args, **kwargs):
         """Obtain the list of permissions for the tenant.
@@ -161,6 +235,13 @@ class PermissionViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
           ]
         }
         """
+        catalog = self._catalog_for_request()
+        if catalog is not None:
+            return self._catalog_response(
+                self._catalog_etag(catalog),
+                lambda: self.paginate_queryset(catalog.order(self._catalog_rows(catalog), self._catalog_ordering())),
+            )
+
         if request.query_params.get("order_by") == "-permission":
             self.queryset = self.queryset.order_by("-permission_collate")
             self.ordering = "-permission_collate"
@@ -196,6 +277,15 @@ class PermissionViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         filters = {}
         query_field = validate_and_get_key(request.query_params, QUERY_FIELD, PERMISSION_FIELD_KEYS, None)
 
+        catalog = self._catalog_for_request()
+        if catalog is not None:
+            if "limit" not in self.request.query_params:
+                self.paginator.default_limit = self.paginator.max_limit
+            return self._catalog_response(
+                self._catalog_etag(catalog),
+                lambda: self.paginate_queryset(sorted({row[query_field] for row in self._catalog_rows(catalog)})),
+            )
+
         for key in PERMISSION_FIELD_KEYS:
             context = request.query_params.get(key)
             if context:
@@ -39,7 +39,7 @@ class GroupAccessPermission(permissions.BasePermission):
             group_read = request.user.access.get("group", {}).get("read", [])
             if group_read:
                 return True
-            if view.basename == "group" and view.action == "list":
+            if view.basename == "group" and view.action in ("list", "export"):
                 username = request.query_params.get("username")
                 if username:
                     return username == request.user.username
@@ -128,7 +128,7 @@ class RoleBindingKesselAccessPermission(permissions.BasePermission):
             return self._check_batch_create_permission(request)
         elif action == "by_subject" and request.method == "PUT":
             return self._check_by_subject_write_permission(request)
-        elif action in ("list", "by_subject"):
+        elif action in ("list", "export", "by_subject"):
             return self._check_read_permission(request)
         else:
             logger.warning("Denied access: unrecognized action %s", action)
@@ -20,6 +20,7 @@
 import logging
 import os
 import ssl
+import time
 from typing import Optional
 
 import xmltodict
@@ -30,7 +31,7 @@ from management.principal.proxy import PrincipalProxy, external_principal_to_use
 from management.relation_replicator.outbox_replicator import OutboxReplicator
 from management.tenant_service import get_tenant_bootstrap_service
 from management.tenant_service.tenant_service import TenantBootstrapService
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
 from rest_framework import status
 from sentry_sdk import capture_exception
 from stompest.config import StompConfig
@@ -62,6 +63,19 @@ stomp_messages_nack_total = Counter(
     METRIC_STOMP_MESSAGES_NACK_TOTAL,
     "Number of stomp UMB messages that failed to be processed",
 )
+stomp_batch_size = Histogram(
+    "stomp_batch_size",
+    "Number of stomp UMB messages processed together in a batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+stomp_batch_duration_seconds = Histogram(
+    "stomp_batch_duration_seconds",
+    "Time taken to process a batch of stomp UMB messages",
+)
+stomp_message_lag_seconds = Gauge(
+    "stomp_message_lag_seconds",
+    "Age of the oldest stomp UMB message in the last processed batch, from its broker timestamp",
+)
 
 
 def clean_tenant_principals(tenant):
@@ -203,6 +217,22 @@ def retrieve_user_info(message) -> User:
     return external_principal_to_user(user_data)
 
 
+def _user_from_frame(frame) -> User:
+    """Parse a umb frame and retrieve the latest known state of the user it refers to."""
+    body = frame.body.decode("utf-8", errors="ignore")
+    data_dict = xmltodict.parse(body)
+    canonical_message = data_dict.get("CanonicalMessage")
+
+    return retrieve_user_info(canonical_message)
+
+
+def _should_update_user(user: User) -> bool:
+    """Return whether a user from a umb frame should be applied."""
+    # By default, only process disabled users.
+    # If the setting is enabled, process all users.
+    return not user.is_active or settings.PRINCIPAL_CLEANUP_UPDATE_ENABLED_UMB
+
+
 def process_umb_event(frame, umb_client: Stomp, bootstrap_service: TenantBootstrapService) -> bool:
     """
     Process each umb frame.
@@ -217,14 +247,8 @@ def process_umb_event(frame, umb_client: Stomp, bootstrap_service: TenantBootstr
             return False
 
         try:
-            body = frame.body.decode("utf-8", errors="ignore")
-            data_dict = xmltodict.parse(body)
-            canonical_message = data_dict.get("CanonicalMessage")
-
-            user = retrieve_user_info(canonical_message)
-            # By default, only process disabled users.
-            # If the setting is enabled, process all users.
-            if not user.is_active or settings.PRINCIPAL_CLEANUP_UPDATE_ENABLED_UMB:
+            user = _user_from_frame(frame)
+            if _should_update_user(user):
                 # If Tenant is not already ready, don't ready it
                 bootstrap_service.update_user(user, ready_tenant=False)
             umb_client.ack(frame)
@@ -245,6 +269,80 @@ def process_umb_event(frame, umb_client: Stomp, bootstrap_service: TenantBootstr
     return True
 
 
+def process_umb_batch(frames: list, umb_client: Stomp, bootstrap_service: TenantBootstrapService) -> bool:
+    """
+    Process a batch of umb frames under a single listener lock.
+
+    Users are applied together through the bootstrap service's bulk path. If that fails, they are applied one
+    frame at a time so that a single bad message does not hold back the rest. Each frame is then acked or nacked
+    on its own once the transaction has committed.
+
+    If the process should continue to listen for more frames, return True. Otherwise, return False.
+    """
+    start = time.monotonic()
+    failed_frames = []
+
+    with transaction.atomic():
+        # This is locked per transaction to ensure another listener process does not run concurrently.
+        if not _lock_listener():
+            # If there is another listener, let it run and abort this one.
+            logger.info("process_umb_batch: Another listener is running. Aborting.")
+            return False
+
+        updates = []
+        for frame in frames:
+            try:
+                user = _user_from_frame(frame)
+            except Exception as e:
+                logger.error("process_umb_batch: Error processing umb message : %s", str(e))
+                capture_exception(e)
+                failed_frames.append(frame)
+                continue
+            if _should_update_user(user):
+                updates.append((frame, user))
+
+        try:
+            with transaction.atomic():
+                # If Tenant is not already ready, don't ready it
+                bootstrap_service.update_users([user for _, user in updates], ready_tenant=False)
+        except Exception as bulk_error:
+            logger.warning(
+                "process_umb_batch: Bulk update failed, applying messages one at a time : %s", str(bulk_error)
+            )
+            for frame, user in updates:
+                try:
+                    with transaction.atomic():
+                        bootstrap_service.update_user(user, ready_tenant=False)
+                except Exception as e:
+                    logger.error("process_umb_batch: Error processing umb message : %s", str(e))
+                    capture_exception(e)
+                    failed_frames.append(frame)
+
+    # Nacked messages may be redelivered by the broker; see process_umb_event.
+    failed_frame_ids = {id(frame) for frame in failed_frames}
+    for frame in frames:
+        if id(frame) in failed_frame_ids:
+            umb_client.nack(frame)
+            stomp_messages_nack_total.inc()
+        else:
+            umb_client.ack(frame)
+            stomp_messages_ack_total.inc()
+
+    stomp_batch_size.observe(len(frames))
+    stomp_batch_duration_seconds.observe(time.monotonic() - start)
+    timestamps = [int(frame.headers["timestamp"]) for frame in frames if "timestamp" in frame.headers]
+    if timestamps:
+        stomp_message_lag_seconds.set(max(time.time() - min(timestamps) / 1000, 0))
+    logger.info(
+        "process_umb_batch: Processed %d messages, %d applied, %d failed.",
+        len(frames),
+        len(updates),
+        len(failed_frames),
+    )
+
+    return True
+
+
 def process_principal_events_from_umb(bootstrap_service: Optional[TenantBootstrapService] = None):
     """Process principals events from UMB."""
     logger.info("process_tenant_principal_events: Start processing principal events from umb.")
@@ -263,7 +361,15 @@ def process_principal_events_from_umb(bootstrap_service: Optional[TenantBootstra
         while UMB_CLIENT.canRead(15):  # Check if queue is empty, 15 sec timeout
             frame = UMB_CLIENT.receiveFrame()
             logger.info("process_tenant_principal_events: Processing frame. info=%s", frame.info())
-            if not process_umb_event(frame, UMB_CLIENT, bootstrap_service):
+            if settings.UMB_BATCH_SIZE > 1:
+                frames = [frame]
+                # Drain whatever is already waiting, without blocking, up to the batch size.
+                while len(frames) < settings.UMB_BATCH_SIZE and UMB_CLIENT.canRead(0):
+                    frames.append(UMB_CLIENT.receiveFrame())
+                keep_listening = process_umb_batch(frames, UMB_CLIENT, bootstrap_service)
+            else:
+                keep_listening = process_umb_event(frame, UMB_CLIENT, bootstrap_service)
+            if not keep_listening:
                 break
     finally:
         UMB_CLIENT.disconnect()
@@ -22,6 +22,7 @@ import uuid
 from typing import Any, Optional, Tuple, Union
 
 import requests
+from core.http_sessions import IT_UPSTREAM, upstream_session
 from django.conf import settings
 from django.db.models import Q
 from management.authorization.missing_authorization import MissingAuthorizationError
@@ -125,7 +126,7 @@ class ITService:
                     parameters["clientId"] = client_ids
 
                 # Call IT.
-                response = requests.get(
+                response = upstream_session(IT_UPSTREAM, self.it_request_timeout).get(
                     url=self.it_url,
                     headers={"Authorization": f"Bearer {bearer_token}"},
                     params=parameters,
@@ -20,7 +20,9 @@
 import logging
 
 import requests
+from core.http_sessions import BOP_UPSTREAM, upstream_session
 from django.conf import settings
+from management.cache import PrincipalProfileCache
 from management.models import Principal
 from prometheus_client import Counter, Histogram
 from rest_framework import status
@@ -49,6 +51,9 @@ bop_request_time_tracking = Histogram(
 bop_request_status_count = Counter(
     "bop_request_status_total", "Number of requests from RBAC to BOP and resulting status", ["method", "status"]
 )
+principal_profile_cache_total = Counter(
+    "rbac_principal_profile_cache_total", "Principal profile lookups by user_id, by cache result", ["result"]
+)
 
 
 class PrincipalProxy:  # pylint: disable=too-few-public-methods
@@ -67,6 +72,12 @@ class PrincipalProxy:  # pylint: disable=too-few-public-methods
         self.client_id = proxy_conn_info.get(CLIENT_ID)
         self.api_token = proxy_conn_info.get(API_TOKEN)
         self.client_cert_path = proxy_conn_info.get(CLIENT_CERT_PATH)
+        self.profile_cache = PrincipalProfileCache()
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the pooled session to BOP of the current process."""
+        return upstream_session(BOP_UPSTREAM, settings.PRINCIPAL_PROXY_SERVICE_TIMEOUT_SECONDS)
 
     @staticmethod
     def _create_params(limit=None, offset=None, options={}):
@@ -153,12 +164,13 @@ class PrincipalProxy:  # pylint: disable=too-few-public-methods
         url,
         org_id=None,
         org_id_filter=False,
-        method=requests.get,
+        method=None,
         params=None,
         data=None,
         return_id=False,  # noqa: C901
     ):
         """Send request to proxy service."""
+        method = method or self.session.get
         metrics_method = method.__name__.upper()
         if params and params.get("username_only") == "true":
             principals = Principal.objects.filter(type="user", tenant__org_id=org_id, cross_account=False)
@@ -262,10 +274,10 @@ class PrincipalProxy:  # pylint: disable=too-few-public-methods
         if input:
             payload = input
             account_principals_path = f"/v3/accounts/{org_id}/usersBy"
-            method = requests.post
+            method = self.session.post
         else:
             account_principals_path = f"/v3/accounts/{org_id}/users"
-            method = requests.get
+            method = self.session.get
             payload = None
 
         params = self._create_params(limit, offset, options)
@@ -303,7 +315,7 @@ class PrincipalProxy:  # pylint: disable=too-few-public-methods
                 kwargs["verify"] = self.client_cert_path
 
             LOGGER.info(f"Fetching account-org mapping from BOP for {len(account_ids)} accounts")
-            response = requests.post(url, **kwargs)
+            response = self.session.post(url, **kwargs)
 
             if response.status_code == status.HTTP_200_OK:
                 mapping = response.json()
@@ -338,12 +350,37 @@ class PrincipalProxy:  # pylint: disable=too-few-public-methods
             url,
             org_id=org_id,
             org_id_filter=org_id_filter,
-            method=requests.post,
+            method=self.session.post,
             params=params,
             data=payload,
             return_id=return_id,
         )
 
+    def request_principal_profiles(self, user_ids) -> dict:
+        """Return the profiles of the given user ids, keyed by user_id.
+
+        Profiles are served from a short-lived cache where possible, and the ids missing from it are requested from
+        BOP in a single call. User ids BOP does not know are left out of the result.
+        """
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        use_cache = settings.PRINCIPAL_PROFILE_CACHE_LIFETIME > 0
+        cached = self.profile_cache.get_profiles(user_ids) if use_cache and user_ids else {}
+        misses = [user_id for user_id in user_ids if user_id not in cached]
+        principal_profile_cache_total.labels(result="hit").inc(len(cached))
+        principal_profile_cache_total.labels(result="miss").inc(len(misses))
+
+        profiles = {user_id: profile for user_id, profile in cached.items() if profile is not None}
+        if misses:
+            resp = self.request_filtered_principals(
+                misses, org_id=None, options={"query_by": "user_id", "return_id": True}
+            )
+            if resp.get("status_code") == status.HTTP_200_OK:
+                fetched = {str(principal["user_id"]): principal for principal in resp.get("data", [])}
+                profiles.update(fetched)
+                if use_cache:
+                    self.profile_cache.save_profiles({user_id: fetched.get(user_id) for user_id in misses})
+        return profiles
+
 
 def external_principal_to_user(principal: dict) -> User:
     """Convert external principal to the common User object."""
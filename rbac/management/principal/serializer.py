@@ -36,6 +36,18 @@ class PrincipalSerializer(SerializerCreateOverrideMixin, serializers.ModelSerial
         fields = ("username",)
 
 
+class PrincipalExportSerializer(serializers.ModelSerializer):
+    """Serializer for the principals streamed by the principal export."""
+
+    clientId = serializers.CharField(source="service_account_id", allow_null=True)
+
+    class Meta:
+        """Metadata for the serializer."""
+
+        model = Principal
+        fields = ("uuid", "username", "type", "user_id", "clientId")
+
+
 class PrincipalInputSerializer(serializers.Serializer):
     """Serializer for the Principal model."""
 
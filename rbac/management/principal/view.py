@@ -20,15 +20,19 @@
 import requests
 from management.authorization.scope_claims import ScopeClaims
 from management.authorization.token_validator import ITSSOTokenValidator
+from management.export import export_response
 from management.utils import validate_and_get_key
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
 from api.common.pagination import StandardResultsSetPagination
+from api.common.renderers import NDJSONRenderer
 from .it_service import ITService
 from .model import Principal
 from .proxy import PrincipalProxy
+from .serializer import PrincipalExportSerializer
 from .unexpected_status_code_from_it import UnexpectedStatusCodeFromITError
 from ..permissions.principal_access import PrincipalAccessPermission
 
@@ -324,3 +328,26 @@ class PrincipalView(APIView):
                 resp["data"]["users"] = user_resp.get("data")
 
         return resp, usernames_filter
+
+
+class PrincipalExportView(APIView):
+    """Export the principals of the tenant as newline-delimited JSON.
+
+    Unlike the list, which pages users from BOP and service accounts from IT, the export streams the principals stored
+    by RBAC for the tenant, ordered by username.
+    """
+
+    permission_classes = (PrincipalAccessPermission,)
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
+
+    def get(self, request):
+        """Stream the principals of the tenant, optionally filtered by type."""
+        principal_type = validate_and_get_key(
+            request.query_params, PRINCIPAL_TYPE_KEY, VALID_PRINCIPAL_TYPE_VALUE, default_value=Principal.Types.USER
+        )
+        queryset = Principal.objects.filter(tenant=request.tenant, cross_account=False).order_by("username")
+        if principal_type != ALL_KEY:
+            queryset = queryset.filter(type=principal_type)
+        return export_response(
+            queryset, lambda rows: PrincipalExportSerializer(rows, many=True).data, filename="principals"
+        )
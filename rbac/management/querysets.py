@@ -19,8 +19,9 @@
 from typing import Optional
 
 from django.conf import settings
-from django.db.models import Q, QuerySet
+from django.db.models import IntegerField, OuterRef, Q, QuerySet, Subquery
 from django.db.models.aggregates import Count
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.translation import gettext as _
 from management.group.model import Group
@@ -64,9 +65,25 @@ def get_annotated_groups(queryset):
     return queryset.annotate(
         principalCount=Count("principals", filter=Q(principals__type="user"), distinct=True),
         policyCount=Count("policies", distinct=True),
+        roleCount=_group_role_count(),
     )
 
 
+def _group_role_count():
+    """Count the distinct roles attached to a group's policies in a correlated subquery.
+
+    Kept out of the principal/policy joins above so the role count does not multiply their rows.
+    """
+    role_counts = (
+        Role.objects.filter(policies__group=OuterRef("pk"))
+        .order_by()
+        .values("policies__group")
+        .annotate(count=Count("pk", distinct=True))
+        .values("count")
+    )
+    return Coalesce(Subquery(role_counts, output_field=IntegerField()), 0)
+
+
 def user_has_perm(request, resource):
     """Check to determine if user has RBAC access perms."""
     access = request.user.access
@@ -86,7 +103,10 @@ def has_group_all_access(request):
     return (
         ENVIRONMENT.get_value("ALLOW_ANY", default=False, cast=bool)
         or request.user.admin
-        or (request.path == reverse("v1_management:group-list") and request.method == "GET")
+        or (
+            request.path in (reverse("v1_management:group-list"), reverse("v1_management:group-export"))
+            and request.method == "GET"
+        )
     )
 
 
@@ -153,9 +173,37 @@ def _gather_group_querysets(request, args, kwargs, base_query: Optional[QuerySet
     return filter_queryset_by_tenant(Group.objects.filter(uuid__in=access), request.tenant) | default_group_set
 
 
+def role_policy_count():
+    """Count the policies a role is attached to in a correlated subquery rather than a distinct join."""
+    policy_counts = (
+        Policy.roles.through.objects.filter(role=OuterRef("pk"))
+        .order_by()
+        .values("role")
+        .annotate(count=Count("policy"))
+        .values("count")
+    )
+    return Coalesce(Subquery(policy_counts, output_field=IntegerField()), 0)
+
+
+def role_access_count():
+    """Count the access entries of a role in a correlated subquery rather than a distinct join."""
+    access_counts = (
+        Access.objects.filter(role=OuterRef("pk"))
+        .order_by()
+        .values("role")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(access_counts, output_field=IntegerField()), 0)
+
+
 def annotate_roles_with_counts(queryset):
-    """Annotate the queryset for roles with counts."""
-    return queryset.annotate(policyCount=Count("policies", distinct=True), accessCount=Count("access", distinct=True))
+    """Annotate the queryset for roles with counts.
+
+    Each count is an independent subquery, so roles attached to many policies with many access entries are not
+    joined against both tables and de-duplicated afterwards.
+    """
+    return queryset.annotate(policyCount=role_policy_count(), accessCount=role_access_count())
 
 
 def get_role_queryset(request) -> QuerySet:
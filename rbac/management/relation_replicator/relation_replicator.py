@@ -59,6 +59,7 @@ class ReplicationEventType(str, Enum):
     EXTERNAL_USER_UPDATE = "external_user_update"
     EXTERNAL_USER_DISABLE = "external_user_disable"
     BULK_EXTERNAL_USER_UPDATE = "bulk_external_user_update"
+    BULK_EXTERNAL_USER_DISABLE = "bulk_external_user_disable"
     MIGRATE_CUSTOM_ROLE = "migrate_custom_role"
     MIGRATE_TENANT_GROUPS = "migrate_tenant_groups"
     CUSTOMIZE_DEFAULT_GROUP = "customize_default_group"
@@ -18,6 +18,7 @@
 """Handler for system defined roles."""
 
 import dataclasses
+import hashlib
 import json
 import logging
 import os
@@ -25,16 +26,17 @@ import os
 from core.utils import destructive_ok
 from django.conf import settings
 from django.db import transaction
-from django.db.models import QuerySet
+from django.db.models import Exists, OuterRef, QuerySet
 from django.utils import timezone
 from management.atomic_transactions import atomic
+from management.cache import PermissionCatalogCache
 from management.group.definer import seed_group
 from management.group.platform import DefaultGroupNotAvailableError, GlobalPolicyIdService
 from management.notifications.notification_handlers import role_obj_change_notification_handler
 from management.permission.model import Permission
 from management.permission.scope_service import ImplicitResourceService, Scope
 from management.relation_replicator.relation_replicator import ReplicationEventType
-from management.role.model import Access, ExtRoleRelation, ExtTenant, ResourceDefinition, Role
+from management.role.model import Access, ExtRoleRelation, ExtTenant, ResourceDefinition, Role, RoleDefinitionFile
 from management.role.platform import admin_platform_parent_scope_for_seeded_system_role, platform_v2_role_uuid_for
 from management.role.relation_api_dual_write_handler import (
     RelationApiDualWriteHandler,
@@ -158,17 +160,17 @@ def _make_role(data, config: _SeedRolesConfig, platform_roles=None, resource_ser
 
 
 def _update_or_create_roles(roles, config: _SeedRolesConfig, platform_roles=None, resource_service=None):
-    """Update or create roles from list."""
-    current_role_ids = set()
+    """Update or create roles from list, returning the names of the roles that could not be seeded."""
+    failed_role_names = set()
     # Sort roles by name to ensure consistent lock ordering and prevent deadlocks
     sorted_roles = sorted(roles, key=lambda r: r.get("name", ""))
     for role_json in sorted_roles:
         try:
-            role = _make_role(role_json, config, platform_roles, resource_service)
-            current_role_ids.add(role.id)
+            _make_role(role_json, config, platform_roles, resource_service)
         except Exception as e:
+            failed_role_names.add(role_json.get("name"))
             logger.error(f"Failed to update or create system role: {role_json.get('name')} with error: {e}")
-    return current_role_ids
+    return failed_role_names
 
 
 # SERIALIZABLE for the same reason as _make_role above.
@@ -183,36 +185,83 @@ def _do_delete_system_roles(roles: QuerySet):
     roles.delete()
 
 
+def _load_definition_files(directory):
+    """Return the content of each JSON definitions file of a directory, with its SHA-256 digest, by file name."""
+    definition_files = {}
+    for file_name in sorted(os.listdir(directory)):
+        file_path = os.path.join(directory, file_name)
+        if os.path.isfile(file_path) and file_name.endswith(".json"):
+            with open(file_path) as json_file:
+                content = json_file.read()
+            definition_files[file_name] = (json.loads(content), hashlib.sha256(content.encode()).hexdigest())
+    return definition_files
+
+
+def _role_seeding_inputs(platform_roles) -> str:
+    """Return what seeding a role depends on besides its definition: the scope settings and the platform roles."""
+    return json.dumps(
+        {
+            "root_scope_permissions": settings.ROOT_SCOPE_PERMISSIONS,
+            "tenant_scope_permissions": settings.TENANT_SCOPE_PERMISSIONS,
+            "default_scope_permissions": settings.DEFAULT_SCOPE_PERMISSIONS,
+            "platform_roles": sorted(str(platform_role.uuid) for platform_role in platform_roles.values()),
+        },
+        sort_keys=True,
+    )
+
+
 def seed_roles(force_create_relationships=False, force_update_relationships=False):
-    """Update or create system defined roles."""
+    """Update or create system defined roles.
+
+    A definitions file is skipped when it was completely seeded with the same content and seeding inputs before, and
+    each of its roles still exists at the defined version along with its V2 role.
+    """
+    config = _SeedRolesConfig(
+        force_create_relationships=force_create_relationships,
+        force_update_relationships=force_update_relationships,
+    )
     roles_directory = os.path.join(settings.BASE_DIR, "management", "role", "definitions")
-    role_files = [
-        f
-        for f in os.listdir(roles_directory)
-        if os.path.isfile(os.path.join(roles_directory, f)) and f.endswith(".json")
-    ]
-    current_role_ids = set()
+    definition_files = _load_definition_files(roles_directory)
 
     platform_roles = _seed_platform_roles()
     resource_service = ImplicitResourceService.from_settings()
-    for role_file_name in role_files:
-        role_file_path = os.path.join(roles_directory, role_file_name)
-        with open(role_file_path) as json_file:
-            data = json.load(json_file)
-            role_list = data.get("roles")
-            file_role_ids = _update_or_create_roles(
-                role_list,
-                _SeedRolesConfig(
-                    force_create_relationships=force_create_relationships,
-                    force_update_relationships=force_update_relationships,
-                ),
-                platform_roles,
-                resource_service,
-            )
-            current_role_ids.update(file_role_ids)
+    seeding_inputs = _role_seeding_inputs(platform_roles)
+
+    seeded_digests = dict(RoleDefinitionFile.objects.values_list("name", "digest"))
+    seeded_versions = {
+        name: version
+        for name, version, has_v2_role in Role.objects.public_tenant_only()
+        .annotate(has_v2_role=Exists(SeededRoleV2.objects.filter(uuid=OuterRef("uuid"))))
+        .values_list("name", "version", "has_v2_role")
+        if has_v2_role
+    }
+    forced = force_create_relationships or force_update_relationships
+
+    defined_role_names = set()
+    seeded_files = []
+    for role_file_name, (data, content_digest) in definition_files.items():
+        role_list = data.get("roles")
+        defined_role_names.update(role.get("name") for role in role_list)
+        digest = hashlib.sha256(f"{content_digest}:{seeding_inputs}".encode()).hexdigest()
+
+        if (
+            not forced
+            and seeded_digests.get(role_file_name) == digest
+            and all(seeded_versions.get(role.get("name")) == role.get("version", 1) for role in role_list)
+        ):
+            logger.info(f"No change in system role definitions {role_file_name}.")
+            continue
+
+        failed_role_names = _update_or_create_roles(role_list, config, platform_roles, resource_service)
+        if not failed_role_names:
+            seeded_files.append(RoleDefinitionFile(name=role_file_name, digest=digest))
+
+    RoleDefinitionFile.objects.bulk_create(
+        seeded_files, update_conflicts=True, unique_fields=["name"], update_fields=["digest", "modified"]
+    )
 
     # Find roles in DB but not in config
-    roles_to_delete = Role.objects.public_tenant_only().exclude(id__in=current_role_ids)
+    roles_to_delete = Role.objects.public_tenant_only().exclude(name__in=defined_role_names)
     logger.info(f"The following '{roles_to_delete.count()}' roles(s) eligible for removal: {roles_to_delete.values()}")
 
     if destructive_ok("seeding"):
@@ -221,61 +270,86 @@ def seed_roles(force_create_relationships=False, force_update_relationships=Fals
         _do_delete_system_roles(roles_to_delete.all())
 
 
-def seed_permissions():
-    """Update or create defined permissions."""
-    public_tenant = Tenant.objects.get(tenant_name="public")
+def _load_permission_definitions():
+    """Return the defined permissions by permission string, and the permissions each of them requires.
 
+    A permission is defined by its application, resource type, verb and description. The description is None for
+    permissions defined by a plain verb string, whose description is left as it is.
+    """
     permission_directory = os.path.join(settings.BASE_DIR, "management", "role", "permissions")
-    permission_files = [
-        f
-        for f in os.listdir(permission_directory)
-        if os.path.isfile(os.path.join(permission_directory, f)) and f.endswith(".json")
-    ]
-    current_permission_ids = set()
-
-    for permission_file_name in permission_files:
-        permission_file_path = os.path.join(permission_directory, permission_file_name)
+    definitions = {}
+    requires = {}
+    for permission_file_name, (data, _) in _load_definition_files(permission_directory).items():
         app_name = os.path.splitext(permission_file_name)[0]
-        with open(permission_file_path) as json_file:
-            data = json.load(json_file)
-            for resource, operation_objects in data.items():
-                try:
-                    with transaction.atomic():
-                        for operation_object in operation_objects:
-                            # There are some old configs, e.g., cost-management still stay in CI
-                            if not isinstance(operation_object, str):
-                                permission_description = operation_object.get("description", "")
-                                operation = operation_object.get("verb")
-                                permission, created = Permission.objects.update_or_create(
-                                    permission=f"{app_name}:{resource}:{operation}",
-                                    defaults={"description": permission_description},
-                                    tenant=public_tenant,
-                                )
-                            else:
-                                permission, created = Permission.objects.update_or_create(
-                                    permission=f"{app_name}:{resource}:{operation_object}", tenant=public_tenant
-                                )
-                            if created:
-                                logger.info(f"Created permission {permission.permission}.")
-                            current_permission_ids.add(permission.id)
-
-                        # need to iterate over the objects with requirements AFTER all perms are created
-                        operation_objects_with_requires = [obj for obj in operation_objects if "requires" in obj]
-                        for operation_object in operation_objects_with_requires:
-                            if not isinstance(operation_object, str):
-                                required_verbs = operation_object.get("requires")
-                                verb = operation_object.get("verb")
-                                permission = Permission.objects.get(permission=f"{app_name}:{resource}:{verb}")
-                                required_permissions = Permission.objects.filter(
-                                    application=app_name, resource_type=resource, verb__in=required_verbs
-                                ).exclude(id=permission.id)
-                                permission.permissions.add(*required_permissions)
-                except Exception as e:
-                    logger.error(
-                        f"Failed to update or create permissions for: " f"{app_name}:{resource} with error: {e}"
+        for resource, operation_objects in data.items():
+            for operation_object in operation_objects:
+                # There are some old configs, e.g., cost-management still stay in CI
+                if isinstance(operation_object, str):
+                    definitions[f"{app_name}:{resource}:{operation_object}"] = (
+                        app_name,
+                        resource,
+                        operation_object,
+                        None,
                     )
+                    continue
+                verb = operation_object.get("verb")
+                permission = f"{app_name}:{resource}:{verb}"
+                definitions[permission] = (app_name, resource, verb, operation_object.get("description", ""))
+                if "requires" in operation_object:
+                    requires[permission] = [
+                        f"{app_name}:{resource}:{required_verb}" for required_verb in operation_object.get("requires")
+                    ]
+    return definitions, requires
+
+
+def seed_permissions():
+    """Update or create defined permissions.
+
+    Every definitions file is read first and diffed against the existing permissions, so that new permissions and
+    changed descriptions are written with a single upsert, and missing requirements with a single insert.
+    """
+    public_tenant = Tenant.objects.get(tenant_name="public")
+    definitions, requires = _load_permission_definitions()
+
+    with transaction.atomic():
+        existing_descriptions = dict(
+            Permission.objects.filter(permission__in=definitions).values_list("permission", "description")
+        )
+        upserts = [
+            Permission(
+                permission=permission,
+                application=application,
+                resource_type=resource_type,
+                verb=verb,
+                description=description or "",
+                tenant=public_tenant,
+            )
+            for permission, (application, resource_type, verb, description) in definitions.items()
+            if permission not in existing_descriptions or description not in (None, existing_descriptions[permission])
+        ]
+        Permission.objects.bulk_create(
+            upserts, update_conflicts=True, unique_fields=["permission"], update_fields=["description"]
+        )
+        for permission in upserts:
+            if permission.permission not in existing_descriptions:
+                logger.info(f"Created permission {permission.permission}.")
+
+        permission_ids = dict(Permission.objects.filter(permission__in=definitions).values_list("permission", "id"))
+        # need to add the requirements AFTER all perms are created
+        Permission.permissions.through.objects.bulk_create(
+            [
+                Permission.permissions.through(
+                    from_permission_id=permission_ids[permission], to_permission_id=permission_ids[required]
+                )
+                for permission, required_permissions in requires.items()
+                for required in required_permissions
+                if required in permission_ids and required != permission
+            ],
+            ignore_conflicts=True,
+        )
+
     # Find perms in DB but not in config
-    perms_to_delete = Permission.objects.exclude(id__in=current_permission_ids)
+    perms_to_delete = Permission.objects.exclude(id__in=permission_ids.values())
     logger.info(
         f"The following '{perms_to_delete.count()}' permission(s) eligible for removal: {perms_to_delete.values()}"
     )
@@ -283,16 +357,22 @@ def seed_permissions():
         logger.info(f"Removing the following permissions(s): {perms_to_delete.values()}")
         # Actually remove perms no longer in DB
         with transaction.atomic():
-            for permission in perms_to_delete:
-                delete_permission(permission)
+            delete_permissions(perms_to_delete)
 
 
 def delete_permission(permission: Permission):
     """Delete a permission and handles relations cleanning."""
-    roles = Role.objects.filter(access__permission=permission).distinct()
+    delete_permissions(Permission.objects.filter(id=permission.id))
+
+
+def delete_permissions(permissions: QuerySet):
+    """Delete permissions, replicating each role that granted any of them once.
+
+    Once the deletion commits, the permission catalog generation is bumped so that cached permission lists drop them.
+    """
+    role_ids = Role.objects.filter(access__permission__in=permissions).values("id")
     dual_write_handlers = []
-    for role in roles:
-        role = Role.objects.filter(id=role.id).select_for_update().get()
+    for role in Role.objects.filter(id__in=role_ids).order_by("id").select_for_update():
         dual_write_handler = (
             SeedingRelationApiDualWriteHandler(role=role)
             if role.system
@@ -300,13 +380,14 @@ def delete_permission(permission: Permission):
         )
         dual_write_handler.prepare_for_update()
         dual_write_handlers.append(dual_write_handler)
-    permission.delete()
+    permissions.delete()
     for dual_write_handler in dual_write_handlers:
         role = dual_write_handler.role
         if isinstance(dual_write_handler, SeedingRelationApiDualWriteHandler):
             dual_write_handler.replicate_update_system_role()
         else:
             dual_write_handler.replicate_new_or_updated_role(role)
+    transaction.on_commit(lambda: PermissionCatalogCache().bump_generation())
 
 
 def _create_single_platform_role(access_type, scope, policy_service, public_tenant):
@@ -147,6 +147,14 @@ class ExtRoleRelation(models.Model):
         ]
 
 
+class RoleDefinitionFile(models.Model):
+    """The digest of a system role definitions file as of its last complete seeding."""
+
+    name = models.CharField(max_length=255, null=False, unique=True)
+    digest = models.CharField(max_length=64, null=False)
+    modified = models.DateTimeField(auto_now=True)
+
+
 class BindingMapping(models.Model):
     """V2 binding Mapping definition."""
 
@@ -159,13 +167,16 @@ class BindingMapping(models.Model):
 
     def save(self, *args, **kwargs):
         """Validate and save this BindingMapping."""
+        self.validate_mappings()
+        super().save(*args, **kwargs)
+
+    def validate_mappings(self):
+        """Validate the mappings, which must be done before writing them in bulk since that bypasses save()."""
         users = self.mappings.get("users", None)
 
         if (users is not None) and not isinstance(users, dict):
             raise TypeError("users must be a dict. Support for representing users as a list has been removed.")
 
-        super().save(*args, **kwargs)
-
     @classmethod
     def for_role_binding(cls, role_binding: V2rolebinding, v1_role: Union[Role, str]):
         """Create a new BindingMapping for a V2rolebinding."""
@@ -75,11 +75,13 @@ class RoleV2QuerySet(models.QuerySet):
     def excluding_out_of_scope_v2_roles(self):
         """Exclude roles that include any permission from a migration-excluded application.
 
-        Uses cached permission PKs; see ``v2_role_excluded_application_permission_ids_cache``.
+        Uses the ``out_of_scope`` column; see ``management.role.v2_role_scope``.
         """
-        from management.role.v2_role_scope import v2_role_excluded_application_permission_ids_cache
+        return self.filter(out_of_scope=False)
 
-        perm_ids = v2_role_excluded_application_permission_ids_cache.permission_ids()
-        if not perm_ids:
-            return self
-        return self.exclude(permissions__id__in=perm_ids).distinct()
+    def with_highest_scope_in(self, scopes):
+        """Filter to roles whose highest permission scope lies within the given scopes.
+
+        Uses the ``highest_scope`` column; see ``management.role.v2_role_scope``.
+        """
+        return self.filter(highest_scope__gte=min(scopes), highest_scope__lte=max(scopes))
@@ -17,15 +17,17 @@
 
 """Class to handle Dual Write API related operations."""
 
+import copy
 import logging
 from abc import ABC
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Optional
 
 from django.conf import settings
 from django.db.models import Model
 from management.group.platform import DefaultGroupNotAvailableError, GlobalPolicyIdService
 from management.models import Workspace
 from management.permission.scope_service import ImplicitResourceService, Scope, bound_model_for_scope
+from management.rbac_fields import AutoDateTimeField
 from management.relation_replicator.noop_replicator import NoopReplicator
 from management.relation_replicator.outbox_replicator import OutboxReplicator
 from management.relation_replicator.relation_replicator import DualWriteException, PartitionKey
@@ -193,7 +195,9 @@ class SeedingRelationApiDualWriteHandler(BaseRelationApiDualWriteHandler):
         # Gather v1 and v2 permissions for the role
         v2_permissions: list[str] = []
 
-        for access in self.role.access.all():
+        # Load the permissions with the accesses in one query, as they are needed for the scope as well.
+        accesses = list(self.role.access.select_related("permission"))
+        for access in accesses:
             v1_perm = access.permission
             v2_perm = v1_perm_to_v2_perm(v1_perm)
             v2_permissions.append(v2_perm)
@@ -208,7 +212,9 @@ class SeedingRelationApiDualWriteHandler(BaseRelationApiDualWriteHandler):
                 )
         else:
             # Determine highest scope for the role's permissions
-            highest_scope: Scope = self.implicit_resource_service.scope_for_role(self.role)
+            highest_scope: Scope = self.implicit_resource_service.highest_scope_for_permissions(
+                access.permission.permission for access in accesses
+            )
             relations.extend(
                 self._check_create_admin_platform_relation(
                     self.role, highest_scope, apply_seeded_admin_scope_override=True
@@ -263,18 +269,73 @@ def _by_pk[M: Model](models: Iterable[M]) -> dict[Any, M]:
     return out
 
 
+def _field_values(model: Model) -> dict[str, Any]:
+    return {
+        field.name: copy.deepcopy(getattr(model, field.attname))
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+    }
+
+
 # Here, Any is the type of the model's pk attribute.
-def _update_by_pk[M: Model](old_by_pk: dict[Any, M], new: Iterable[M]):
-    old_by_pk = dict(old_by_pk)
+def _field_values_by_pk[M: Model](models_by_pk: dict[Any, M]) -> dict[Any, dict[str, Any]]:
+    return {pk: _field_values(model) for pk, model in models_by_pk.items()}
 
-    for model in new:
-        if model.pk is not None:
-            old_by_pk.pop(model.pk, None)
 
-        model.save()
+# Here, Any is the type of the model's pk attribute.
+def _update_by_pk[M: Model](
+    model_class: type[M],
+    old_values_by_pk: dict[Any, dict[str, Any]],
+    new: Iterable[M],
+    validate: Optional[Callable[[M], None]] = None,
+):
+    """
+    Write the difference between the models as loaded and their new state in bulk.
+
+    Unsaved models are inserted with one bulk_create, models whose fields changed are written with one bulk_update
+    of only the changed fields, and models no longer present are removed with one DELETE. Since the bulk writes skip
+    save(), validate is called on each inserted or changed model beforehand, and the AutoDateTimeFields of changed
+    models are refreshed as save() would.
+    """
+    auto_fields = [field for field in model_class._meta.concrete_fields if isinstance(field, AutoDateTimeField)]
+    removed = set(old_values_by_pk)
+    created: list[M] = []
+    changed: list[M] = []
+    changed_fields: set[str] = set()
+
+    def changed_field_names(model: M, old_values: Optional[dict[str, Any]]) -> set[str]:
+        """Return the names of the fields whose value differs from the loaded one, or of all fields if unloaded."""
+        return {
+            name for name, value in _field_values(model).items() if old_values is None or old_values[name] != value
+        }
 
-    for removed in old_by_pk.values():
-        removed.delete()
+    for model in new:
+        if model.pk is None:
+            if validate is not None:
+                validate(model)
+            created.append(model)
+            continue
+
+        removed.discard(model.pk)
+        old_values = old_values_by_pk.get(model.pk)
+        fields = changed_field_names(model, old_values)
+
+        if fields:
+            if validate is not None:
+                validate(model)
+                fields = changed_field_names(model, old_values)
+            for field in auto_fields:
+                setattr(model, field.attname, field.pre_save(model, add=False))
+                fields.add(field.name)
+            changed.append(model)
+            changed_fields.update(fields)
+
+    if created:
+        model_class.objects.bulk_create(created)
+    if changed:
+        model_class.objects.bulk_update(changed, sorted(changed_fields))
+    if removed:
+        model_class.objects.filter(pk__in=removed).delete()
 
 
 class RelationApiDualWriteHandler(BaseRelationApiDualWriteHandler):
@@ -311,6 +372,9 @@ class RelationApiDualWriteHandler(BaseRelationApiDualWriteHandler):
             self.binding_mappings: dict[int, BindingMapping] = {}
             self.role_bindings: dict[int, RoleBinding] = {}
             self.v2_roles: dict[int, CustomRoleV2] = {}
+            self._binding_mapping_values: dict[int, dict[str, Any]] = {}
+            self._role_binding_values: dict[int, dict[str, Any]] = {}
+            self._v2_role_values: dict[int, dict[str, Any]] = {}
 
             binding_tenant = tenant if tenant is not None else role.tenant
 
@@ -346,6 +410,11 @@ class RelationApiDualWriteHandler(BaseRelationApiDualWriteHandler):
             self.role_bindings = _by_pk(RoleBinding.objects.filter(role__v1_source=self.role).select_for_update())
             self.v2_roles = _by_pk(self.role.v2_roles.select_for_update())
 
+            # The migration updates existing models in place, so keep what was loaded to diff against.
+            self._binding_mapping_values = _field_values_by_pk(self.binding_mappings)
+            self._role_binding_values = _field_values_by_pk(self.role_bindings)
+            self._v2_role_values = _field_values_by_pk(self.v2_roles)
+
             if not self.binding_mappings:
                 logger.warning(
                     "[Dual Write] Binding mappings not found for role(%s): '%s'. "
@@ -438,14 +507,22 @@ class RelationApiDualWriteHandler(BaseRelationApiDualWriteHandler):
             # multiple bindings share the same V2role
             relations = deduplicate_role_permission_relationships(relations)
 
-            _update_by_pk(old_by_pk=self.binding_mappings, new=migrate_result.binding_mappings)
-            _update_by_pk(old_by_pk=self.role_bindings, new=migrate_result.role_bindings)
-            _update_by_pk(old_by_pk=self.v2_roles, new=migrate_result.v2_roles)
+            for binding_mapping in migrate_result.binding_mappings:
+                binding_mapping.validate_mappings()
+
+            _update_by_pk(BindingMapping, self._binding_mapping_values, migrate_result.binding_mappings)
+            _update_by_pk(RoleBinding, self._role_binding_values, migrate_result.role_bindings)
+            _update_by_pk(
+                CustomRoleV2, self._v2_role_values, migrate_result.v2_roles, validate=CustomRoleV2.validate_for_save
+            )
 
             self.role_relations = relations
             self.binding_mappings = _by_pk(migrate_result.binding_mappings)
             self.role_bindings = _by_pk(migrate_result.role_bindings)
             self.v2_roles = _by_pk(migrate_result.v2_roles)
+            self._binding_mapping_values = _field_values_by_pk(self.binding_mappings)
+            self._role_binding_values = _field_values_by_pk(self.role_bindings)
+            self._v2_role_values = _field_values_by_pk(self.v2_roles)
 
             tenant_resource_id = self.tenant.tenant_resource_id()
             if tenant_resource_id:
@@ -17,6 +17,8 @@
 
 """Serializer for role management."""
 
+import json
+
 from django.conf import settings
 from django.utils.translation import gettext as _
 from feature_flags import FEATURE_FLAGS
@@ -238,9 +240,9 @@ class RoleSerializer(serializers.ModelSerializer):
         access_list = validated_data.pop("access")
         tenant = self.context["request"].tenant
 
-        instance = update_role(instance, validated_data)
+        instance = update_role(instance, validated_data, clear_access=False)
 
-        create_access_for_role(instance, access_list, tenant)
+        sync_access_for_role(instance, access_list, tenant)
 
         return instance
 
@@ -508,14 +510,77 @@ def obtain_groups_in(obj, request):
 
 def create_access_for_role(role, access_list, tenant):
     """Create access objects and relate it to role."""
+    permissions = _permissions_by_name(access_list)
+    _bulk_create_access(role, access_list, permissions, tenant)
+
+
+def sync_access_for_role(role, access_list, tenant):
+    """
+    Bring the role's access in line with the given access list.
+
+    Access entries that already exist with the same permission and resource definitions are kept as-is,
+    so only the entries that actually changed are deleted or created.
+    """
+    remaining = {}
+    for access in role.access.select_related("permission").prefetch_related("resourceDefinitions"):
+        key = _access_key(
+            access.permission.permission,
+            [{"attributeFilter": rd.attributeFilter} for rd in access.resourceDefinitions.all()],
+        )
+        remaining.setdefault(key, []).append(access.id)
+
+    to_create = []
     for access_item in access_list:
-        resource_def_list = access_item.get("resourceDefinitions")
-        access_permission = access_item.get("permission")
-        permission = Permission.objects.get(**access_permission)
+        key = _access_key(access_item["permission"]["permission"], access_item.get("resourceDefinitions"))
+        if remaining.get(key):
+            remaining[key].pop()
+        else:
+            to_create.append(access_item)
+
+    permissions = _permissions_by_name(to_create)
+
+    stale_ids = [access_id for access_ids in remaining.values() for access_id in access_ids]
+    if stale_ids:
+        Access.objects.filter(id__in=stale_ids).delete()
+
+    if to_create:
+        _bulk_create_access(role, to_create, permissions, tenant)
+
+
+def _access_key(permission, resource_def_list):
+    """Build a comparable key for an access entry from its permission and resource definitions."""
+    filters = sorted(json.dumps(item["attributeFilter"], sort_keys=True) for item in resource_def_list or [])
+    return permission, tuple(filters)
+
+
+def _permissions_by_name(access_list):
+    """Resolve every permission referenced by the access list with a single query."""
+    names = {access_item["permission"]["permission"] for access_item in access_list}
+    permissions = {p.permission: p for p in Permission.objects.filter(permission__in=names)}
+
+    missing = names - permissions.keys()
+    if missing:
+        raise Permission.DoesNotExist(f"Permission does not exist: {sorted(missing)}")
+
+    return permissions
+
+
+def _bulk_create_access(role, access_list, permissions, tenant):
+    """Insert the access rows and their resource definitions with one statement each."""
+    access_objs = Access.objects.bulk_create(
+        [
+            Access(permission=permissions[access_item["permission"]["permission"]], role=role, tenant=tenant)
+            for access_item in access_list
+        ]
+    )
 
-        access_obj = Access.objects.create(permission=permission, role=role, tenant=tenant)
-        for resource_def_item in resource_def_list:
-            ResourceDefinition.objects.create(**resource_def_item, access=access_obj, tenant=tenant)
+    resource_defs = [
+        ResourceDefinition(**resource_def_item, access=access_obj, tenant=tenant)
+        for access_obj, access_item in zip(access_objs, access_list)
+        for resource_def_item in access_item.get("resourceDefinitions") or []
+    ]
+    if resource_defs:
+        ResourceDefinition.objects.bulk_create(resource_defs)
 
 
 def update_role(instance, validated_data, clear_access=True):
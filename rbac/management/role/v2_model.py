@@ -61,6 +61,10 @@ class RoleV2(TenantAwareModel):
     v1_source = models.ForeignKey(Role, null=True, blank=True, related_name="v2_roles", on_delete=models.CASCADE)
     created = models.DateTimeField(default=timezone.now)
     modified = AutoDateTimeField(default=timezone.now)
+    # Derived from permissions; maintained by refresh_v2_role_scopes (see management.role.v2_role_scope).
+    # highest_scope holds a permission_scope Scope value, where 1 is Scope.DEFAULT.
+    highest_scope = models.PositiveSmallIntegerField(default=1, db_index=True)
+    out_of_scope = models.BooleanField(default=False, db_index=True)
 
     class Meta:
         ordering = ["name", "modified"]
@@ -153,8 +157,8 @@ class TypeValidatedRoleV2Mixin:
                 f"Expected role to have type {self._expected_type}, but found {self.type}"
             )
 
-    def save(self, **kwargs):
-        """Save the model with type validation."""
+    def validate_for_save(self):
+        """Run the type validation and all validations from the model that save() runs, without saving."""
         if self.type and self.type != self._expected_type:
             raise serializers.ValidationError(
                 f"Expected role to have type {self._expected_type}, but found {self.type}"
@@ -162,10 +166,15 @@ class TypeValidatedRoleV2Mixin:
         else:
             self.type = self._expected_type
 
+        self.full_clean()
+
+    def save(self, **kwargs):
+        """Save the model with type validation."""
+        self.validate_for_save()
+
         if (update_fields := kwargs.get("update_fields")) is not None:
             kwargs["update_fields"] = {"type", *update_fields}
 
-        self.full_clean()
         super().save(**kwargs)
 
 
@@ -299,5 +308,28 @@ def validate_role_children_on_m2m_change(sender, instance, action, pk_set, **kwa
         raise serializers.ValidationError({"children": f"{parent_type.capitalize()} roles cannot have children."})
 
 
+def refresh_role_scope_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Signal handler to keep the derived scope columns of roles in step with their permissions."""
+    from management.role.v2_role_scope import refresh_v2_role_scopes, v2_role_scopes
+
+    if reverse and action == "pre_clear":
+        instance._cleared_v2_role_ids = list(instance.v2_roles.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        # Keep the instance in step too, so a later save() does not write back stale values.
+        instance.highest_scope, instance.out_of_scope = v2_role_scopes([instance.pk])[instance.pk]
+        RoleV2.objects.filter(pk=instance.pk).update(
+            highest_scope=instance.highest_scope, out_of_scope=instance.out_of_scope
+        )
+    elif action == "post_clear":
+        refresh_v2_role_scopes(instance.__dict__.pop("_cleared_v2_role_ids", []))
+    elif pk_set:
+        refresh_v2_role_scopes(pk_set)
+
+
 # Connect the signal handler to the RoleV2.children through model
 signals.m2m_changed.connect(validate_role_children_on_m2m_change, sender=RoleV2.children.through)
+signals.m2m_changed.connect(refresh_role_scope_on_m2m_change, sender=RoleV2.permissions.through)
@@ -14,12 +14,16 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
-"""V2 role list filtering by migration-excluded permission applications."""
+"""Derived scope columns of V2 roles, used to filter role lists with indexed predicates."""
 
 from __future__ import annotations
 
+from typing import Iterable, Optional
+
 from django.conf import settings
 
+REFRESH_BATCH_SIZE = 1000
+
 
 def v2_role_excluded_applications() -> frozenset[str]:
     """Return permission ``application`` values in ``V2_MIGRATION_APP_EXCLUDE_LIST``.
@@ -31,39 +35,55 @@ def v2_role_excluded_applications() -> frozenset[str]:
     return frozenset(app.strip() for app in settings.V2_MIGRATION_APP_EXCLUDE_LIST if app and str(app).strip())
 
 
-class V2RoleExcludedApplicationPermissionIdsCache:
-    """In-process cache: Permission PKs whose ``application`` is in the migration exclude list.
+def v2_role_scopes(role_ids: Iterable[int]) -> dict[int, tuple[int, bool]]:
+    """Compute ``(highest_scope, out_of_scope)`` for each of the given roles from their permissions.
 
-    Rebuilt when the cached application set no longer matches settings, or after
-    ``invalidate()`` (e.g. permission seeding).
+    ``highest_scope`` is the highest Scope of any permission of the role (Scope.DEFAULT for a role without
+    permissions), and ``out_of_scope`` is whether any permission belongs to a migration-excluded application.
     """
+    from management.permission.scope_service import Scope, permission_scope_cache
+    from management.role.v2_model import RoleV2
 
-    def __init__(self):
-        """Initialize the cache."""
-        self._apps: frozenset[str] | None = None
-        self._ids: frozenset[int] | None = None
-
-    def permission_ids(self) -> frozenset[int]:
-        """Return IDs of all permissions in excluded applications (possibly empty)."""
-        apps = v2_role_excluded_applications()
-        if not apps:
-            self._apps = apps
-            self._ids = frozenset()
-            return self._ids
+    role_ids = list(role_ids)
+    excluded_applications = v2_role_excluded_applications()
+    scopes = {role_id: (int(Scope.DEFAULT), False) for role_id in role_ids}
 
-        if self._ids is not None and self._apps == apps:
-            return self._ids
+    rows = RoleV2.permissions.through.objects.filter(rolev2_id__in=role_ids).values_list(
+        "rolev2_id", "permission_id", "permission__permission", "permission__application"
+    )
+    for role_id, permission_id, permission, application in rows:
+        highest_scope, out_of_scope = scopes[role_id]
+        scopes[role_id] = (
+            max(highest_scope, int(permission_scope_cache.scope_for_permission(permission_id, permission))),
+            out_of_scope or application in excluded_applications,
+        )
+    return scopes
 
-        from management.permission.model import Permission
 
-        self._apps = apps
-        self._ids = frozenset(Permission.objects.filter(application__in=list(apps)).values_list("id", flat=True))
-        return self._ids
+def refresh_v2_role_scopes(role_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute the derived scope columns of the given roles, or of every role when no ids are given.
 
-    def invalidate(self) -> None:
-        """Clear the cache so the next access reloads from the database."""
-        self._apps = None
-        self._ids = None
-
-
-v2_role_excluded_application_permission_ids_cache = V2RoleExcludedApplicationPermissionIdsCache()
+    Only roles whose values changed are written. Returns the number of roles updated.
+    """
+    from management.role.v2_model import RoleV2
+
+    if role_ids is None:
+        role_ids = RoleV2.objects.order_by("pk").values_list("pk", flat=True)
+    role_ids = sorted(set(role_ids))
+
+    updated = 0
+    for start in range(0, len(role_ids), REFRESH_BATCH_SIZE):
+        end = start + REFRESH_BATCH_SIZE
+        batch = role_ids[start:end]
+        scopes = v2_role_scopes(batch)
+
+        changed = []
+        for role in RoleV2.objects.filter(pk__in=batch).only("pk", "highest_scope", "out_of_scope"):
+            highest_scope, out_of_scope = scopes[role.pk]
+            if (role.highest_scope, role.out_of_scope) != (highest_scope, out_of_scope):
+                role.highest_scope, role.out_of_scope = highest_scope, out_of_scope
+                changed.append(role)
+
+        RoleV2.objects.bulk_update(changed, ["highest_scope", "out_of_scope"])
+        updated += len(changed)
+    return updated
@@ -31,7 +31,6 @@ from management.permission.exceptions import InvalidPermissionDataError
 from management.permission.model import PermissionValue
 from management.permission.scope_service import (
     Scope,
-    permission_scope_cache,
     scope_for_resource,
     scopes_for_resource_type,
 )
@@ -279,8 +278,7 @@ class RoleV2Service:
         - With ``resource_id`` the root workspace UUID: only ROOT-scoped roles.
         - With any other workspace UUID: only DEFAULT-scoped roles.
 
-        Uses DB-level filtering with cached Permission-ID-to-Scope mappings to
-        avoid loading all roles and their permissions into Python memory.
+        Filters on the role's persisted highest scope, so no permission IDs are sent to the database.
         """
         matching_scopes = scopes_for_resource_type(resource_type)
         if not matching_scopes:
@@ -296,18 +294,7 @@ class RoleV2Service:
             else:
                 matching_scopes = {Scope.DEFAULT}
 
-        higher_non_matching = {s for s in (set(Scope) - matching_scopes) if s > max(matching_scopes)}
-
-        if Scope.DEFAULT not in matching_scopes:
-            matching_ids = permission_scope_cache.ids_for_scopes(matching_scopes)
-            queryset = queryset.filter(permissions__id__in=matching_ids).distinct()
-
-        if higher_non_matching:
-            higher_ids = permission_scope_cache.ids_for_scopes(higher_non_matching)
-            if higher_ids:
-                queryset = queryset.exclude(permissions__id__in=higher_ids)
-
-        return queryset
+        return queryset.with_highest_scope_in(matching_scopes)
 
     @atomic
     def bulk_delete(
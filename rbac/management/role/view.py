@@ -32,6 +32,7 @@ from django.http import Http404
 from django.utils.translation import gettext as _
 from django_filters import rest_framework as filters
 from internal.utils import get_workspace_ids_from_resource_definition
+from management.export import ExportMixin
 from management.filters import CommonFilters
 from management.models import AuditLog, Permission
 from management.notifications.notification_handlers import role_obj_change_notification_handler
@@ -52,6 +53,7 @@ from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 
+from api.common.pagination import OptInKeysetResultsSetPagination
 from api.models import Tenant
 from rbac.env import ENVIRONMENT
 from .model import Role
@@ -125,6 +127,7 @@ class RoleFilter(CommonFilters):
 
 
 class RoleViewSet(
+    ExportMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -135,7 +138,7 @@ class RoleViewSet(
     """Role View.
 
     A viewset that provides default `create()`, `destroy`, `retrieve()`,
-    and `list()` actions.
+    `list()` and `export()` actions.
 
     """
 
@@ -147,6 +150,8 @@ class RoleViewSet(
     filterset_class = RoleFilter
     ordering_fields = ("name", "display_name", "modified", "policyCount")
     ordering = ("name",)
+    pagination_class = OptInKeysetResultsSetPagination
+    keyset_ordering_fields = ("name", "display_name", "modified")
 
     def get_queryset(self):
         """Obtain queryset for requesting user based on access and action."""
@@ -202,7 +207,7 @@ class RoleViewSet(
 
     def get_serializer_class(self):
         """Get serializer class based on route."""
-        if self.request.path.endswith("roles/") and self.request.method == "GET":
+        if self.action == "export" or (self.request.path.endswith("roles/") and self.request.method == "GET"):
             return RoleDynamicSerializer
         if self.request.method == "PATCH" and re.match(".*/roles/.*/$", self.request.path):
             return RolePatchSerializer
@@ -213,7 +218,7 @@ class RoleViewSet(
         serializer_class = self.get_serializer_class()
         kwargs["context"] = self.get_serializer_context()
 
-        if self.action == "list":
+        if self.action in ("list", "export"):
             kwargs["fields"] = self.validate_and_get_additional_field_key(self.request.query_params)
 
         return serializer_class(*args, **kwargs)
@@ -120,22 +120,26 @@ class RoleBindingQuerySet(QuerySet):
             principal = _resolve_principal(granted_subject_id, tenant)
             if not principal:
                 return self.none()
-            group_uuids = _group_uuids_for_principal(principal, tenant)
-            return self.filter(
-                Q(principal_entries__principal__uuid=principal.uuid) | Q(group_entries__group__uuid__in=group_uuids)
-            ).distinct()
+            return self.granted_to_principal(principal, tenant).distinct()
         elif granted_subject_type == SubjectType.PRINCIPAL:
             if not granted_subject_principal_user_id:
                 return self.none()
             principal = _resolve_principal_by_user_id(granted_subject_principal_user_id, tenant)
             if not principal:
                 return self.none()
-            group_uuids = _group_uuids_for_principal(principal, tenant)
-            return self.filter(
-                Q(principal_entries__principal__uuid=principal.uuid) | Q(group_entries__group__uuid__in=group_uuids)
-            ).distinct()
+            return self.granted_to_principal(principal, tenant).distinct()
         return self.none()
 
+    def granted_to_principal(self, principal, tenant):
+        """Filter to bindings granting access to a principal, directly or through any of its groups.
+
+        Does not apply distinct(); callers needing unique bindings rather than an existence check must add it.
+        """
+        group_uuids = _group_uuids_for_principal(principal, tenant)
+        return self.filter(
+            Q(principal_entries__principal__uuid=principal.uuid) | Q(group_entries__group__uuid__in=group_uuids)
+        )
+
     def with_resource_names(self):
         """Annotate each binding with its resource's display name.
 
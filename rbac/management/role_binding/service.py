@@ -18,7 +18,7 @@
 
 import logging
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from typing import Iterable, Optional, Sequence
 
 from django.conf import settings
 from django.db import transaction
@@ -28,6 +28,7 @@ from management.atomic_transactions import atomic
 from management.exceptions import InvalidFieldError, NotFoundError, RequiredFieldError
 from management.group.model import Group
 from management.group.platform import DefaultGroupNotAvailableError, GlobalPolicyIdService
+from management.permission.model import Permission
 from management.permission.scope_service import Scope, default_implicit_resource_service, scope_for_resource
 from management.principal.model import Principal
 from management.relation_replicator.noop_replicator import NoopReplicator
@@ -74,6 +75,14 @@ class UpdateRoleBindingResult:
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class EffectivePermission:
+    """A permission a principal holds, together with the bound role granting it."""
+
+    permission: Permission
+    role: RoleV2
+
+
 @dataclass
 class CreateBindingRequest:
     """Typed input for a single role binding creation."""
@@ -240,6 +249,37 @@ class RoleBindingService:
 
         return queryset
 
+    def get_roles_granted_to_principal(self, principal: Principal) -> QuerySet:
+        """Get the roles bound to a principal, directly or through any of its groups.
+
+        Each role comes with its permissions and its children's permissions prefetched, so resolving
+        effective permissions with effective_permissions() takes a fixed number of queries.
+        """
+        bindings = RoleBinding.objects.filter(tenant=self.tenant, role=OuterRef("pk")).granted_to_principal(
+            principal, self.tenant
+        )
+        return (
+            RoleV2.objects.filter(Exists(bindings))
+            .prefetch_related("permissions", "children__permissions")
+            .order_by("name", "uuid")
+        )
+
+    @staticmethod
+    def effective_permissions(roles: Iterable[RoleV2]) -> list[EffectivePermission]:
+        """Flatten bound roles into the permissions they grant, including those of child roles.
+
+        A permission granted by several roles is listed once per role, under the role that was bound.
+        """
+        effective = []
+        for role in roles:
+            permissions = {
+                permission.permission: permission
+                for granting in (role, *role.children.all())
+                for permission in granting.permissions.all()
+            }
+            effective.extend(EffectivePermission(permissions[key], role) for key in sorted(permissions))
+        return effective
+
     def get_resource_name(self, resource_id: str, resource_type: str) -> Optional[str]:
         """Get the name of a resource by ID and type.
 
@@ -20,6 +20,7 @@ import logging
 
 from management.audit_log.model import AuditLog
 from management.base_viewsets import BaseV2ViewSet
+from management.export import ExportMixin
 from management.group.model import Group
 from management.permissions.role_binding_access import (
     RoleBindingKesselAccessPermission,
@@ -86,7 +87,7 @@ def _expand_platform_roles(bindings):
     return expanded
 
 
-class RoleBindingViewSet(AtomicOperationsMixin, BaseV2ViewSet):
+class RoleBindingViewSet(AtomicOperationsMixin, ExportMixin, BaseV2ViewSet):
     """Role Binding ViewSet.
 
     Provides access to role bindings with support for listing and updating.
@@ -158,6 +159,24 @@ class RoleBindingViewSet(AtomicOperationsMixin, BaseV2ViewSet):
             - order_by: Sort by specified field(s), prefix with '-' for descending
             - exclude_sources: 'none' (default) shows all, 'indirect' hides inherited, 'direct' hides direct
         """
+        queryset, context = self._list_queryset_and_context(request)
+        page = self.paginate_queryset(queryset)
+        page = _expand_platform_roles(page)
+
+        serializer = self.get_serializer(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
+    def get_export_queryset(self):
+        """Return the role bindings of the export, filtered and ordered as on the list."""
+        queryset, self._export_context = self._list_queryset_and_context(self.request)
+        return queryset.order_by(*self.paginator.get_ordering(self.request, queryset, self))
+
+    def serialize_export(self, rows):
+        """Return the representations of a chunk of exported role bindings, expanding platform roles."""
+        return self.get_serializer(_expand_platform_roles(rows), many=True, context=self._export_context).data
+
+    def _list_queryset_and_context(self, request):
+        """Return the role bindings matching the list query parameters and the context of their serializer."""
         input_serializer = RoleBindingListInputSerializer(data=request.query_params)
         input_serializer.is_valid(raise_exception=True)
         validated_params = input_serializer.validated_data
@@ -193,9 +212,6 @@ class RoleBindingViewSet(AtomicOperationsMixin, BaseV2ViewSet):
             if needs_resource_names:
                 queryset = queryset.with_resource_names()
 
-        page = self.paginate_queryset(queryset)
-        page = _expand_platform_roles(page)
-
         # Build context for output serializer
         context = {
             "request": request,
@@ -204,9 +220,7 @@ class RoleBindingViewSet(AtomicOperationsMixin, BaseV2ViewSet):
             "queried_resource_type": resource_type,
             "service": service,
         }
-
-        serializer = self.get_serializer(page, many=True, context=context)
-        return self.get_paginated_response(serializer.data)
+        return queryset, context
 
     def batch_create(self, request, *args, **kwargs):
         """Grant access to a resource to a set of subjects with a set of roles."""
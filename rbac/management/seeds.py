@@ -19,7 +19,7 @@
 import logging
 
 from django.db import connections
-from management.cache import AccessCache
+from management.cache import AccessCache, PermissionCatalogCache
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -54,7 +54,7 @@ def _run_seeds(seed_type, skip_notifications: bool = False, **kwargs):
     from management.group.definer import seed_group
     from management.notifications.notification_handlers import skip_rh_notifications
     from management.permission.scope_service import permission_scope_cache
-    from management.role.v2_role_scope import v2_role_excluded_application_permission_ids_cache
+    from management.role.v2_role_scope import refresh_v2_role_scopes
     from management.role.definer import seed_roles, seed_permissions
 
     seed_functions = {"role": seed_roles, "group": seed_group, "permission": seed_permissions}
@@ -65,7 +65,10 @@ def _run_seeds(seed_type, skip_notifications: bool = False, **kwargs):
         seed_functions[seed_type](**kwargs)
         if seed_type in ("permission", "role"):
             permission_scope_cache.invalidate()
-            v2_role_excluded_application_permission_ids_cache.invalidate()
+            # Scope settings may have changed with this deploy, so recompute the derived columns of every role.
+            updated = refresh_v2_role_scopes()
+            logger.info(f"Refreshed the scope columns of {updated} V2 roles.")
+            PermissionCatalogCache().bump_generation()
         logger.info(f"Finished seeding {seed_type}.")
     except Exception as exc:
         logger.error(f"Error encountered during {seed_type} seeding {exc}.")
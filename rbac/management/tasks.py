@@ -30,6 +30,7 @@ from internal.utils import (
     remove_unassigned_system_binding_mappings,
     replicate_missing_binding_tuples,
 )
+from management.audit_log.partitions import maintain_partitions
 from management.health.healthcheck import redis_health
 from management.principal.cleaner import (
     clean_tenants_principals,
@@ -51,6 +52,12 @@ def principal_cleanup_via_umb():
     process_principal_events_from_umb()
 
 
+@shared_task
+def audit_log_partition_maintenance():
+    """Celery task to create the upcoming audit log partitions and drop the expired ones."""
+    maintain_partitions()
+
+
 @shared_task
 def run_migrations_in_worker():
     """Celery task to run migrations."""
@@ -59,6 +59,10 @@ class TenantBootstrapService(Protocol):
         """Bootstrap a user in a tenant."""
         ...
 
+    def update_users(self, users: list[User], ready_tenant: bool = True) -> None:
+        """Bootstrap a batch of users, as if by calling update_user for each."""
+        ...
+
     def new_bootstrapped_tenant(self, org_id: str, account_number: Optional[str] = None) -> BootstrappedTenant:
         """Create a new tenant."""
         ...
@@ -33,6 +33,11 @@ class V1TenantBootstrapService:
             self._update_inactive_user(user)
             return None
 
+    def update_users(self, users: list[User], ready_tenant: bool = True) -> None:
+        """Bootstrap a batch of users, as if by calling update_user for each."""
+        for user in users:
+            self.update_user(user, ready_tenant=ready_tenant)
+
     def _update_active_user(self, user: User, upsert: bool, ready_tenant: bool) -> Optional[BootstrappedTenant]:
         if upsert:
             bootstrapped = self._get_or_bootstrap_tenant(user.org_id, user.account, ready=ready_tenant)
@@ -1,6 +1,7 @@
 """V2 implementation of Tenant bootstrapping."""
 
 import dataclasses
+import itertools
 from typing import Callable, Iterable, List, Optional
 
 from django.conf import settings
@@ -223,6 +224,20 @@ class V2TenantBootstrapService:
         assert len(bootstrap_results) == len(tenants)
         return bootstrap_results
 
+    def get_or_bootstrap_tenants(self, org_ids: Iterable[str], ready: bool = False) -> list[BootstrappedTenant]:
+        """
+        Get the tenants with the given org_ids, creating and bootstrapping in bulk those that need it.
+
+        Tenants that do not exist are created with the given [ready] flag. The returned list is not necessarily in the
+        same order as the provided org_ids.
+        """
+        return self._get_or_bootstrap_tenants(
+            org_ids=set(org_ids),
+            ready=ready,
+            account_number_by_org_id={},
+            bulk=True,
+        )
+
     def create_ungrouped_workspace(self, org_id) -> Workspace:
         """Util for creating ungrouped workspace. Can be removed once ungrouped workspace has gone."""
         tenant = Tenant.objects.get(org_id=org_id)
@@ -306,7 +321,32 @@ class V2TenantBootstrapService:
 
         return bootstrapped_tenant
 
-    def import_bulk_users(self, users: list[User], ready_tenants: bool = False):
+    def update_users(self, users: list[User], ready_tenant: bool = True) -> None:
+        """
+        Bootstrap a batch of users, as if by calling update_user for each.
+
+        Each run of consecutive disabled users is removed in bulk, with one replication event per org. Active users
+        are still updated one at a time, since each may need its tenant bootstrapped. Runs are applied in the order of
+        the batch, so a user enabled and then disabled within it ends up disabled.
+        """
+        for user in users:
+            if user.org_id is None:
+                raise ValueError(f"Cannot update user without org_id. username={user.username}")
+
+        for is_active, run in itertools.groupby(users, key=lambda user: user.is_active):
+            if is_active:
+                for user in run:
+                    self.update_user(user, ready_tenant=ready_tenant)
+            else:
+                self._disable_users_in_tenants(list(run))
+
+    def import_bulk_users(
+        self,
+        users: list[User],
+        ready_tenants: bool = False,
+        bootstrapped_tenants: Optional[list[BootstrappedTenant]] = None,
+        update_user_ids: bool = True,
+    ):
         """
         Bootstrap multiple users in a tenant.
 
@@ -315,6 +355,10 @@ class V2TenantBootstrapService:
 
         Args:
             users (list): List of User objects to update
+            ready_tenants (bool): Whether the tenants created for the users are ready
+            bootstrapped_tenants (list): Tenants of the users known to be bootstrapped, which are neither looked up nor
+                locked again
+            update_user_ids (bool): Whether to set the user_id of the existing principals, False if already set
         """
         org_ids = set()
         for user in users:
@@ -331,12 +375,13 @@ class V2TenantBootstrapService:
                 )
             org_ids.add(user.org_id)
 
-        bootstrapped_list = self._get_or_bootstrap_tenants(
-            org_ids=org_ids,
-            ready=ready_tenants,
-            account_number_by_org_id={},
-            bulk=True,
-        )
+        # Only the tenants that are not known to be bootstrapped are looked up and locked
+        bootstrapped_list = [
+            bootstrapped for bootstrapped in bootstrapped_tenants or [] if bootstrapped.tenant.org_id in org_ids
+        ]
+        missing_org_ids = org_ids - {bootstrapped.tenant.org_id for bootstrapped in bootstrapped_list}
+        if missing_org_ids:
+            bootstrapped_list.extend(self.get_or_bootstrap_tenants(missing_org_ids, ready=ready_tenants))
 
         bootstrapped_mapping = {bootstrapped.tenant.org_id: bootstrapped for bootstrapped in bootstrapped_list}
 
@@ -344,19 +389,22 @@ class V2TenantBootstrapService:
         tuples_to_remove = []
         principals_to_update = []
 
-        # Fetch existing principals
-        tenants = [bootstrapped.tenant for bootstrapped in bootstrapped_list]
-        existing_principals = (
-            Principal.objects.filter(Q(tenant__in=tenants) & Q(username__in=[user.username for user in users]))
-            .order_by()  # remove default sort order
-            .prefetch_related("tenant")
-        )
         # Mapping of (org_id, username) -> principal
         # This is important because usernames are only unique by tenant
         # We don't want to match a user just by username; we could end up picking the wrong one.
-        existing_principal_dict = {(p.tenant.org_id, p.username): p for p in existing_principals}
+        existing_principal_dict = {}
+        if update_user_ids:
+            tenants = [bootstrapped.tenant for bootstrapped in bootstrapped_list]
+            existing_principals = (
+                Principal.objects.filter(Q(tenant__in=tenants) & Q(username__in=[user.username for user in users]))
+                .order_by()  # remove default sort order
+                .prefetch_related("tenant")
+            )
+            existing_principal_dict = {(p.tenant.org_id, p.username): p for p in existing_principals}
 
-        logger.info(f"Bulk import users. found_users={len(existing_principal_dict)} total_users_in_batch={len(users)}")
+            logger.info(
+                f"Bulk import users. found_users={len(existing_principal_dict)} total_users_in_batch={len(users)}"
+            )
 
         for user in users:
             if not user.is_active:
@@ -456,6 +504,85 @@ class V2TenantBootstrapService:
             )
         )
 
+    def _disable_users_in_tenants(self, users: list[User]):
+        """Disable a batch of users, removing their principals and group memberships in bulk."""
+        users_by_org: dict[str, dict[str, User]] = {}
+        for user in users:
+            assert not user.is_active
+            org_id = user.org_id
+            assert org_id is not None
+            users_by_org.setdefault(org_id, {})[user.username] = user
+
+        mappings = {
+            mapping.tenant.org_id: mapping
+            for mapping in TenantMapping.objects.filter(tenant__org_id__in=users_by_org).select_related("tenant")
+        }
+        principals = {
+            (principal.tenant.org_id, principal.username): principal
+            for principal in Principal.objects.filter(
+                tenant__org_id__in=users_by_org, username__in={user.username for user in users}
+            )
+            .select_related("tenant")
+            .prefetch_related("group")
+        }
+
+        for org_id, org_users in users_by_org.items():
+            mapping: Optional[TenantMapping] = mappings.get(org_id)
+            tuples_to_remove = []
+            removed_principals = []
+            groups: dict[int, Group] = {}
+            members_by_group: dict[int, list[Principal]] = {}
+
+            for user in org_users.values():
+                user_id = self._get_user_id(user)
+                if mapping is not None:
+                    tuples_to_remove.append(
+                        Group.relationship_to_user_id_for_group(str(mapping.default_group_uuid), user_id)
+                    )
+                    tuples_to_remove.append(
+                        Group.relationship_to_user_id_for_group(str(mapping.default_admin_group_uuid), user_id)
+                    )
+
+                principal = principals.get((org_id, user.username))
+                if principal is None:
+                    logger.info(f"Could not find Principal to remove. org_id={org_id} user_id={user_id}")
+                    continue
+
+                for group in principal.group.all():
+                    groups[group.pk] = group
+                    members_by_group.setdefault(group.pk, []).append(principal)
+                    # The user id might be None for the principal so we use user instead
+                    tuple = group.relationship_to_principal(user)
+                    if tuple is None:
+                        raise ValueError(f"relationship_to_principal is None for user {user_id}")
+                    tuples_to_remove.append(tuple)
+                removed_principals.append(principal)
+
+            for group_pk, members in members_by_group.items():
+                groups[group_pk].principals.remove(*members)
+            Principal.objects.filter(pk__in=[principal.pk for principal in removed_principals]).delete()
+
+            logger.info(
+                f"Removed Principals and group membership from RBAC and Relations. org_id={org_id} "
+                f"users={len(org_users)} principals_removed={len(removed_principals)}"
+            )
+
+            if not tuples_to_remove:
+                continue
+
+            self._replicator.replicate(
+                ReplicationEvent(
+                    event_type=ReplicationEventType.BULK_EXTERNAL_USER_DISABLE,
+                    info={
+                        "org_id": org_id,
+                        "num_users": len(org_users),
+                        "mapping_id": mapping.id if mapping else None,
+                    },
+                    partition_key=PartitionKey.byEnvironment(),
+                    remove=tuples_to_remove,
+                )
+            )
+
     def _get_or_bootstrap_tenant(
         self, org_id: str, ready: bool, account_number: Optional[str] = None
     ) -> BootstrappedTenant:
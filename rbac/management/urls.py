@@ -21,6 +21,7 @@ from management.views import (
     AuditLogViewSet,
     GroupViewSet,
     PermissionViewSet,
+    PrincipalExportView,
     PrincipalView,
     RoleViewSet,
 )
@@ -35,6 +36,7 @@ ROUTER.register(r"auditlogs", AuditLogViewSet)
 # pylint: disable=invalid-name
 urlpatterns = [
     path("principals/", PrincipalView.as_view(), name="principals"),
+    path("principals/export/", PrincipalExportView.as_view(), name="principals-export"),
     path("access/", AccessView.as_view(), name="access"),
     path("", include(ROUTER.urls)),
 ]
@@ -19,7 +19,7 @@
 
 # flake8: noqa
 # pylint: disable=unused-import
-from management.principal.view import PrincipalView
+from management.principal.view import PrincipalExportView, PrincipalView
 from management.group.view import GroupViewSet
 from management.role.view import RoleViewSet
 from management.access.view import AccessView
@@ -20,7 +20,7 @@ import logging
 
 from feature_flags import FEATURE_FLAGS
 from management.workspace.utils import permission_from_request
-from management.workspace.utils.access import is_user_allowed_v2
+from management.workspace.utils.access import filter_workspaces_by_ids, is_user_allowed_v2
 from rest_framework import filters
 
 logger = logging.getLogger(__name__)
@@ -100,7 +100,7 @@ class WorkspaceAccessFilterBackend(filters.BaseFilterBackend):
         # If permission_tuples is set, filter by those IDs
         if hasattr(request, "permission_tuples") and request.permission_tuples:
             accessible_ids = {ws_tuple[1] for ws_tuple in request.permission_tuples}
-            return queryset.filter(id__in=accessible_ids)
+            return filter_workspaces_by_ids(queryset, accessible_ids)
 
         # has_access is True but no permission_tuples (system user bypass) - return all workspaces
         return queryset
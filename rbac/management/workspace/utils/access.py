@@ -21,6 +21,8 @@ import time
 from contextlib import contextmanager
 from uuid import UUID
 
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
 from django.db.models.expressions import RawSQL
 from feature_flags import FEATURE_FLAGS
 from management.models import Access, Workspace
@@ -114,54 +116,74 @@ def get_fallback_workspace_ids(tenant):
     return workspace_ids
 
 
-def filter_top_level_workspaces(queryset):
+def filter_workspaces_by_ids(queryset, workspace_ids):
     """
-    Filter workspaces to return only top-level ones using a single CTE query.
+    Filter workspaces to the given IDs by joining them as a single array parameter.
 
-    A workspace is top-level if none of its ancestors are in the queryset.
-    Uses RawSQL with a recursive CTE (similar to Workspace.ancestors() in model.py)
-    to compute top-level workspaces in a single database round-trip.
+    A plain id__in filter sends one literal per ID, which for principals with access to thousands of workspaces
+    makes a huge IN list that is slow to parse and plan. The IDs are instead passed as one comma-separated string
+    that is unnested into a set the planner can hash join against, keeping name search, ordering and
+    pagination in the same plan.
 
     Args:
         queryset: QuerySet of workspaces to filter
+        workspace_ids: Iterable of workspace ID strings or UUIDs
 
     Returns:
-        QuerySet: Filtered queryset containing only top-level workspaces
+        QuerySet: Filtered queryset containing only the given workspaces
     """
-    accessible_ids_list = list(queryset.values_list("id", flat=True))
-    if not accessible_ids_list:
+    workspace_ids = ",".join(str(workspace_id) for workspace_id in workspace_ids)
+    if not workspace_ids:
         return queryset.none()
 
-    # Single CTE query to find top-level workspaces:
-    # A workspace is top-level if none of its ancestors are in the accessible set
-    sql = """
-        WITH RECURSIVE workspace_ancestors AS (
-            -- Base case: start with all specified workspaces and their direct parents
-            SELECT id AS workspace_id, parent_id AS ancestor_id
-            FROM management_workspace
-            WHERE id = ANY(%s) AND parent_id IS NOT NULL
+    return queryset.filter(id__in=RawSQL("SELECT unnest(string_to_array(%s, ','))::uuid", [workspace_ids]))
+
+
+def _workspace_ids_sql(queryset):
+    """Return the SQL and parameters selecting the IDs of the given workspaces, or None if it is empty."""
+    try:
+        return queryset.order_by().values("id").query.sql_with_params()
+    except EmptyResultSet:
+        return None
+
+
+def get_ancestor_ids(queryset):
+    """
+    Get the IDs of all ancestors of the given workspaces using a single CTE query.
+
+    Ancestors are walked by ID only, so each is visited once however many of the workspaces share it. The walk only
+    follows parents in the tenant of the child, so a chain reaching into another tenant ends at the last ancestor
+    within the tenant rather than returning the other tenant's workspaces.
+
+    Args:
+        queryset: QuerySet of workspaces to get the ancestors of
+
+    Returns:
+        set[str]: Set of the ancestor workspace IDs
+    """
+    workspace_ids_sql = _workspace_ids_sql(queryset)
+    if workspace_ids_sql is None:
+        return set()
+    workspaces_sql, params = workspace_ids_sql
+
+    sql = f"""
+        WITH RECURSIVE ancestors AS (
+            SELECT p.id, p.parent_id, p.tenant_id
+            FROM management_workspace w
+            JOIN management_workspace p ON p.id = w.parent_id AND p.tenant_id = w.tenant_id
+            WHERE w.id IN ({workspaces_sql})
 
             UNION
 
-            -- Recursive case: get ancestors of ancestors
-            SELECT wa.workspace_id, w.parent_id AS ancestor_id
-            FROM workspace_ancestors wa
-            JOIN management_workspace w ON w.id = wa.ancestor_id
-            WHERE w.parent_id IS NOT NULL
-        ),
-        -- Find workspaces that have an ancestor in the accessible set (not top-level)
-        has_ancestor_in_set AS (
-            SELECT DISTINCT workspace_id
-            FROM workspace_ancestors
-            WHERE ancestor_id = ANY(%s)
+            SELECT p.id, p.parent_id, p.tenant_id
+            FROM ancestors a
+            JOIN management_workspace p ON p.id = a.parent_id AND p.tenant_id = a.tenant_id
         )
-        -- Return workspaces that don't have any ancestor in the accessible set
-        SELECT unnest(%s::uuid[])
-        EXCEPT
-        SELECT workspace_id FROM has_ancestor_in_set
+        SELECT id FROM ancestors
     """
-
-    return queryset.filter(id__in=RawSQL(sql, [accessible_ids_list, accessible_ids_list, accessible_ids_list]))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {str(row[0]) for row in cursor.fetchall()}
 
 
 def is_user_allowed(request, required_operation, target_workspace):
@@ -361,14 +383,16 @@ def is_user_allowed_v2(request, required_operation, target_workspace):
                 # User has actual workspace permissions (not just fallbacks)
                 request.has_real_workspace_access = True
 
-                # Add ancestors only from the top-level workspace(s) in accessible workspaces (for ancestry needs)
+                # Add the ancestors of the accessible workspaces (for ancestry needs)
                 # Get workspace objects for accessible IDs
                 with record_timing(timings, "db_filter_accessible_workspaces"):
-                    accessible_workspaces = Workspace.objects.filter(
-                        id__in=accessible_workspace_ids, tenant=request.tenant
+                    accessible_workspaces = filter_workspaces_by_ids(
+                        Workspace.objects.filter(tenant=request.tenant), accessible_workspace_ids
                     )
+                    # Keep only ids that exist for this tenant; drop stale Inventory-only ids
+                    existing_workspace_ids = {str(wid) for wid in accessible_workspaces.values_list("id", flat=True)}
 
-                if not accessible_workspaces.exists():
+                if not existing_workspace_ids:
                     # Inventory can return workspace ids that are not present in RBAC for this tenant
                     # (replication lag, stale tuples, cross-env mismatch). Treat like no workspace access
                     # so the list API still returns root/default/ungrouped like users with no permissions.
@@ -381,18 +405,11 @@ def is_user_allowed_v2(request, required_operation, target_workspace):
                     with record_timing(timings, "get_fallback_workspace_ids"):
                         accessible_workspace_ids = get_fallback_workspace_ids(request.tenant)
                 else:
-                    # Keep only ids that exist for this tenant; drop stale Inventory-only ids
-                    accessible_workspace_ids = {str(wid) for wid in accessible_workspaces.values_list("id", flat=True)}
-
-                    # Find the top-level workspace(s) - those that are not children of any other accessible workspace
-                    with record_timing(timings, "filter_top_level_workspaces"):
-                        top_level_workspaces = filter_top_level_workspaces(accessible_workspaces)
+                    accessible_workspace_ids = existing_workspace_ids
 
+                    # Add the ancestors of the accessible workspaces (for ancestry needs)
                     with record_timing(timings, "add_ancestor_ids"):
-                        for workspace in top_level_workspaces:
-                            # Add ancestors directly for this top-level workspace
-                            ancestor_ids = {str(ancestor.id) for ancestor in workspace.ancestors()}
-                            accessible_workspace_ids.update(ancestor_ids)
+                        accessible_workspace_ids.update(get_ancestor_ids(accessible_workspaces))
             else:
                 # User has no actual workspace permissions, only fallback access
                 request.has_real_workspace_access = False
@@ -17,6 +17,7 @@
 """View for Workspace management."""
 
 import logging
+import re
 import uuid
 
 import pgtransaction
@@ -26,6 +27,7 @@ from django_filters import rest_framework as filters
 from management.atomic_transactions import atomic_with_retry
 from management.audit_log.model import AuditLog
 from management.base_viewsets import BaseV2ViewSet
+from management.export import ExportMixin
 from management.permissions.workspace_access import WorkspaceAccessPermission
 from management.utils import clean_query_param, validate_and_get_key, validate_and_get_key_multi
 from management.workspace.filters import WorkspaceAccessFilterBackend, WorkspaceObjectAccessMixin
@@ -56,7 +58,7 @@ class WorkspacePagination(V2ResultsSetPagination):
     max_limit = 3000
 
 
-class WorkspaceViewSet(WorkspaceObjectAccessMixin, BaseV2ViewSet):
+class WorkspaceViewSet(WorkspaceObjectAccessMixin, ExportMixin, BaseV2ViewSet):
     """Workspace View.
 
     A viewset that provides default `create()`, `destroy` and `retrieve()`.
@@ -180,7 +182,21 @@ class WorkspaceViewSet(WorkspaceObjectAccessMixin, BaseV2ViewSet):
 
         Access filtering is handled by WorkspaceAccessFilterBackend.
         Ordering is handled by OrderingFilter (supports ?order_by=name or ?order_by=-name).
-        This method only handles additional query parameter filtering.
+        Additional query parameter filtering is handled by _filter_by_query_params.
+        """
+        # Use filter_queryset to apply all filter backends (including access filtering and ordering)
+        queryset = self._filter_by_query_params(request, self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_export_queryset(self):
+        """Return the workspaces of the export, filtered as on the list."""
+        return self._filter_by_query_params(self.request, super().get_export_queryset())
+
+    @staticmethod
+    def _filter_by_query_params(request, queryset):
+        """Filter the listed workspaces by the type, name, parent_id and ids query parameters.
 
         The ``type`` query parameter supports comma-separated values so that
         callers can request multiple workspace types in a single request, e.g.
@@ -188,8 +204,6 @@ class WorkspaceViewSet(WorkspaceObjectAccessMixin, BaseV2ViewSet):
         """
         all_types = "all"
         valid_types = [v.lower() for v in Workspace.Types.values] + [all_types]
-        # Use filter_queryset to apply all filter backends (including access filtering and ordering)
-        queryset = self.filter_queryset(self.get_queryset())
 
         # Sanitize the raw type parameter for NUL bytes (consistent with name/parent_id/ids)
         type_raw = clean_query_param(request.query_params.get("type"), "type")
@@ -230,13 +244,12 @@ class WorkspaceViewSet(WorkspaceObjectAccessMixin, BaseV2ViewSet):
         if type_fields != [all_types]:
             queryset = queryset.filter(type__in=type_fields)
         if name:
-            queryset = queryset.filter(name__icontains=name)
+            # A case-insensitive regular expression match, unlike icontains' UPPER(name) LIKE, can use the trigram
+            # index on name.
+            queryset = queryset.filter(name__iregex=re.escape(name))
         if parent_id:
             queryset = queryset.filter(parent_id=parent_id)
-
-        page = self.paginate_queryset(queryset)
-        serializer = self.get_serializer(page, many=True)
-        return self.get_paginated_response(serializer.data)
+        return queryset
 
     @atomic_with_retry(retries=3)
     def destroy(self, request, *args, **kwargs):
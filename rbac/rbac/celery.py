@@ -49,6 +49,11 @@ app.conf.beat_schedule = {
         "schedule": crontab(minute=0, hour=0),
         "args": [],
     },  # noqa: E231, E501
+    "audit-log-partitions-daily": {
+        "task": "management.tasks.audit_log_partition_maintenance",
+        "schedule": crontab(minute=30, hour=0),
+        "args": [],
+    },
     "schedule-redis-check": {
         "task": "management.tasks.run_redis_cache_health",
         "schedule": 30,
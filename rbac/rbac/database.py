@@ -58,5 +58,21 @@ def config():
         }
 
     db_obj.update(db_options)
+    db_obj.update(connection_options())
 
     return db_obj
+
+
+def connection_options():
+    """Return the connection lifetime options.
+
+    CONN_MAX_AGE keeps a connection open per gunicorn thread across requests instead of reconnecting each time,
+    and CONN_HEALTH_CHECKS makes Django verify a reused connection before handing it to a request. When running
+    behind pgbouncer in transaction pooling mode, server-side cursors must be disabled since they cannot outlive
+    the transaction that opened them.
+    """
+    return {
+        "CONN_MAX_AGE": ENVIRONMENT.int("DATABASE_CONN_MAX_AGE", default=0),
+        "CONN_HEALTH_CHECKS": ENVIRONMENT.bool("DATABASE_CONN_HEALTH_CHECKS", default=True),
+        "DISABLE_SERVER_SIDE_CURSORS": ENVIRONMENT.bool("DATABASE_DISABLE_SERVER_SIDE_CURSORS", default=False),
+    }
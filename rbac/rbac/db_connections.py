@@ -0,0 +1,88 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Metrics for the persistent database connections held by each worker."""
+
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from prometheus_client import Counter, Gauge
+
+ACTIVE = "active"
+IDLE = "idle"
+CLOSED = "closed"
+
+_STATE_ATTR = "_rbac_connection_state"
+
+db_connections = Gauge(
+    "rbac_db_connections",
+    "Database connections held open by this worker, by whether a request is currently using them",
+    ["state"],
+    multiprocess_mode="liveall",
+)
+db_connections_created_total = Counter(
+    "rbac_db_connections_created_total",
+    "Total database connections opened; compare against request count to see connection reuse",
+)
+
+
+def _transition(connection, state):
+    """Move a connection wrapper to the given state, keeping the gauges in step."""
+    previous = getattr(connection, _STATE_ATTR, CLOSED)
+    if previous == state:
+        return
+    if previous != CLOSED:
+        db_connections.labels(state=previous).dec()
+    if state != CLOSED:
+        db_connections.labels(state=state).inc()
+    setattr(connection, _STATE_ATTR, state)
+
+
+def _refresh(in_use):
+    """Record the state of this thread's connections after Django has closed the obsolete ones."""
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is None:
+            _transition(connection, CLOSED)
+        else:
+            _transition(connection, ACTIVE if in_use else IDLE)
+
+
+def connection_created_handler(sender=None, connection=None, **kwargs):
+    """Count a newly opened connection."""
+    db_connections_created_total.inc()
+    _transition(connection, ACTIVE)
+
+
+def request_started_handler(sender=None, **kwargs):
+    """Mark the connections kept from a previous request as in use again."""
+    _refresh(in_use=True)
+
+
+def request_finished_handler(sender=None, **kwargs):
+    """Mark the connections kept open past the end of the request as idle."""
+    _refresh(in_use=False)
+
+
+def connect_signals():
+    """Connect the connection tracking handlers.
+
+    These run after Django's own close_old_connections handlers, which are connected when django.db is imported,
+    so connections closed for exceeding CONN_MAX_AGE or failing health checks are already gone.
+    """
+    connection_created.connect(connection_created_handler, dispatch_uid="rbac_db_connection_created")
+    request_started.connect(request_started_handler, dispatch_uid="rbac_db_request_started")
+    request_finished.connect(request_finished_handler, dispatch_uid="rbac_db_request_finished")
@@ -426,6 +426,39 @@ except ValueError as e:
 KAFKA_ENABLED = ENVIRONMENT.get_value("KAFKA_ENABLED", default=False)
 MOCK_KAFKA = ENVIRONMENT.get_value("MOCK_KAFKA", default=False)
 
+# Deliver producer messages after commit from a background thread instead of on the request thread.
+KAFKA_PRODUCER_ASYNC_ENABLED = ENVIRONMENT.bool("KAFKA_PRODUCER_ASYNC_ENABLED", default=False)
+KAFKA_PRODUCER_QUEUE_MAX_SIZE = ENVIRONMENT.int("KAFKA_PRODUCER_QUEUE_MAX_SIZE", default=10000)
+KAFKA_PRODUCER_COALESCE_WINDOW_SECONDS = ENVIRONMENT.float("KAFKA_PRODUCER_COALESCE_WINDOW_SECONDS", default=0.5)
+# Time a process exiting waits for the queued messages to be delivered.
+KAFKA_PRODUCER_SHUTDOWN_TIMEOUT_SECONDS = ENVIRONMENT.float("KAFKA_PRODUCER_SHUTDOWN_TIMEOUT_SECONDS", default=10)
+KAFKA_PRODUCER_CONFIG = {
+    "linger_ms": ENVIRONMENT.int("KAFKA_PRODUCER_LINGER_MS", default=0),
+    "batch_size": ENVIRONMENT.int("KAFKA_PRODUCER_BATCH_SIZE", default=16384),
+    "compression_type": ENVIRONMENT.get_value("KAFKA_PRODUCER_COMPRESSION_TYPE", default="") or None,
+}
+
+# Write the audit log entries of a transaction with one bulk insert once it commits, optionally from a background
+# thread for high-volume internal jobs.
+AUDIT_LOG_BATCH_SIZE = ENVIRONMENT.int("AUDIT_LOG_BATCH_SIZE", default=500)
+AUDIT_LOG_OUT_OF_BAND_ENABLED = ENVIRONMENT.bool("AUDIT_LOG_OUT_OF_BAND_ENABLED", default=False)
+AUDIT_LOG_QUEUE_MAX_SIZE = ENVIRONMENT.int("AUDIT_LOG_QUEUE_MAX_SIZE", default=10000)
+AUDIT_LOG_SHUTDOWN_TIMEOUT_SECONDS = ENVIRONMENT.float("AUDIT_LOG_SHUTDOWN_TIMEOUT_SECONDS", default=10)
+# The audit log is partitioned by month: partitions are created this many months ahead, and the ones older than the
+# retention period are dropped (0 keeps every entry).
+AUDIT_LOG_PARTITION_PREMAKE_MONTHS = ENVIRONMENT.int("AUDIT_LOG_PARTITION_PREMAKE_MONTHS", default=3)
+AUDIT_LOG_RETENTION_MONTHS = ENVIRONMENT.int("AUDIT_LOG_RETENTION_MONTHS", default=0)
+
+# Export endpoints stream every row of a list through a server-side cursor, fetching and serializing this many rows at
+# a time.
+EXPORT_CHUNK_SIZE = ENVIRONMENT.int("EXPORT_CHUNK_SIZE", default=2000)
+
+# Paginated lists requested with count=estimated report the row estimate of the query planner ("planner"), counting
+# exactly below PAGINATION_ESTIMATED_COUNT_EXACT_BELOW rows, or an exact count cached in redis ("cached").
+PAGINATION_ESTIMATED_COUNT_STRATEGY = ENVIRONMENT.get_value("PAGINATION_ESTIMATED_COUNT_STRATEGY", default="planner")
+PAGINATION_ESTIMATED_COUNT_EXACT_BELOW = ENVIRONMENT.int("PAGINATION_ESTIMATED_COUNT_EXACT_BELOW", default=1000)
+PAGINATION_COUNT_CACHE_LIFETIME = ENVIRONMENT.int("PAGINATION_COUNT_CACHE_LIFETIME", default=60)
+
 NOTIFICATIONS_ENABLED = ENVIRONMENT.get_value("NOTIFICATIONS_ENABLED", default=False)
 NOTIFICATIONS_RH_ENABLED = ENVIRONMENT.get_value("NOTIFICATIONS_RH_ENABLED", default=False)
 NOTIFICATIONS_TOPIC = ENVIRONMENT.get_value("NOTIFICATIONS_TOPIC", default=None)
@@ -510,6 +543,12 @@ if ENVIRONMENT.bool("CLOWDER_ENABLED", default=False) and ENVIRONMENT.bool("USE_
 else:
     BOP_CLIENT_CERT_PATH = os.path.join(BASE_DIR, "management", "principal", "certs", "client.pem")
 
+# Pooled HTTP sessions to BOP, IT and the JWKS endpoints.
+PRINCIPAL_PROXY_SERVICE_TIMEOUT_SECONDS = ENVIRONMENT.int("PRINCIPAL_PROXY_SERVICE_TIMEOUT_SECONDS", default=10)
+HTTP_POOL_MAXSIZE = ENVIRONMENT.int("HTTP_POOL_MAXSIZE", default=10)
+HTTP_RETRY_TOTAL = ENVIRONMENT.int("HTTP_RETRY_TOTAL", default=2)
+HTTP_RETRY_BACKOFF_FACTOR = ENVIRONMENT.float("HTTP_RETRY_BACKOFF_FACTOR", default=0.2)
+
 # IT settings for the service accounts fetching.
 IT_BYPASS_PERMISSIONS_MODIFY_SERVICE_ACCOUNTS = ENVIRONMENT.bool(
     "IT_BYPASS_PERMISSIONS_MODIFY_SERVICE_ACCOUNTS", default=False
@@ -529,6 +568,7 @@ PRINCIPAL_USER_DOMAIN = ENVIRONMENT.get_value("PRINCIPAL_USER_DOMAIN", default="
 PRINCIPAL_CLEANUP_DELETION_ENABLED_UMB = ENVIRONMENT.bool("PRINCIPAL_CLEANUP_DELETION_ENABLED_UMB", default=False)
 PRINCIPAL_CLEANUP_UPDATE_ENABLED_UMB = ENVIRONMENT.bool("PRINCIPAL_CLEANUP_UPDATE_ENABLED_UMB", default=False)
 UMB_JOB_ENABLED = ENVIRONMENT.bool("UMB_JOB_ENABLED", default=True)
+UMB_BATCH_SIZE = ENVIRONMENT.int("UMB_BATCH_SIZE", default=1)
 UMB_HOST = ENVIRONMENT.get_value("UMB_HOST", default="localhost")
 UMB_PORT = ENVIRONMENT.get_value("UMB_PORT", default="61612")
 # Service account name
@@ -567,6 +607,10 @@ INVENTORY_API_TOKEN_URL = ENVIRONMENT.get_value(
 )
 INVENTORY_API_LOCAL = ENVIRONMENT.bool("INVENTORY_API_LOCAL", default=True)
 INVENTORY_API_SERVER = ENVIRONMENT.get_value("INVENTORY_API_SERVER", default="localhost:9000")
+# Consistency checks against inventory use the CheckBulk RPC when enabled, otherwise individual Check calls
+# run concurrently on one channel.
+INVENTORY_CHECK_BULK_ENABLED = ENVIRONMENT.bool("INVENTORY_CHECK_BULK_ENABLED", default=False)
+INVENTORY_CHECK_CONCURRENCY = ENVIRONMENT.int("INVENTORY_CHECK_CONCURRENCY", default=10)
 KESSEL_INVENTORY_CLOWDER_APPLICATION_NAME = "kessel-inventory"
 INVENTORY_API_PORT = 9000
 if CLOWDER_ENABLED:
@@ -637,3 +681,6 @@ SYSTEM_USERS = ENVIRONMENT.json("SYSTEM_USERS", default={})
 
 # Principal caching settings
 PRINCIPAL_CACHE_LIFETIME = ENVIRONMENT.int("PRINCIPAL_CACHE_LIFETIME", default=3600)
+# Maximum staleness of BOP principal profiles looked up by user_id; 0 disables the cache.
+PRINCIPAL_PROFILE_CACHE_LIFETIME = ENVIRONMENT.int("PRINCIPAL_PROFILE_CACHE_LIFETIME", default=300)
+PRINCIPAL_PROFILE_NEGATIVE_CACHE_LIFETIME = ENVIRONMENT.int("PRINCIPAL_PROFILE_NEGATIVE_CACHE_LIFETIME", default=60)
@@ -21,13 +21,20 @@ from unittest.mock import Mock, patch
 from urllib.parse import parse_qs, urlparse
 
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
 
-from api.common.pagination import PATH_INFO, StandardResultsSetPagination, V2CursorPagination, V2ResultsSetPagination
+from api.common.pagination import (
+    PATH_INFO,
+    OptInKeysetResultsSetPagination,
+    StandardResultsSetPagination,
+    V2CursorPagination,
+    V2ResultsSetPagination,
+    estimate_count,
+)
 
 
 class PaginationTest(TestCase):
@@ -157,6 +164,156 @@ class V2ResultsSetPaginationTest(TestCase):
         self.assertEqual(self.paginator.max_limit, None)
 
 
+class EstimatedCountTest(TestCase):
+    """Tests against the estimated count of StandardResultsSetPagination."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.paginator = StandardResultsSetPagination()
+        for i in range(15):
+            User.objects.create(username=f"estimate_user_{i}")
+        self.queryset = User.objects.filter(username__startswith="estimate_user_").order_by("username")
+
+    def paginate(self, query):
+        """Paginate the users and return the page and the paginated response data."""
+        request = Request(self.factory.get(f"/api/rbac/v1/users/?{query}"))
+        page = self.paginator.paginate_queryset(self.queryset, request)
+        return page, self.paginator.get_paginated_response([]).data
+
+    def test_exact_count_by_default(self):
+        """Test that lists are counted exactly unless an estimate is requested."""
+        with patch("api.common.pagination.estimate_count") as estimate_count:
+            page, data = self.paginate("limit=5")
+
+        estimate_count.assert_not_called()
+        self.assertEqual(len(page), 5)
+        self.assertEqual(data["meta"]["count"], 15)
+
+    def test_planner_estimate_below_threshold_is_exact(self):
+        """Test that small planner estimates are replaced by an exact count."""
+        with patch("django.db.models.QuerySet.explain", return_value='[{"Plan": {"Plan Rows": 400}}]'):
+            page, data = self.paginate("limit=20&count=estimated")
+
+        self.assertTrue(self.paginator.count_estimated)
+        self.assertEqual(len(page), 15)
+        self.assertEqual(data["meta"]["count"], 15)
+
+    @override_settings(PAGINATION_ESTIMATED_COUNT_EXACT_BELOW=0)
+    def test_planner_estimate_fits_the_rows_found(self):
+        """Test that a planner estimate is raised or lowered to the rows found around the page."""
+        with patch("django.db.models.QuerySet.explain", return_value='{"Plan": {"Plan Rows": 3}}'):
+            page, data = self.paginate("limit=5&count=estimated")
+        self.assertEqual(len(page), 5)
+        self.assertEqual(data["meta"]["count"], 6)
+        self.assertIsNotNone(data["links"]["next"])
+
+        with patch("django.db.models.QuerySet.explain", return_value='{"Plan": {"Plan Rows": 3}}'):
+            page, data = self.paginate("limit=5&offset=10&count=estimated")
+        self.assertEqual([user.username for user in page], [f"estimate_user_{i}" for i in (5, 6, 7, 8, 9)])
+        self.assertEqual(data["meta"]["count"], 15)
+        self.assertIsNone(data["links"]["next"])
+
+        with patch("django.db.models.QuerySet.explain", return_value='{"Plan": {"Plan Rows": 5000}}'):
+            page, data = self.paginate("limit=5&offset=100&count=estimated")
+        self.assertEqual(page, [])
+        self.assertEqual(data["meta"]["count"], 100)
+
+    @override_settings(PAGINATION_ESTIMATED_COUNT_EXACT_BELOW=0)
+    def test_planner_estimate_from_the_database(self):
+        """Test that the planner strategy reads the estimate from the plan the database returns."""
+        estimate = estimate_count(self.queryset)
+        self.assertIsInstance(estimate, int)
+
+        page, data = self.paginate("limit=5&count=estimated")
+        self.assertTrue(self.paginator.count_estimated)
+        self.assertEqual(len(page), 5)
+        self.assertGreaterEqual(data["meta"]["count"], 6)
+
+    @override_settings(PAGINATION_ESTIMATED_COUNT_STRATEGY="cached")
+    @patch("api.common.pagination.ListCountCache.save_count")
+    @patch("api.common.pagination.ListCountCache.get_count")
+    def test_cached_count(self, get_count, save_count):
+        """Test that the cached strategy counts exactly on a cache miss and reuses the cached count."""
+        get_count.return_value = None
+        _, data = self.paginate("limit=5&count=estimated")
+        self.assertEqual(data["meta"]["count"], 15)
+        save_count.assert_called_once_with(get_count.call_args.args[0], 15)
+
+        get_count.return_value = 40
+        _, data = self.paginate("limit=5&count=estimated")
+        self.assertEqual(data["meta"]["count"], 40)
+        self.assertEqual(save_count.call_count, 1)
+
+    def test_lists_are_counted_exactly(self):
+        """Test that lists that are not querysets are counted exactly."""
+        request = Request(self.factory.get("/api/rbac/v1/users/?count=estimated"))
+        self.paginator.paginate_queryset(list(range(15)), request)
+
+        self.assertFalse(self.paginator.count_estimated)
+        self.assertEqual(self.paginator.count, 15)
+
+
+class OptInKeysetResultsSetPaginationTest(TestCase):
+    """Tests against the OptInKeysetResultsSetPagination functions."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = Mock(keyset_ordering_fields=("username", "date_joined"))
+        joined = timezone.now()
+        for i in range(7):
+            User.objects.create(username=f"keyset_user_{i}", date_joined=joined - timedelta(days=i // 2))
+        self.queryset = User.objects.filter(username__startswith="keyset_user_")
+
+    def paginate(self, url, ordering):
+        """Paginate the users in the given ordering and return the usernames and the paginated response data."""
+        paginator = OptInKeysetResultsSetPagination()
+        page = paginator.paginate_queryset(
+            self.queryset.order_by(*ordering), Request(self.factory.get(url)), self.view
+        )
+        return [user.username for user in page], paginator.get_paginated_response([]).data
+
+    def walk(self, url, ordering):
+        """Follow the next links from the url and return the usernames of every page."""
+        usernames = []
+        while url:
+            page, data = self.paginate(url, ordering)
+            usernames.append(page)
+            url = data["links"]["next"]
+        return usernames
+
+    def test_keyset_is_opt_in(self):
+        """Test that requests without a cursor keep using limit and offset."""
+        _, data = self.paginate("/api/rbac/v1/users/?limit=3", ("username",))
+
+        self.assertEqual(data["meta"], {"count": 7, "limit": 3, "offset": 0})
+        self.assertIn("offset=3", data["links"]["next"])
+
+    def test_keyset_walks_the_ordering(self):
+        """Test that an empty cursor walks the list with cursors, in the order offsets would."""
+        ordering = ("-date_joined", "username")
+        expected = [user.username for user in self.queryset.order_by(*ordering)]
+
+        pages = self.walk("/api/rbac/v1/users/?limit=3&cursor=", ordering)
+        self.assertEqual(pages, [expected[0:3], expected[3:6], expected[6:]])
+
+        page, data = self.paginate("/api/rbac/v1/users/?limit=3&cursor=", ordering)
+        self.assertEqual(data["meta"], {"count": 7, "limit": 3, "offset": 0})
+        self.assertIn("cursor=&", data["links"]["first"])
+        self.assertNotIn("offset", data["links"]["next"])
+
+        page, data = self.paginate(data["links"]["last"], ordering)
+        self.assertEqual(page, expected[4:])
+        page, _ = self.paginate(data["links"]["previous"], ordering)
+        self.assertEqual(page, expected[1:4])
+
+    def test_keyset_falls_back_to_offset(self):
+        """Test that lists ordered by columns outside the keyset fields keep using limit and offset."""
+        _, data = self.paginate("/api/rbac/v1/users/?limit=3&cursor=", ("email",))
+
+        self.assertEqual(data["meta"]["offset"], 0)
+        self.assertIn("offset=3", data["links"]["next"])
+
+
 class V2CursorPaginationTest(TestCase):
     """Tests against the V2CursorPagination functions."""
 
@@ -23,6 +23,7 @@ from django.urls import reverse
 from django.utils import timezone
 from management.models import Role, Principal
 from management.notifications.notification_handlers import EVENT_TYPE_RH_TAM_REQUEST_CREATED
+from management.relation_replicator.relation_replicator import ReplicationEventType
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -252,5 +253,53 @@ class CrossAccountRequestUtilTests(CrossAccountRequestTest):
             f"Expected 2 cross account binding, found {len(cross_account_bindings)}",
         )
 
+    @patch("management.relation_replicator.outbox_replicator.OutboxReplicator.replicate")
+    def test_expiry_replicates_once_per_target_org(self, replicate):
+        """Test that requests due are expired together, with one replication event per target org."""
+        replicate.side_effect = self.replicator.replicate
+
+        farmer = self.fixture.new_system_role("Farmer", ["farm:soil:rake"])
+        fisher = self.fixture.new_system_role("Fisher", ["stream:fish:catch"])
+        self.add_roles_to_request(self.request_4, [farmer, fisher])
+        self.approve_request(self.request_4)
+
+        same_org_request = CrossAccountRequest.objects.create(
+            target_account=self.request_4.target_account,
+            target_org=self.request_4.target_org,
+            user_id="1111111",
+            end_date=self.request_4.end_date,
+            status="pending",
+        )
+        self.add_roles_to_request(same_org_request, [fisher])
+        self.approve_request(same_org_request)
+
+        later_request = CrossAccountRequest.objects.create(
+            target_account=self.request_4.target_account,
+            target_org=self.request_4.target_org,
+            user_id="2222222",
+            end_date=self.request_4.end_date + timedelta(days=10),
+            status="approved",
+        )
+
+        replicate.reset_mock()
+        after_expiration = self.request_4.end_date + timedelta(seconds=1)
+        with patch("django.utils.timezone.now", return_value=after_expiration):
+            util.check_cross_request_expiry()
+
+        self.assertFalse(
+            CrossAccountRequest.objects.filter(
+                status__in=["pending", "approved"], end_date__lt=after_expiration
+            ).exists()
+        )
+        later_request.refresh_from_db()
+        self.assertEqual(later_request.status, "approved")
+
+        events = [call.args[0] for call in replicate.call_args_list]
+        org_events = [event for event in events if event.event_info["org_id"] == self.request_4.target_org]
+        self.assertEqual(len(org_events), 1)
+        self.assertIn(str(self.request_4.pk), org_events[0].event_info["request_ids"])
+        self.assertIn(str(same_org_request.pk), org_events[0].event_info["request_ids"])
+        self.assertTrue(all(event.event_type == ReplicationEventType.EXPIRE_CROSS_ACCOUNT_REQUEST for event in events))
+
     def tearDown(self):
         """Tear down cross account request model tests."""
@@ -299,6 +299,15 @@ class CrossAccountRequestViewTests(CrossAccountRequestTest):
         self.assertEqual(response.data.get("target_account"), self.account)
         self.assertEqual(len(response.data.get("roles")), 2)
 
+    @patch("management.principal.proxy.PrincipalProxy.request_principal_profiles", return_value={})
+    def test_retrieve_request_query_by_account_not_found_if_requester_unknown(self, mock_request):
+        """Test retrieve of cross account request returns 404 when the requester's profile cannot be found."""
+        client = APIClient()
+        response = client.get(f"{URL_LIST}{self.request_1.request_id}/", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        mock_request.assert_called_once_with([self.request_1.user_id])
+
     def test_retrieve_request_query_by_account_fail_if_request_in_another_account(self):
         """Test retrieve cross account request based on account number of identity would fail for non org admin."""
         client = APIClient()
@@ -958,7 +967,7 @@ class CrossAccountRequestViewTests(CrossAccountRequestTest):
                     "first_name": "user",
                     "last_name": "test",
                     "account_number": "567890",
-                    "user_id": "1111111",
+                    "user_id": "2222222",
                 }
             ],
         },
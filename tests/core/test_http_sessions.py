@@ -0,0 +1,95 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the pooled upstream HTTP sessions."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.http_sessions import _reset_sessions, http_requests_total, upstream_session
+from django.test import SimpleTestCase, override_settings
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer with the next queued status code, keeping the connection alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Reply to a GET request."""
+        self.server.requests += 1
+        status_code = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status_code)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        """Keep the test output quiet."""
+
+
+@override_settings(HTTP_POOL_MAXSIZE=2, HTTP_RETRY_TOTAL=2, HTTP_RETRY_BACKOFF_FACTOR=0)
+class UpstreamSessionTests(SimpleTestCase):
+    """Tests for upstream_session."""
+
+    def setUp(self):
+        """Start a stub upstream server."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.requests = 0
+        self.server.statuses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        _reset_sessions()
+        self.addCleanup(_reset_sessions)
+
+    def requests_count(self, connection):
+        """Return the number of requests sent to the stub upstream over new or reused connections."""
+        return http_requests_total.labels(upstream="stub", connection=connection)._value.get()
+
+    def test_connections_are_reused(self):
+        """Test that consecutive requests share one kept-alive connection."""
+        session = upstream_session("stub", timeout=5)
+        new, reused = self.requests_count("new"), self.requests_count("reused")
+
+        for _ in range(3):
+            self.assertEqual(session.get(self.url).status_code, 200)
+
+        self.assertIs(upstream_session("stub", timeout=5), session)
+        self.assertEqual(self.requests_count("new"), new + 1)
+        self.assertEqual(self.requests_count("reused"), reused + 2)
+
+    def test_gateway_errors_are_retried(self):
+        """Test that idempotent requests are retried on gateway errors and return the last response."""
+        session = upstream_session("stub", timeout=5)
+
+        self.server.statuses = [503, 200]
+        self.assertEqual(session.get(self.url).status_code, 200)
+        self.assertEqual(self.server.requests, 2)
+
+        self.server.statuses = [503, 503, 503]
+        self.assertEqual(session.get(self.url).status_code, 503)
+        self.assertEqual(self.server.requests, 5)
+
+    def test_forked_process_gets_new_session(self):
+        """Test that sessions inherited from a parent process are not used after a fork."""
+        session = upstream_session("stub", timeout=5)
+
+        _reset_sessions()
+
+        self.assertIsNot(upstream_session("stub", timeout=5), session)
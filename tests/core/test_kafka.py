@@ -1,8 +1,10 @@
+import os
+import threading
 from copy import deepcopy
 from unittest.mock import Mock, MagicMock, patch, DEFAULT
 from django.test import TestCase
 from kafka.errors import KafkaError
-from core.kafka import RBACProducer, logger
+from core.kafka import KafkaDeliveryQueue, RBACProducer, logger
 from django.test.utils import override_settings
 
 
@@ -83,3 +85,67 @@ class KafkaTests(TestCase):
             MockKafkaProducer.get_producer.side_effect = mock_logger.info("Kafka producer initialized successfully")
 
         mock_logger.info.assert_any_call("Kafka producer initialized successfully")
+
+
+class KafkaDeliveryQueueTests(TestCase):
+    """Tests for the background delivery queue."""
+
+    def test_coalesces_duplicate_messages_in_window(self):
+        """Test that messages with the same coalesce key in one batch are delivered once."""
+        delivery_queue = KafkaDeliveryQueue(max_size=10, coalesce_window_seconds=0.2)
+        producer = Mock()
+        delivered = threading.Event()
+        producer.deliver.side_effect = lambda *args: delivered.set() if producer.deliver.call_count == 2 else None
+
+        delivery_queue.put(producer, "topic", b"a", coalesce_key="a")
+        delivery_queue.put(producer, "topic", b"a", coalesce_key="a")
+        delivery_queue.put(producer, "topic", b"b", coalesce_key="b")
+
+        self.assertTrue(delivered.wait(timeout=5))
+        self.assertEqual(
+            [c.args for c in producer.deliver.call_args_list], [("topic", b"a", None), ("topic", b"b", None)]
+        )
+
+    def test_drops_messages_when_full(self):
+        """Test that a full queue drops messages instead of blocking the caller."""
+        delivery_queue = KafkaDeliveryQueue(max_size=1, coalesce_window_seconds=0)
+        with patch.object(delivery_queue, "_ensure_worker"):
+            delivery_queue.put(Mock(), "topic", b"a")
+            delivery_queue.put(Mock(), "topic", b"b")
+        self.assertEqual(delivery_queue._queue.qsize(), 1)
+
+    def test_drain_delivers_queued_messages_and_flushes(self):
+        """Test that draining waits for the queued messages and flushes the producers they were handed to."""
+        delivery_queue = KafkaDeliveryQueue(max_size=10, coalesce_window_seconds=0.2)
+        producer = Mock()
+
+        delivery_queue.put(producer, "topic", b"a")
+        delivery_queue.put(producer, "topic", b"b")
+        delivery_queue.drain(timeout=5)
+
+        self.assertEqual(producer.deliver.call_count, 2)
+        producer.get_producer.return_value.flush.assert_called_once()
+        self.assertEqual(delivery_queue._queue.unfinished_tasks, 0)
+
+    def test_drain_gives_up_after_timeout(self):
+        """Test that draining a queue whose messages are not delivered returns after the timeout."""
+        delivery_queue = KafkaDeliveryQueue(max_size=10, coalesce_window_seconds=0)
+        with patch.object(delivery_queue, "_ensure_worker"):
+            delivery_queue.put(Mock(), "topic", b"a")
+        delivery_queue._pid = os.getpid()
+
+        with patch("core.kafka.logger") as logger:
+            delivery_queue.drain(timeout=0.1)
+        logger.error.assert_called_once()
+
+    @override_settings(KAFKA_PRODUCER_ASYNC_ENABLED=True)
+    @patch("core.kafka._delivery_queue")
+    def test_async_send_waits_for_commit(self, delivery_queue):
+        """Test that async sends are only queued once the transaction commits."""
+        producer = RBACProducer()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            producer.send_kafka_message("topic", {"key": "value"}, coalesce_key="key")
+        delivery_queue.assert_not_called()
+
+        callbacks[0]()
+        delivery_queue.return_value.put.assert_called_once_with(producer, "topic", b'{"key": "value"}', None, "key")
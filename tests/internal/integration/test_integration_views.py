@@ -26,6 +26,15 @@ from management.models import Group, Policy, Principal, Role
 from tests.identity_request import IdentityRequest
 
 
+def _bop_returning(principals):
+    """Mimic BOP returning the details of only the requested principals."""
+
+    def request_filtered_principals(usernames, **kwargs):
+        return {"status_code": 200, "data": [p for p in principals if p["username"] in usernames]}
+
+    return request_filtered_principals
+
+
 class IntegrationViewsTests(IdentityRequest):
     """Test the integration views."""
 
@@ -476,9 +485,8 @@ class IntegrationViewsTests(IdentityRequest):
 
     @patch(
         "management.principal.proxy.PrincipalProxy.request_filtered_principals",
-        return_value={
-            "status_code": 200,
-            "data": [
+        side_effect=_bop_returning(
+            [
                 {
                     "org_id": "100001",
                     "is_org_admin": False,
@@ -497,8 +505,8 @@ class IntegrationViewsTests(IdentityRequest):
                     "account_number": "1111111",
                     "is_active": True,
                 },
-            ],
-        },
+            ]
+        ),
     )
     def test_principals_for_group_offset_limit(self, mock_request):
         """Test that a valid request to /tenant/<id>/groups/<uuid>/principals/ returns principals in group with offset & limit set."""
@@ -810,11 +810,14 @@ class InternalViewsetTests(BaseInternalViewsetTests):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
         Permission.objects.create(permission="rbac:roles:write", tenant=self.tenant)
-        response = self.client.delete(
-            "/_private/api/utils/permission/?permission=rbac:roles:write",
-            **self.request.META,
-        )
+        with patch("management.role.definer.PermissionCatalogCache.bump_generation") as bump_generation:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(
+                    "/_private/api/utils/permission/?permission=rbac:roles:write",
+                    **self.request.META,
+                )
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        bump_generation.assert_called_once_with()
 
     @override_settings(INTERNAL_DESTRUCTIVE_API_OK_UNTIL=valid_destructive_time())
     @patch("management.relation_replicator.outbox_replicator.OutboxReplicator.replicate")
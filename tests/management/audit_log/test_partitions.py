@@ -0,0 +1,104 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the maintenance of the audit log partitions."""
+
+import datetime
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from management.audit_log import partitions
+from management.models import AuditLog
+
+from api.models import Tenant
+
+UTC = datetime.timezone.utc
+
+
+class AuditLogPartitionsTests(TestCase):
+    """Test creating and dropping the monthly audit log partitions."""
+
+    def setUp(self):
+        """Set up the audit log partition tests."""
+        self.tenant = Tenant.objects.create(tenant_name="acct1111111", org_id="1111111")
+
+    def entry(self, created):
+        """Create an audit log entry at the given time."""
+        return AuditLog.objects.create(
+            principal_username="test_user",
+            resource_type=AuditLog.GROUP,
+            description=f"Created at {created}",
+            action=AuditLog.ADD,
+            tenant=self.tenant,
+            created=created,
+        )
+
+    def partition_of(self, entry):
+        """Return the partition holding the given entry."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT tableoid::regclass::text FROM management_auditlog WHERE id = %s", [entry.id])
+            return cursor.fetchone()[0]
+
+    def test_month_start(self):
+        """Test moving to the start of a month across years."""
+        value = datetime.datetime(2001, 1, 31, 23, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-2)))
+
+        self.assertEqual(partitions.month_start(value), datetime.datetime(2001, 2, 1, tzinfo=UTC))
+        self.assertEqual(partitions.month_start(value, -2), datetime.datetime(2000, 12, 1, tzinfo=UTC))
+        self.assertEqual(partitions.month_start(value, 11), datetime.datetime(2002, 1, 1, tzinfo=UTC))
+
+    def test_entries_are_stored_in_their_month(self):
+        """Test that entries go to the current month's partition, created by the migration."""
+        entry = self.entry(datetime.datetime.now(UTC))
+
+        self.assertEqual(self.partition_of(entry), partitions.partition_name(partitions.month_start(entry.created)))
+
+    @patch("management.audit_log.partitions.timezone.now")
+    def test_ensure_partitions_moves_default_entries(self, now):
+        """Test that missing partitions are created and take over their entries from the default partition."""
+        now.return_value = datetime.datetime(2001, 5, 15, tzinfo=UTC)
+        entry = self.entry(datetime.datetime(2001, 6, 3, tzinfo=UTC))
+        self.assertEqual(self.partition_of(entry), partitions.DEFAULT_PARTITION_NAME)
+
+        created = partitions.ensure_partitions(months_ahead=2)
+
+        self.assertEqual(
+            created, ["management_auditlog_p2001_05", "management_auditlog_p2001_06", "management_auditlog_p2001_07"]
+        )
+        self.assertEqual(self.partition_of(entry), "management_auditlog_p2001_06")
+        self.assertEqual(partitions.ensure_partitions(months_ahead=2), [])
+
+    @patch("management.audit_log.partitions.timezone.now")
+    def test_drop_expired_partitions(self, now):
+        """Test that partitions older than the retention period are dropped, along with expired default entries."""
+        for month in (1, 2, 3):
+            partitions.create_partition(datetime.datetime(2001, month, 1, tzinfo=UTC))
+        expired = self.entry(datetime.datetime(2001, 1, 20, tzinfo=UTC))
+        kept = self.entry(datetime.datetime(2001, 2, 20, tzinfo=UTC))
+        expired_default = self.entry(datetime.datetime(2000, 12, 20, tzinfo=UTC))
+        now.return_value = datetime.datetime(2001, 4, 10, tzinfo=UTC)
+        with connection.cursor() as cursor:
+            # A table cannot be dropped while the deferred foreign key checks of its rows are pending.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        self.assertEqual(partitions.drop_expired_partitions(retention_months=0), [])
+        dropped = partitions.drop_expired_partitions(retention_months=2)
+
+        self.assertEqual(dropped, ["management_auditlog_p2001_01"])
+        self.assertNotIn(datetime.datetime(2001, 1, 1, tzinfo=UTC), partitions.existing_partitions())
+        self.assertFalse(AuditLog.objects.filter(id__in=[expired.id, expired_default.id]).exists())
+        self.assertTrue(AuditLog.objects.filter(id=kept.id).exists())
@@ -0,0 +1,152 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the batched audit log writer."""
+
+import os
+from unittest.mock import patch
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from management.audit_log import sink
+from management.models import AuditLog
+from prometheus_client import REGISTRY
+
+from api.models import Tenant
+
+
+class AuditLogSinkTests(TestCase):
+    """Test recording audit log entries."""
+
+    def setUp(self):
+        """Set up the audit log sink tests."""
+        self.tenant = Tenant.objects.create(tenant_name="acct1111111", org_id="1111111")
+
+    def entry(self, description):
+        """Return an unsaved audit log entry."""
+        return AuditLog(
+            principal_username="test_user",
+            resource_type=AuditLog.GROUP,
+            description=description,
+            action=AuditLog.ADD,
+            tenant=self.tenant,
+        )
+
+    def descriptions(self):
+        """Return the descriptions of the written entries."""
+        return list(AuditLog.objects.filter(tenant=self.tenant).order_by("id").values_list("description", flat=True))
+
+    def test_entries_are_written_together_on_commit(self):
+        """Test that the entries of a transaction are written with a single insert once it commits."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                for i in range(3):
+                    sink.record(self.entry(f"entry {i}"))
+            self.assertEqual(self.descriptions(), [])
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(self.descriptions(), ["entry 0", "entry 1", "entry 2"])
+        self.assertEqual(len([query for query in queries if query["sql"].startswith("INSERT")]), 1)
+
+    def test_entries_after_an_early_flush_start_a_new_batch(self):
+        """Test that entries recorded after their batch was run early are written by a batch of their own."""
+        with self.captureOnCommitCallbacks(execute=True):
+            sink.record(self.entry("first"))
+        with self.captureOnCommitCallbacks(execute=True):
+            sink.record(self.entry("second"))
+
+        self.assertEqual(self.descriptions(), ["first", "second"])
+
+    def test_rolled_back_entries_are_discarded(self):
+        """Test that entries recorded in a rolled back savepoint are not written."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                sink.record(self.entry("kept"))
+                try:
+                    with transaction.atomic():
+                        sink.record(self.entry("rolled back"))
+                        raise ValueError()
+                except ValueError:
+                    pass
+
+        self.assertEqual(self.descriptions(), ["kept"])
+
+    def test_buffered_entries_gauge_returns_to_zero(self):
+        """Test that rolled back and failed writes do not leave entries counted as buffered."""
+
+        def buffered():
+            return REGISTRY.get_sample_value("rbac_audit_log_buffered_entries")
+
+        before = buffered()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                sink.record(self.entry("kept"))
+                try:
+                    with transaction.atomic():
+                        sink.record(self.entry("rolled back"))
+                        raise ValueError()
+                except ValueError:
+                    pass
+        self.assertEqual(buffered(), before)
+
+        with patch.object(AuditLog.objects, "bulk_create", side_effect=ValueError()):
+            with self.assertRaises(ValueError):
+                sink.write([self.entry("failed")])
+        self.assertEqual(buffered(), before)
+
+    @override_settings(AUDIT_LOG_OUT_OF_BAND_ENABLED=True, AUDIT_LOG_BATCH_SIZE=10)
+    @patch("management.audit_log.sink._bulk_create")
+    def test_out_of_band_entries_are_written_by_worker(self, bulk_create):
+        """Test that the out-of-band mode hands the committed entries to the background writer."""
+        writer = sink.OutOfBandAuditLogWriter(max_size=100)
+        entries = [self.entry(f"entry {i}") for i in range(3)]
+
+        with patch("management.audit_log.sink._writer", return_value=writer):
+            sink.write(entries)
+            writer.join()
+
+        written = [entry for call in bulk_create.call_args_list for entry in call.args[0]]
+        self.assertEqual(written, entries)
+        self.assertEqual({call.kwargs["mode"] for call in bulk_create.call_args_list}, {"out_of_band"})
+
+    @override_settings(AUDIT_LOG_BATCH_SIZE=10)
+    @patch("management.audit_log.sink._bulk_create")
+    def test_drain_writes_queued_entries(self, bulk_create):
+        """Test that draining waits for the queued entries to be written."""
+        writer = sink.OutOfBandAuditLogWriter(max_size=100)
+        entries = [self.entry(f"entry {i}") for i in range(3)]
+
+        writer.put(entries)
+        writer.drain(timeout=5)
+
+        written = [entry for call in bulk_create.call_args_list for entry in call.args[0]]
+        self.assertEqual(written, entries)
+        self.assertEqual(writer._queue.unfinished_tasks, 0)
+
+    def test_drain_gives_up_after_timeout(self):
+        """Test that draining a queue whose entries are not written returns after the timeout."""
+        writer = sink.OutOfBandAuditLogWriter(max_size=100)
+        with patch.object(writer, "_ensure_worker"):
+            writer.put([self.entry("stuck")])
+        writer._pid = os.getpid()
+
+        with patch("management.audit_log.sink.logger") as logger:
+            writer.drain(timeout=0.1)
+        logger.error.assert_called_once()
@@ -272,3 +272,65 @@ class AuditLogViewTests(IdentityRequest):
         # Should have role logs ordered by created desc
         self.assertEqual(response.data.get("data")[0]["action"], "edit")
         self.assertEqual(response.data.get("data")[1]["action"], "create")
+
+    def test_keyset_pagination(self):
+        """Test walking the audit logs with cursors, with entries created at the same time ordered by id."""
+        self.audit_log5 = AuditLog.objects.create(
+            principal_username="admin",
+            resource_type=AuditLog.USER,
+            resource_id=5,
+            description="Removed user from group",
+            action=AuditLog.REMOVE,
+            tenant=self.tenant,
+            created=self.audit_log2.created,
+        )
+        expected = ["Added user to group", "Edited role test3", "Removed user from group", "Deleted group test2"]
+        expected.append("Created role test1")
+        url = f"{reverse('v1_management:auditlog-list')}?limit=2"
+        client = APIClient()
+
+        descriptions = []
+        pages = []
+        while url:
+            response = client.get(url, **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data.get("meta").get("count"), 5)
+            pages.append(url)
+            descriptions.extend(log["description"] for log in response.data.get("data"))
+            url = response.data.get("links").get("next")
+
+        self.assertEqual(descriptions, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertTrue(all("offset" not in page for page in pages))
+
+        response = client.get(pages[-1], **self.headers)
+        response = client.get(response.data.get("links").get("previous"), **self.headers)
+        self.assertEqual([log["description"] for log in response.data.get("data")], expected[2:4])
+        self.assertIsNone(response.data.get("meta").get("offset"))
+
+        response = client.get(response.data.get("links").get("last"), **self.headers)
+        self.assertEqual([log["description"] for log in response.data.get("data")], expected[3:])
+        self.assertEqual(response.data.get("meta").get("offset"), 3)
+        self.assertIsNone(response.data.get("links").get("next"))
+
+    def test_keyset_pagination_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        url = f"{reverse('v1_management:auditlog-list')}?cursor=not-a-cursor"
+        client = APIClient()
+        response = client.get(url, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_offset_pagination_links(self):
+        """Test that requests passing an offset keep using offset links."""
+        url = reverse("v1_management:auditlog-list")
+        url = f"{url}?limit=2&offset=1"
+        client = APIClient()
+        response = client.get(url, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("meta").get("offset"), 1)
+        self.assertIn("offset=3", response.data.get("links").get("next"))
+        self.assertEqual(
+            [log["description"] for log in response.data.get("data")], ["Edited role test3", "Deleted group test2"]
+        )
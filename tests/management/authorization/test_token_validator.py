@@ -133,7 +133,7 @@ class TokenValidatorTests(IdentityRequest):
             )
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_cache(
         self, import_key_set: mock.Mock, get: mock.Mock, get_jwks_response: mock.Mock
@@ -153,7 +153,7 @@ class TokenValidatorTests(IdentityRequest):
         get.assert_not_called()
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset(
@@ -178,7 +178,7 @@ class TokenValidatorTests(IdentityRequest):
         import_key_set.assert_called_with(self.jwks_certificates_response_json)
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_oidc_network_errors(
@@ -225,7 +225,7 @@ class TokenValidatorTests(IdentityRequest):
                 )
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_oidc_not_ok(
@@ -271,7 +271,7 @@ class TokenValidatorTests(IdentityRequest):
             )
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_oidc_not_jwks_url(
@@ -316,7 +316,7 @@ class TokenValidatorTests(IdentityRequest):
             )
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_oidc_empty_jwks_url(
@@ -361,7 +361,7 @@ class TokenValidatorTests(IdentityRequest):
             )
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_jwks_network_error(
@@ -414,7 +414,7 @@ class TokenValidatorTests(IdentityRequest):
                 )
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_jwks_not_ok(
@@ -459,7 +459,7 @@ class TokenValidatorTests(IdentityRequest):
             )
 
     @mock.patch("management.authorization.jwks_source.JWKSCache.get_jwks_response")
-    @mock.patch("management.authorization.jwks_source.requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("management.authorization.jwks_source.JWKSCache.set_jwks_response")
     @mock.patch("management.authorization.token_validator.KeySet.import_key_set")
     def test_get_json_web_keyset_import_key_set_error(
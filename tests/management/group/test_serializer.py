@@ -24,11 +24,12 @@ from api.models import Tenant
 from management.group.model import Group
 from management.group.serializer import (
     GroupInputSerializer,
+    GroupSerializer,
     _V2_ADMIN_GROUP_DESCRIPTION,
     _V2_GROUP_DESCRIPTION,
     _v2_description_override,
 )
-from management.models import Policy
+from management.models import Policy, Role
 
 _PATCH_IS_V2 = "management.group.serializer.is_v2_edit_enabled_for_request"
 
@@ -196,3 +197,36 @@ class GroupDescriptionOverrideTests(TestCase):
         request = self._make_request()
         serializer = GroupInputSerializer(self.regular_group, context={"request": request})
         self.assertEqual(serializer.data["description"], "A custom group")
+
+
+class GroupSerializerRolesTests(TestCase):
+    """Test the roles and role count of the group serializer."""
+
+    def setUp(self):
+        """Set up a group with two roles."""
+        super().setUp()
+        self.tenant = Tenant.objects.create(
+            tenant_name="acct_group_roles_test", account_id="9990002", org_id="9990002", ready=True
+        )
+        self.group = Group.objects.create(name="Group with roles", tenant=self.tenant)
+        policy = Policy.objects.create(name="Policy for group", tenant=self.tenant, group=self.group)
+        policy.roles.add(
+            Role.objects.create(name="Role A", tenant=self.tenant),
+            Role.objects.create(name="Role B", tenant=self.tenant),
+        )
+
+    def test_role_count_does_not_depend_on_roles_field(self):
+        """The role count is computed even when the roles field was not serialized first."""
+        serializer = GroupSerializer(self.group)
+        self.assertEqual(serializer.get_roleCount(self.group), 2)
+
+    def test_roles_are_fetched_once_per_group(self):
+        """The roles and role count fields share a single lookup of the group's roles."""
+        serializer = GroupSerializer(self.group)
+        with patch.object(Group, "roles_with_access", autospec=True, side_effect=Group.roles_with_access) as lookup:
+            roles = serializer.get_roles(self.group)
+            role_count = serializer.get_roleCount(self.group)
+
+        self.assertEqual(sorted(role["name"] for role in roles), ["Role A", "Role B"])
+        self.assertEqual(role_count, 2)
+        lookup.assert_called_once_with(self.group)
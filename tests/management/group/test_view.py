@@ -23,8 +23,8 @@ from unittest.mock import call, patch, ANY, Mock
 from uuid import uuid4
 
 from django.conf import settings
-from django.db import transaction
-from django.test.utils import override_settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
@@ -134,6 +134,14 @@ def find_relation_in_list(relation_list, relation_tuple):
     )
 
 
+def _bop_principals_for(usernames, **kwargs):
+    """Mimic BOP returning the details of exactly the requested user principals."""
+    return {
+        "status_code": 200,
+        "data": [{"username": username, "is_org_admin": False, "is_active": True} for username in usernames],
+    }
+
+
 @override_settings(ROOT_SCOPE_PERMISSIONS="root:*:*", TENANT_SCOPE_PERMISSIONS="tenant:*:*")
 class GroupViewsetTests(IdentityRequest):
     """Test the group viewset."""
@@ -309,7 +317,8 @@ class GroupViewsetTests(IdentityRequest):
             # create a group
             url = reverse("v1_management:group-list")
             client = APIClient()
-            response = client.post(url, test_data, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(url, test_data, format="json", **self.headers)
             uuid = response.data.get("uuid")
             self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -496,6 +505,67 @@ class GroupViewsetTests(IdentityRequest):
         for key in GroupInputSerializer().fields.keys():
             self.assertIn(key, group.keys())
 
+    def test_read_group_list_query_count_independent_of_page_size(self):
+        """Test that listing groups takes the same number of queries however many groups are on the page."""
+        url = reverse("v1_management:group-list")
+        client = APIClient()
+
+        query_counts = []
+        for batch in range(2):
+            for index in range(4 * batch, 4 * batch + 4):
+                group = Group.objects.create(name=f"counted group {index}", tenant=self.tenant)
+                policy = Policy.objects.create(name=f"counted policy {index}", group=group, tenant=self.tenant)
+                policy.roles.add(self.role)
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(f"{url}?limit=100", **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+        role_counts = {group["name"]: group["roleCount"] for group in response.data.get("data")}
+        self.assertEqual(role_counts["counted group 0"], 1)
+        self.assertEqual(role_counts[self.group.name], self.group.role_count())
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_export_groups_streams_the_list(self):
+        """Test that the group export streams the groups of the list as NDJSON without counting them."""
+        client = APIClient()
+        listed = client.get(f"{reverse('v1_management:group-list')}?limit=1000", **self.headers)
+        response = client.get(f"{reverse('v1_management:group-export')}?order_by=-name", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        with CaptureQueriesContext(connection) as queries:
+            exported = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertFalse([query for query in queries if "COUNT(*)" in query["sql"]])
+        self.assertEqual(
+            [group["name"] for group in exported],
+            sorted((group["name"] for group in listed.data.get("data")), reverse=True),
+        )
+        self.assertEqual(exported[0].keys(), listed.data.get("data")[0].keys())
+
+    def test_group_list_keyset_pagination(self):
+        """Test walking the group list with cursors and an estimated count."""
+        client = APIClient()
+        listed = client.get(f"{reverse('v1_management:group-list')}?limit=1000&order_by=-modified", **self.headers)
+        expected = [group["uuid"] for group in listed.data.get("data")]
+        self.assertGreater(len(expected), 2)
+
+        url = f"{reverse('v1_management:group-list')}?limit=2&order_by=-modified&cursor=&count=estimated"
+        uuids = []
+        while url:
+            response = client.get(url, **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("offset", url)
+            uuids.extend(group["uuid"] for group in response.data.get("data"))
+            url = response.data.get("links").get("next")
+        self.assertEqual(uuids, expected)
+        self.assertEqual(response.data.get("meta").get("count"), len(expected))
+
+        url = f"{reverse('v1_management:group-list')}?limit=2&order_by=principalCount&cursor="
+        response = client.get(url, **self.headers)
+        self.assertIn("offset=2", response.data.get("links").get("next"))
+
     @patch(
         "management.principal.proxy.PrincipalProxy.request_filtered_principals",
         return_value={
@@ -783,7 +853,8 @@ class GroupViewsetTests(IdentityRequest):
 
             url = reverse("v1_management:group-detail", kwargs={"uuid": self.group.uuid})
             client = APIClient()
-            response = client.put(url, test_data, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.put(url, test_data, format="json", **self.headers)
 
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
@@ -887,7 +958,8 @@ class GroupViewsetTests(IdentityRequest):
             request_body = {"roles": [self.role.uuid]}
             client = APIClient()
 
-            response = client.post(url, request_body, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(url, request_body, format="json", **self.headers)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
             default_workspace_id = str(self.default_workspace.id)
@@ -899,7 +971,8 @@ class GroupViewsetTests(IdentityRequest):
             client = APIClient()
             principals_user_ids = self.group.principals.values_list("user_id", flat=True)
             group_uuid = self.group.uuid
-            response = client.delete(url, **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.delete(url, **self.headers)
 
             actual_call_arg = mock_method.call_args[0][0]
             to_remove = actual_call_arg["relations_to_remove"]
@@ -1000,7 +1073,8 @@ class GroupViewsetTests(IdentityRequest):
             url = reverse("v1_management:group-detail", kwargs={"uuid": self.emptyGroup.uuid})
             mock_method.reset_mock()
 
-            response = client.delete(url, **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.delete(url, **self.headers)
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
             mock_method.assert_not_called()
             self.assertEqual(Group.objects.filter(id=self.emptyGroup.id).exists(), False)
@@ -1230,6 +1304,26 @@ class GroupViewsetTests(IdentityRequest):
         self.assertEqual(roles[0].get("name"), self.role.name)
         self.assertEqual(roles[0].get("description"), self.role.description)
 
+    def test_get_group_roles_paginated_in_database(self):
+        """Test that group roles are paged by the database with the full count and per-role policy counts."""
+        for index in range(4):
+            role = Role.objects.create(name=f"paged role {index}", tenant=self.tenant)
+            self.policy.roles.add(role)
+        url = reverse("v1_management:group-roles", kwargs={"uuid": self.group.uuid})
+        client = APIClient()
+
+        with CaptureQueriesContext(connection) as small_page:
+            response = client.get(f"{url}?limit=1&order_by=name", **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("meta").get("count"), 5)
+        self.assertEqual([role["name"] for role in response.data.get("data")], ["paged role 0"])
+        self.assertEqual(response.data.get("data")[0].get("policyCount"), 1)
+
+        with CaptureQueriesContext(connection) as large_page:
+            response = client.get(f"{url}?limit=5&order_by=name", **self.headers)
+        self.assertEqual(len(response.data.get("data")), 5)
+        self.assertEqual(len(small_page.captured_queries), len(large_page.captured_queries))
+
     def test_get_group_roles_with_exclude_false_success(self):
         """Test that getting roles with 'exclude=false' for a group works as default."""
         url = "%s?exclude=FALSE" % (reverse("v1_management:group-roles", kwargs={"uuid": self.group.uuid}))
@@ -2006,7 +2100,8 @@ class GroupViewsetTests(IdentityRequest):
 
             self.assertCountEqual([], list(groupC.roles()))
 
-            response = client.post(url, test_data, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(url, test_data, format="json", **self.headers)
 
             self.assertCountEqual([self.role, self.roleB], list(groupC.roles()))
             self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -2136,7 +2231,8 @@ class GroupViewsetTests(IdentityRequest):
         self.policyB.save()
         self.assertCountEqual([self.role], list(self.group.roles()))
 
-        response = client.delete(url, format="json", **self.headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(url, format="json", **self.headers)
 
         self.assertCountEqual([], list(self.group.roles()))
         self.assertCountEqual([self.role, self.roleB], list(self.groupB.roles()))
@@ -2250,7 +2346,8 @@ class GroupViewsetTests(IdentityRequest):
             self.policy.roles.add(self.roleB)
             self.assertCountEqual([self.role, self.roleB], list(self.group.roles()))
 
-            response = client.delete(url, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.delete(url, format="json", **self.headers)
 
             self.assertCountEqual([], list(self.group.roles()))
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -2625,15 +2722,7 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
         response = client.get(url, **self.headers)
         principals = response.data.get("data")
 
-        mock_request.assert_called_with(
-            [],
-            options={
-                "sort_order": None,
-                "username_only": "false",
-                "principal_type": "user",
-            },
-            org_id=self.customer_data["org_id"],
-        )
+        mock_request.assert_not_called()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(principals), 0)
 
@@ -2695,7 +2784,7 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
         client = APIClient()
         response = client.get(url, **self.headers)
         principals = response.data.get("data")
-        expected_principals = sorted([self.principal.username, self.principalB.username])
+        expected_principals = sorted([self.principal.username, self.principalB.username], reverse=True)
 
         mock_request.assert_called_with(
             expected_principals,
@@ -2723,6 +2812,20 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(principals, None)
 
+    @patch("management.principal.proxy.PrincipalProxy.request_filtered_principals")
+    def test_get_group_user_principals_counts_members_bop_leaves_out(self, mock_request):
+        """Test that members BOP does not return still count, and are left out of their page."""
+        mock_request.return_value = {"status_code": 200, "data": [{"username": self.principal.username}]}
+
+        client = APIClient()
+        url = reverse("v1_management:group-principals", kwargs={"uuid": self.group.uuid})
+
+        response = client.get(url, {"principal_type": "user"}, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("meta").get("count"), 2)
+        self.assertEqual([user["username"] for user in response.data.get("data")], [self.principal.username])
+
     @patch(
         "management.principal.proxy.PrincipalProxy.request_filtered_principals",
         return_value={"status_code": 200, "data": []},
@@ -2772,12 +2875,8 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
             group.principals.add(principal)
         group.save()
 
-        # Set the return value for the mock
-        mock_request.return_value["data"] = [
-            {"username": principals_list[0].username},
-            {"username": principals_list[1].username},
-            {"username": principals_list[2].username},
-        ]
+        # Have the mock return exactly the principals it is asked about
+        mock_request.side_effect = _bop_principals_for
 
         # Test that /groups/{uuid}/principals/ returns correct data with default limit and offset
         url = f"{reverse('v1_management:group-principals', kwargs={'uuid': group.uuid})}"
@@ -2810,6 +2909,11 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
             self.assertEqual(int(response.data.get("meta").get("limit")), limit)
             self.assertEqual(int(response.data.get("meta").get("offset")), offset)
             self.assertEqual(len(response.data.get("data")), expected_data_count)
+            if expected_data_count:
+                self.assertEqual(
+                    mock_request.call_args.args[0],
+                    [principal.username for principal in principals_list][offset : offset + limit],  # noqa: E203
+                )
 
     @override_settings(IT_BYPASS_TOKEN_VALIDATION=True)
     @patch("management.principal.it_service.ITService.request_service_accounts")
@@ -3468,29 +3572,16 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
             )
         sa_mock.return_value = mocked_sa_list
 
-        user_mock.return_value = {
-            "status_code": 200,
-            "data": [
-                {
-                    "org_id": "100001",
-                    "is_org_admin": False,
-                    "is_internal": False,
-                    "id": 52567473,
-                    "username": "test-username",
-                    "account_number": "1111111",
-                    "is_active": True,
-                }
-            ],
-        }
+        user_mock.side_effect = _bop_principals_for
 
         url = f"{reverse('v1_management:group-principals', kwargs={'uuid': self.group.uuid})}?principal_type=all"
         client = APIClient()
         response = client.get(url, **self.headers)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(int(response.data.get("meta").get("count")), 4)
+        self.assertEqual(int(response.data.get("meta").get("count")), 5)
         self.assertEqual(len(response.data.get("data").get("serviceAccounts")), 3)
-        self.assertEqual(len(response.data.get("data").get("users")), 1)
+        self.assertEqual(len(response.data.get("data").get("users")), 2)
 
     @override_settings(IT_BYPASS_TOKEN_VALIDATION=True)
     @patch("management.principal.proxy.PrincipalProxy.request_filtered_principals")
@@ -3520,29 +3611,7 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
             )
         sa_mock.return_value = mocked_sa_list
 
-        user_mock.return_value = {
-            "status_code": 200,
-            "data": [
-                {
-                    "org_id": "100001",
-                    "is_org_admin": False,
-                    "is_internal": False,
-                    "id": 52567473,
-                    "username": "test-username-1",
-                    "account_number": "1111111",
-                    "is_active": True,
-                },
-                {
-                    "org_id": "100001",
-                    "is_org_admin": False,
-                    "is_internal": False,
-                    "id": 52567499,
-                    "username": "test-username-2",
-                    "account_number": "1111111",
-                    "is_active": True,
-                },
-            ],
-        }
+        user_mock.side_effect = _bop_principals_for
 
         client = APIClient()
         limit = 2
@@ -3557,6 +3626,7 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
         self.assertEqual(int(response.data.get("meta").get("count")), 5)
         self.assertEqual(len(response.data.get("data").get("serviceAccounts")), 2)
         self.assertTrue("users" not in response.data.get("data"))
+        user_mock.assert_not_called()
 
         # Page 2: 1 SA + 1 U
         offset = 2
@@ -3980,7 +4050,8 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
                 ]
             }
 
-            response = client.post(url, test_data, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(url, test_data, format="json", **self.headers)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             principal = Principal.objects.get(username=username)
 
@@ -4043,6 +4114,51 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
                 ANY,
             )
 
+    @patch("management.relation_replicator.outbox_replicator.OutboxReplicator._save_replication_event")
+    @patch(
+        "management.principal.proxy.PrincipalProxy.request_filtered_principals",
+        return_value={
+            "status_code": 200,
+            "data": [
+                {"username": "Lazy_User", "user_id": "1001"},
+                {"username": "new_user_a", "user_id": "1002"},
+                {"username": "new_user_b", "user_id": "1003"},
+            ],
+        },
+    )
+    @patch("core.kafka.RBACProducer.send_kafka_message")
+    def test_add_group_principals_in_bulk(self, send_kafka_message, mock_request, mock_method):
+        """Test that adding several principals creates them together and sends a single notification."""
+        with self.settings(NOTIFICATIONS_ENABLED=True):
+            test_group = Group.objects.create(name="test", tenant=self.tenant)
+            lazy_principal = Principal.objects.create(username="lazy_user", tenant=self.tenant)
+
+            url = reverse("v1_management:group-principals", kwargs={"uuid": test_group.uuid})
+            client = APIClient()
+            test_data = {
+                "principals": [{"username": "Lazy_User"}, {"username": "new_user_a"}, {"username": "new_user_b"}]
+            }
+
+            response = client.post(url, test_data, format="json", **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            lazy_principal.refresh_from_db()
+            self.assertEqual(lazy_principal.user_id, "1001")
+            self.assertCountEqual(
+                test_group.principals.values_list("username", "user_id"),
+                [("lazy_user", "1001"), ("new_user_a", "1002"), ("new_user_b", "1003")],
+            )
+
+            notifications = [
+                args[1] for args, _ in send_kafka_message.call_args_list if args[0] == settings.NOTIFICATIONS_TOPIC
+            ]
+            self.assertEqual(len(notifications), 1)
+            self.assertEqual(
+                [event["payload"]["principal"] for event in notifications[0]["events"]],
+                ["Lazy_User", "new_user_a", "new_user_b"],
+            )
+            mock_method.assert_called_once()
+
     @override_settings(IT_BYPASS_TOKEN_VALIDATION=True)
     @patch("management.principal.it_service.ITService.request_service_accounts")
     def test_add_group_principals_service_account(self, sa_mock):
@@ -4201,7 +4317,8 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
             org_id = self.customer_data["org_id"]
 
             url = f"{url}?usernames={test_user.username}"
-            response = client.delete(url, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.delete(url, format="json", **self.headers)
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
             # test whether correctly added to audit logs
@@ -4371,7 +4488,8 @@ class GroupPrincipalViewsetTests(GroupViewsetTests):
         url = (
             f"{reverse('v1_management:group-principals', kwargs={'uuid': self.group.uuid})}?service-accounts={sa_line}"
         )
-        response = client.delete(url, format="json", **self.headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(url, format="json", **self.headers)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
         # test whether correctly added to audit logs
@@ -4615,6 +4733,12 @@ class GroupViewNonAdminTests(IdentityRequest):
         response = client.get(url, **self.headers)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_nonadmin_RonR_export(self):
+        """Test that a nonadmin user cannot export groups in tenant"""
+        client = APIClient()
+        response = client.get(reverse("v1_management:group-export"), **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_nonadmin_RonR_retrieve(self):
         """Test that a nonadmin user can't retrieve group RBAC resources"""
         url = reverse("v1_management:group-detail", kwargs={"uuid": self.group.uuid})
@@ -5916,7 +6040,7 @@ class GroupViewNonAdminTests(IdentityRequest):
 
     @override_settings(IT_BYPASS_TOKEN_VALIDATION=True)
     @patch("management.relation_replicator.outbox_replicator.OutboxReplicator._save_replication_event")
-    @patch("management.principal.it_service.requests.get")
+    @patch("requests.Session.get")
     def test_add_service_account_principal_in_group_with_User_Access_Admin_success(self, mock_request, mock_method):
         """
         Test that non org admin with 'User Access administrator' role can add
@@ -0,0 +1,146 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Tests for the checks made by InventoryApiBaseChecker."""
+
+from unittest.mock import MagicMock, patch
+
+import grpc
+from django.test import SimpleTestCase, override_settings
+from kessel.inventory.v1beta2.allowed_pb2 import Allowed
+from kessel.inventory.v1beta2.check_bulk_response_pb2 import (
+    CheckBulkResponse,
+    CheckBulkResponseItem,
+    CheckBulkResponsePair,
+)
+from kessel.inventory.v1beta2.check_response_pb2 import CheckResponse
+from management.inventory_checker.inventory_api_check import (
+    BootstrappedTenantInventoryChecker,
+    InventoryApiBaseChecker,
+    relation_tuple_to_check_request,
+)
+from migration_tool.utils import create_relationship
+
+INVENTORY_STUB_PATH = "management.inventory_checker.inventory_api_check.inventory_service_pb2_grpc.KesselInventoryServiceStub"  # noqa: E501
+CHANNEL_PATH = "management.inventory_checker.inventory_api_check.create_client_channel_inventory"
+
+
+class UnimplementedError(grpc.RpcError, grpc.Call):
+    """An RPC error as raised by a server that does not implement the method."""
+
+    def code(self):
+        """Return the status code."""
+        return grpc.StatusCode.UNIMPLEMENTED
+
+
+def allowed(value):
+    """Return the Allowed enum value for a boolean."""
+    return Allowed.ALLOWED_TRUE if value else Allowed.ALLOWED_FALSE
+
+
+class InventoryApiBaseCheckerTest(SimpleTestCase):
+    """Tests for the bulk and concurrent checks."""
+
+    def setUp(self):
+        """Set up check requests for five workspaces, of which the third has no parent relation."""
+        self.checks = [
+            relation_tuple_to_check_request(
+                create_relationship(("rbac", "workspace"), f"ws-{i}", ("rbac", "workspace"), "root", "parent")
+            )
+            for i in range(5)
+        ]
+        self.existing = {"ws-0", "ws-1", "ws-3", "ws-4"}
+        self.stub = MagicMock()
+        self.stub.Check.side_effect = lambda request: CheckResponse(
+            allowed=allowed(request.object.resource_id in self.existing)
+        )
+        self.stub.CheckBulk.side_effect = lambda request: CheckBulkResponse(
+            pairs=[
+                CheckBulkResponsePair(
+                    request=item,
+                    item=CheckBulkResponseItem(allowed=allowed(item.object.resource_id in self.existing)),
+                )
+                for item in request.items
+            ]
+        )
+        self.checker = InventoryApiBaseChecker()
+
+        channel_patcher = patch(CHANNEL_PATH)
+        channel_patcher.start().return_value.__enter__.return_value = MagicMock()
+        self.addCleanup(channel_patcher.stop)
+        stub_patcher = patch(INVENTORY_STUB_PATH, return_value=self.stub)
+        stub_patcher.start()
+        self.addCleanup(stub_patcher.stop)
+
+    @override_settings(INVENTORY_CHECK_BULK_ENABLED=False, INVENTORY_CHECK_CONCURRENCY=3)
+    def test_concurrent_checks_return_results_in_request_order(self):
+        """Test that concurrent Check calls return a result per relation in the order of the requests."""
+        results = self.checker.check_inventory_results(self.checks)
+
+        self.assertEqual(results, [True, True, False, True, True])
+        self.assertEqual(self.stub.Check.call_count, 5)
+        self.stub.CheckBulk.assert_not_called()
+
+    @override_settings(INVENTORY_CHECK_BULK_ENABLED=True)
+    def test_bulk_checks_return_results_in_request_order(self):
+        """Test that a single CheckBulk call returns a result per relation in the order of the requests."""
+        results = self.checker.check_inventory_results(self.checks)
+
+        self.assertEqual(results, [True, True, False, True, True])
+        self.stub.CheckBulk.assert_called_once()
+        self.stub.Check.assert_not_called()
+
+    @override_settings(INVENTORY_CHECK_BULK_ENABLED=True)
+    @patch("management.inventory_checker.inventory_api_check.CHECK_BULK_MAX_ITEMS", 3)
+    def test_bulk_checks_stop_on_denial(self):
+        """Test that the remaining chunks are not checked once a relation is found missing."""
+        results = self.checker.check_inventory_results(self.checks, stop_on_denial=True)
+
+        self.assertEqual(results, [True, True, False, None, None])
+        self.stub.CheckBulk.assert_called_once()
+        self.assertFalse(self.checker.check_inventory_core(self.checks))
+
+    @override_settings(INVENTORY_CHECK_BULK_ENABLED=True)
+    def test_bulk_checks_fall_back_when_unimplemented(self):
+        """Test that individual checks are used when inventory does not implement CheckBulk."""
+        self.stub.CheckBulk.side_effect = UnimplementedError()
+
+        results = self.checker.check_inventory_results(self.checks)
+
+        self.assertEqual(results, [True, True, False, True, True])
+        self.assertEqual(self.stub.Check.call_count, 5)
+
+    @override_settings(INVENTORY_CHECK_BULK_ENABLED=False)
+    def test_bootstrapped_tenant_checks_each_relation_once(self):
+        """Test that the bootstrapped tenant check reports each relation from a single round of checks."""
+        self.existing = {"default-ws"}
+        mapping = {
+            "org_id": "12345",
+            "root_workspace": "root-ws",
+            "default_workspace": "default-ws",
+            "tenant_mapping": {
+                "default_group_uuid": "default-group",
+                "default_admin_group_uuid": "admin-group",
+                "default_role_binding_uuid": "default-binding",
+                "default_admin_role_binding_uuid": "admin-binding",
+            },
+        }
+
+        correct, check_list = BootstrappedTenantInventoryChecker().check_bootstrapped_tenants(mapping)
+
+        self.assertFalse(correct)
+        self.assertEqual(self.stub.Check.call_count, 5)
+        self.assertEqual([check["exists"] for check in check_list], [True, True, True, False, False])
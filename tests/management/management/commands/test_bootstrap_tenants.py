@@ -3,10 +3,13 @@ from unittest.mock import patch
 
 from django.conf import settings
 from django.core.management import call_command, CommandError
+from django.test import TransactionTestCase
 from django.test.utils import override_settings
 
 from management.group.definer import seed_group
 from management.group.platform import GlobalPolicyIdService
+from management.management.commands import bootstrap_tenants
+from management.management.commands.bootstrap_tenants import _BootstrapError, _BootstrapSummary
 from management.relation_replicator.outbox_replicator import OutboxReplicator
 from management.tenant_mapping.model import TenantMapping
 from management.tenant_service import V2TenantBootstrapService
@@ -124,6 +127,56 @@ class TestBootstrapTenants(DualWriteTestCase):
                 for_groups=[str(tenant.tenant_mapping.default_group_uuid)],
             )
 
+    @patch("management.relation_replicator.outbox_replicator.OutboxReplicator.replicate")
+    def test_bulk_bisection(self, replicate):
+        replicate.side_effect = InMemoryRelationReplicator(self.tuples).replicate
+
+        tenants = [self.fixture.new_unbootstrapped_tenant(org_id=f"test-{i}") for i in range(8)]
+        failing_tenant = tenants[5]
+        bulk_bootstrap = V2TenantBootstrapService.bootstrap_tenants
+        single_bootstrap = V2TenantBootstrapService.bootstrap_tenant
+
+        def bootstrap_tenants(service, tenants, force=False):
+            if failing_tenant in tenants:
+                raise NotImplementedError("no")
+            return bulk_bootstrap(service, tenants, force=force)
+
+        with (
+            patch.object(
+                V2TenantBootstrapService, "bootstrap_tenants", autospec=True, side_effect=bootstrap_tenants
+            ) as bulk_mock,
+            patch.object(
+                V2TenantBootstrapService, "bootstrap_tenant", autospec=True, side_effect=single_bootstrap
+            ) as single_mock,
+        ):
+            self._invoke("--all")
+
+        # The failing batch is split in halves until the failing tenant is isolated, and all others are bootstrapped
+        # in bulk.
+        bulk_sizes = [len(call.args[1]) for call in bulk_mock.call_args_list if failing_tenant not in call.args[1]]
+        self.assertEqual(sum(bulk_sizes), Tenant.objects.exclude(tenant_name="public").count() - 1)
+        self.assertLessEqual(len(bulk_sizes), 4)
+        self.assertEqual([call.args[1] for call in single_mock.call_args_list], [failing_tenant])
+
+        for tenant in tenants:
+            self.assertTrue(TenantMapping.objects.filter(tenant=tenant).exists())
+
+    def test_single_worker_waits_for_locks(self):
+        tenants = [self.fixture.new_unbootstrapped_tenant(org_id=f"test-{i}") for i in range(3)]
+
+        with patch(
+            "management.management.commands.bootstrap_tenants._try_bulk_bootstrap",
+            wraps=bootstrap_tenants._try_bulk_bootstrap,
+        ) as try_bulk_bootstrap:
+            self._invoke("--all")
+
+        self.assertEqual({call.kwargs["skip_locked"] for call in try_bulk_bootstrap.call_args_list}, {False})
+        for tenant in tenants:
+            self.assertTrue(TenantMapping.objects.filter(tenant=tenant).exists())
+
+    def test_invalid_workers(self):
+        self.assertRaisesMessage(CommandError, "--workers must be at least 1.", self._invoke, "--all", "--workers=0")
+
     def test_missing(self):
         self.assertRaisesMessage(
             CommandError,
@@ -282,3 +335,38 @@ class TestBootstrapTenants(DualWriteTestCase):
         # Check that the role bindings were actually created and that we restored all removed tuples.
         assert_scoped_default_access(1)
         self.assertEqual(initial_tuples, set(self.tuples))
+
+
+@override_settings(V2_BOOTSTRAP_TENANT=True)
+class TestBootstrapTenantsWorkers(TransactionTestCase):
+    def setUp(self):
+        Tenant.objects.get_or_create(tenant_name="public")
+        seed_group()
+
+    def test_workers(self):
+        tenants = Tenant.objects.bulk_create([Tenant(org_id=f"test-{i}", tenant_name=f"test-{i}") for i in range(10)])
+
+        with patch(
+            "management.management.commands.bootstrap_tenants._try_bulk_bootstrap",
+            wraps=bootstrap_tenants._try_bulk_bootstrap,
+        ) as try_bulk_bootstrap:
+            call_command("bootstrap_tenants", "--all", "--workers=3")
+
+        self.assertEqual(
+            set(TenantMapping.objects.values_list("tenant__org_id", flat=True)), {t.org_id for t in tenants}
+        )
+        self.assertEqual({call.kwargs["skip_locked"] for call in try_bulk_bootstrap.call_args_list}, {True})
+
+    def test_summary_keeps_org_ids(self):
+        summary = _BootstrapSummary(track_successful=False)
+
+        summary.add(1, "locked", _BootstrapError.LOCKED)
+        summary.add(2, "missing", _BootstrapError.NO_SUCH_TENANT)
+        summary.add(3, "failed", _BootstrapError.FAILED)
+        self.assertEqual(summary.locked_tenants, {1: "locked"})
+
+        summary.add(1, "locked", _BootstrapError.FAILED)
+        self.assertEqual(summary.locked_tenants, {})
+        self.assertEqual(summary.missing_org_ids, {"missing"})
+        self.assertEqual(summary.failed_org_ids, {"failed", "locked"})
+        self.assertEqual(summary.successful_org_ids, set())
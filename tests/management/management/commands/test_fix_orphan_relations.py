@@ -459,7 +459,8 @@ class TestRemoveOrphanRelations(DualWriteTestCase):
         request._user = user
 
         audit_log = AuditLog()
-        audit_log.log_delete(request, AuditLog.GROUP, group)
+        with self.captureOnCommitCallbacks(execute=True):
+            audit_log.log_delete(request, AuditLog.GROUP, group)
 
     def test_fix_with_audit_log(self):
         """Test that a tenant without roles or groups is processed if it has an AuditLog entry."""
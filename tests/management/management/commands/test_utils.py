@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import mock_open, patch
+from unittest.mock import call, mock_open, patch
 
 from django.db.utils import IntegrityError
 from django.test import TestCase
@@ -44,6 +44,32 @@ class TestProcessBatch(TestCase):
                 ("10000003", False, "test_user_4", "4"),
             ],
         )
+        self.assertTrue(all(args[1]["staged"] for args in batch_mock.call_args_list))
+
+    @patch("management.management.commands.utils.write_checkpoint")
+    @patch("management.management.commands.utils.read_checkpoint", return_value=2)
+    @patch("management.management.commands.utils.process_batch")
+    def test_populate_tenant_user_data_resumes_after_checkpoint(self, batch_mock, _, write_checkpoint_mock):
+        mock_file_content = """orgs_info[0].id,orgs_info[0].perm[0],principals[0],_id
+1000000,admin:org:all,test_user_1,1
+10000001,admin:org:all,test_user_2,2
+10000002,,test_user_3,3
+10000003,,test_user_4,4
+"""
+
+        with patch("builtins.open", mock_open(read_data=mock_file_content)):
+            populate_tenant_user_data("file_name", batch_size=1, resume=True)
+
+        self.assertEqual(
+            [args[0][0] for args in batch_mock.call_args_list],
+            [[("10000002", False, "test_user_3", "3")], [("10000003", False, "test_user_4", "4")]],
+        )
+        self.assertEqual(write_checkpoint_mock.call_args_list, [call("file_name", 3), call("file_name", 4)])
+        # Only the tenants of the lines still to import are bootstrapped.
+        self.assertEqual(
+            set(Tenant.objects.exclude(tenant_name="public").values_list("org_id", flat=True)),
+            {"10000002", "10000003"},
+        )
 
     @patch("management.management.commands.utils.BOOT_STRAP_SERVICE")
     def test_process_batch(self, mock_bss):
@@ -59,6 +85,21 @@ class TestProcessBatch(TestCase):
         self.assertEqual(user.org_id, org_id)
         self.assertEqual(user.admin, is_admin)
 
+    @patch("management.management.commands.utils.BOOT_STRAP_SERVICE")
+    def test_process_staged_batch_passes_bootstrapped_tenants(self, mock_bss):
+        tenant = Tenant.objects.create(tenant_name="acct1", org_id="o1")
+        mapping = TenantMapping.objects.create(tenant=tenant)
+        Tenant.objects.create(tenant_name="acct2", org_id="o2")
+
+        process_batch([("o1", True, "test_user", "u1"), ("o2", False, "other_user", "u2")], staged=True)
+
+        kwargs = mock_bss.import_bulk_users.call_args[1]
+        self.assertFalse(kwargs["update_user_ids"])
+        self.assertEqual(
+            [(bootstrapped.tenant, bootstrapped.mapping) for bootstrapped in kwargs["bootstrapped_tenants"]],
+            [(tenant, mapping)],
+        )
+
     @patch("management.management.commands.utils.BOOT_STRAP_SERVICE")
     def test_retrying_bulk(self, mock_bss):
         mock_bss.import_bulk_users.side_effect = [
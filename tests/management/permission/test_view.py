@@ -534,6 +534,63 @@ class PermissionViewsetTests(IdentityRequest):
         self.assertEqual(response.data.get("meta", {}).get("count"), total)
 
 
+class PermissionCatalogViewsetTests(PermissionViewsetTests):
+    """Run the permission viewset tests against the catalog snapshot, plus its conditional request handling."""
+
+    _generation = 0
+
+    def setUp(self):
+        """Give each test its own generation so the snapshot reflects the permissions it creates."""
+        super().setUp()
+        PermissionCatalogViewsetTests._generation += 1
+
+    def run(self, result=None):
+        """Serve every request in the test from the current generation's snapshot."""
+        with patch(
+            "management.permission.catalog.PermissionCatalogCache.get_generation",
+            side_effect=lambda: PermissionCatalogViewsetTests._generation,
+        ):
+            return super().run(result)
+
+    def test_list_returns_etag_and_304_when_unchanged(self):
+        """Test that a repeat request with a matching ETag gets a 304 without querying permissions."""
+        response = CLIENT.get(LIST_URL, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        with patch("management.permission.catalog.PermissionCatalog.build") as build:
+            response = CLIENT.get(LIST_URL, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        build.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_etag_differs_by_query_and_generation(self):
+        """Test that different filters and a new seeding generation produce different ETags."""
+        etag = CLIENT.get(LIST_URL, **self.headers)["ETag"]
+        self.assertNotEqual(etag, CLIENT.get(f"{LIST_URL}?application=rbac", **self.headers)["ETag"])
+
+        PermissionCatalogViewsetTests._generation += 1
+        Permission.objects.create(permission="new:perm:read", tenant=self.tenant)
+        response = CLIENT.get(LIST_URL, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["meta"]["count"], 11)
+
+    def test_options_returns_304_when_unchanged(self):
+        """Test that the options endpoint also honours If-None-Match."""
+        response = CLIENT.get(f"{OPTION_URL}?field=application", **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = CLIENT.get(f"{OPTION_URL}?field=application", HTTP_IF_NONE_MATCH=response["ETag"], **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_exclude_roles_is_not_served_from_catalog(self):
+        """Test that exclude_roles, which depends on tenant roles, still queries the database."""
+        response = CLIENT.get(f"{LIST_URL}?exclude_roles={self.roleA.uuid}", **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", response)
+
+
 class PermissionViewsetTestsNonAdmin(IdentityRequest):
     """Test the permission viewset."""
 
@@ -355,7 +355,7 @@ class PrincipalUMBTests(IdentityRequest):
         self.assertFalse(Principal.objects.filter(username=principal_name).exists())
         self.group.refresh_from_db()
         self.assertFalse(self.group.principals.all())
-        cache_mock.delete_policy.assert_called_once_with(self.principal.uuid)
+        cache_mock.delete_policies.assert_called_once_with([self.principal.uuid])
         self.assertTrue(before + 1 == after)
 
         # When principal not in group
@@ -1006,7 +1006,7 @@ class PrincipalUMBTestsWithV2TenantBootstrap(PrincipalUMBTests):
         self.assertFalse(Principal.objects.filter(username=principal_name).exists())
         self.group.refresh_from_db()
         self.assertFalse(self.group.principals.all())
-        cache_mock.delete_policy.assert_called_once_with(self.principal.uuid)
+        cache_mock.delete_policies.assert_called_once_with([self.principal.uuid])
         self.assertTrue(before + 1 == after)
         replicate.assert_called_once()
         replication_event = replicate.call_args_list[0].args[0]
@@ -1064,9 +1064,78 @@ class PrincipalUMBTestsWithV2TenantBootstrap(PrincipalUMBTests):
         self.assertFalse(Principal.objects.filter(username=principal_name).exists())
         self.group.refresh_from_db()
         self.assertFalse(self.group.principals.all())
-        cache_mock.delete_policy.assert_called_once_with(principal.uuid)
+        cache_mock.delete_policies.assert_called_once_with([principal.uuid])
         self.assertTrue(before + 1 == after)
 
+    @patch(
+        "management.principal.proxy.PrincipalProxy._request_principals",
+        return_value={
+            "status_code": status.HTTP_200_OK,
+            "data": [],
+        },
+    )
+    @patch("management.group.model.AccessCache")
+    @patch("management.principal.cleaner.UMB_CLIENT")
+    @patch("management.relation_replicator.outbox_replicator.OutboxReplicator.replicate")
+    @override_settings(UMB_BATCH_SIZE=10)
+    def test_batch_disables_principals_with_one_event_per_org(self, replicate, client_mock, cache_class, proxy_mock):
+        """Process a batch of umb messages, disabling principals in bulk and nacking the unreadable message."""
+        other_frame_body = FRAME_BODY.replace(b">56780000<", b">56780002<").replace(
+            b"<Login>principal-test</Login>", b"<Login>principal-other</Login>"
+        )
+        principals = [
+            Principal.objects.create(username="principal-test", tenant=self.tenant, user_id="56780000"),
+            Principal.objects.create(username="principal-other", tenant=self.tenant, user_id="56780002"),
+        ]
+        self.group.principals.add(*principals)
+        replicator = InMemoryRelationReplicator(self._tuples)
+        bootstrapped_tenant = get_tenant_bootstrap_service(replicator).bootstrap_tenant(self.tenant)
+        replicate.side_effect = replicator.replicate
+
+        frames = [MagicMock(body=FRAME_BODY), MagicMock(body=other_frame_body), MagicMock(body=b"not xml")]
+        client_mock.canRead.side_effect = [True, True, True, False, False]
+        client_mock.receiveFrame.side_effect = frames
+        process_principal_events_from_umb()
+
+        self.assertEqual(client_mock.receiveFrame.call_count, 3)
+        self.assertEqual([c.args[0] for c in client_mock.ack.call_args_list], frames[:2])
+        client_mock.nack.assert_called_once_with(frames[2])
+        self.assertFalse(Principal.objects.filter(tenant=self.tenant).exists())
+        self.assertFalse(self.group.principals.all())
+
+        replicate.assert_called_once()
+        replication_event = replicate.call_args_list[0].args[0]
+        self.assertEqual(replication_event.event_type, ReplicationEventType.BULK_EXTERNAL_USER_DISABLE)
+        self.assertEqual(
+            replication_event.event_info,
+            {"org_id": self.tenant.org_id, "num_users": 2, "mapping_id": bootstrapped_tenant.mapping.id},
+        )
+        self.assertEqual(len(replication_event.remove), 6)
+        for principal in principals:
+            self.assert_user_memberships(bootstrapped_tenant.mapping, principal.user_id, str(self.group.uuid), 0)
+
+    @patch(
+        "management.principal.proxy.PrincipalProxy._request_principals",
+        return_value={
+            "status_code": status.HTTP_200_OK,
+            "data": [],
+        },
+    )
+    @patch("management.principal.cleaner.UMB_CLIENT")
+    @patch("management.tenant_service.v2.V2TenantBootstrapService.update_users", side_effect=Exception("bulk"))
+    @override_settings(UMB_BATCH_SIZE=10)
+    def test_batch_falls_back_to_single_messages(self, update_users, client_mock, proxy_mock):
+        """Test that a failed bulk update is retried one message at a time."""
+        Principal.objects.create(username="principal-test", tenant=self.tenant, user_id="56780000")
+        client_mock.canRead.side_effect = [True, False, False]
+        client_mock.receiveFrame.return_value = MagicMock(body=FRAME_BODY)
+        process_principal_events_from_umb()
+
+        update_users.assert_called_once()
+        client_mock.ack.assert_called_once()
+        client_mock.nack.assert_not_called()
+        self.assertFalse(Principal.objects.filter(username="principal-test").exists())
+
     @patch("management.principal.cleaner.retrieve_user_info")
     @patch("management.principal.cleaner.UMB_CLIENT")
     def test_failure_processing_message(self, client_mock, retrieve_user_mock):
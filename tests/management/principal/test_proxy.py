@@ -16,9 +16,9 @@
 #
 """Test the principal proxy."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework import status
 import requests
 
@@ -108,6 +108,31 @@ def mocked_requests_get_200_except(*args, **kwargs):  # pylint: disable=unused-a
     return MockResponse(json_response, status.HTTP_200_OK, ValueError)
 
 
+class FakeRedis:
+    """Dictionary backed stand-in for the Redis calls made by the principal profile cache."""
+
+    def __init__(self):
+        """Create an empty store."""
+        self.store = {}
+        self.expiry = {}
+
+    def mget(self, keys):
+        """Return the values of the keys."""
+        return [self.store.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        """Set a key and remember its expiry."""
+        self.store[key] = value
+        self.expiry[key] = ex
+
+    def pipeline(self):
+        """Return a pipeline executing the commands immediately."""
+        pipe = MagicMock()
+        pipe.__enter__.return_value = pipe
+        pipe.set.side_effect = self.set
+        return pipe
+
+
 class PrincipalProxyTest(TestCase):
     """Test PrincipalProxy object."""
 
@@ -259,3 +284,48 @@ class PrincipalProxyTest(TestCase):
         usernames.sort()
         expected = ["user1", "user2"]
         self.assertEqual(usernames, expected)
+
+    @override_settings(PRINCIPAL_PROFILE_CACHE_LIFETIME=300, PRINCIPAL_PROFILE_NEGATIVE_CACHE_LIFETIME=60)
+    def test_request_principal_profiles_fetches_only_misses(self):
+        """Test that cached profiles are served locally and only misses are requested from BOP."""
+        proxy = PrincipalProxy()
+        proxy.profile_cache._connection = FakeRedis()
+        profile = {"user_id": "1111111", "username": "test_user", "email": "test_user@email.foo"}
+
+        with patch.object(
+            proxy,
+            "request_filtered_principals",
+            return_value={"status_code": status.HTTP_200_OK, "data": [profile]},
+        ) as request_mock:
+            self.assertEqual(proxy.request_principal_profiles(["1111111", "2222222"]), {"1111111": profile})
+            request_mock.assert_called_once_with(
+                ["1111111", "2222222"], org_id=None, options={"query_by": "user_id", "return_id": True}
+            )
+
+            request_mock.reset_mock()
+            self.assertEqual(proxy.request_principal_profiles(["1111111", "2222222"]), {"1111111": profile})
+            request_mock.assert_not_called()
+
+            proxy.request_principal_profiles(["1111111", "3333333"])
+            request_mock.assert_called_once_with(
+                ["3333333"], org_id=None, options={"query_by": "user_id", "return_id": True}
+            )
+
+        expiry = proxy.profile_cache._connection.expiry
+        self.assertEqual(expiry[proxy.profile_cache.key_for("1111111")], 300)
+        self.assertEqual(expiry[proxy.profile_cache.key_for("2222222")], 60)
+
+    @override_settings(PRINCIPAL_PROFILE_CACHE_LIFETIME=300)
+    def test_request_principal_profiles_does_not_cache_errors(self):
+        """Test that a failed BOP request is not cached."""
+        proxy = PrincipalProxy()
+        proxy.profile_cache._connection = FakeRedis()
+
+        with patch.object(
+            proxy,
+            "request_filtered_principals",
+            return_value={"status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "errors": []},
+        ):
+            self.assertEqual(proxy.request_principal_profiles(["1111111"]), {})
+
+        self.assertEqual(proxy.profile_cache._connection.store, {})
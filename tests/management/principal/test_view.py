@@ -16,6 +16,7 @@
 #
 """Test the principal viewset."""
 
+import json
 from datetime import datetime
 from unittest.mock import patch, ANY
 from uuid import uuid4
@@ -66,6 +67,13 @@ class PrincipalViewNonAdminTests(IdentityRequest):
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_non_admin_cannot_export_principals_without_permissions(self):
+        """Test that we can not export the principals as a non-admin without permissions."""
+        client = APIClient()
+        response = client.get(reverse("v1_management:principals-export"), **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     @patch(
         "management.principal.proxy.PrincipalProxy.request_principals",
         return_value={"status_code": 200, "data": {"userCount": "1", "users": [{"username": "test_user"}]}},
@@ -195,6 +203,43 @@ class PrincipalViewsetTests(IdentityRequest):
 
         cross_account_principal.delete()
 
+    def test_export_principals(self):
+        """Test that the principal export streams the principals of the tenant stored by RBAC as NDJSON."""
+        Principal.objects.create(username="cross_account_user", cross_account=True, tenant=self.tenant)
+        service_account = Principal.objects.create(
+            username="service-account-1",
+            type=Principal.Types.SERVICE_ACCOUNT,
+            service_account_id="1",
+            tenant=self.tenant,
+        )
+        url = reverse("v1_management:principals-export")
+        client = APIClient()
+
+        response = client.get(url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        exported = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(
+            exported,
+            [
+                {
+                    "uuid": str(self.principal.uuid),
+                    "username": "test_user",
+                    "type": "user",
+                    "user_id": None,
+                    "clientId": None,
+                }
+            ],
+        )
+
+        response = client.get(f"{url}?type=all", **self.headers)
+        exported = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([principal["username"] for principal in exported], ["service-account-1", "test_user"])
+        self.assertEqual(exported[0]["clientId"], service_account.service_account_id)
+
+        response = client.get(f"{url}?type=invalid", **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_read_principal_list_username_only_true_success(self):
         """Test that we can read a list of principals with username_only=true."""
         url = f'{reverse("v1_management:principals")}?username_only=true'
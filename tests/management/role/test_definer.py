@@ -30,6 +30,7 @@ from management.models import (
     Permission,
     ResourceDefinition,
     Role,
+    RoleDefinitionFile,
     Group,
     PlatformRoleV2,
     SeededRoleV2,
@@ -477,6 +478,32 @@ class RoleDefinerTests(IdentityRequest):
             any(self.is_create_event("inventory_hosts_read", args[0]) for args, _ in mock_replicate.call_args_list)
         )
 
+    @patch("management.relation_replicator.outbox_replicator.OutboxReplicator.replicate")
+    def test_seed_roles_skips_unchanged_files(self, mock_replicate):
+        """Test that the roles of a definitions file are only seeded again when it or the seeding inputs change."""
+        seed_roles()
+        self.assertTrue(RoleDefinitionFile.objects.filter(name="inventory_local_test.json").exists())
+
+        with patch("management.role.definer._make_role") as make_role:
+            seed_roles()
+            make_role.assert_not_called()
+
+            seed_roles(force_update_relationships=True)
+            self.assertTrue(make_role.called)
+
+        Role.objects.filter(name="Inventory Groups Administrator").update(version=0)
+        with patch("management.role.definer._make_role") as make_role:
+            seed_roles()
+            seeded_names = {args[0]["name"] for args, _ in make_role.call_args_list}
+            self.assertIn("Inventory Groups Administrator", seeded_names)
+            self.assertIn("Inventory Hosts Administrator Local Test", seeded_names)
+            self.assertNotIn("Notifications viewer", seeded_names)
+
+        with patch("management.role.definer._make_role") as make_role:
+            with self.settings(ROOT_SCOPE_PERMISSIONS="inventory:*:*"):
+                seed_roles()
+            self.assertTrue(make_role.called)
+
     @patch("management.relation_replicator.outbox_replicator.OutboxReplicator.replicate")
     @patch("management.role.definer.destructive_ok")
     @patch("builtins.open", new_callable=mock_open, read_data='{"roles": []}')
@@ -19,8 +19,11 @@
 from datetime import datetime, timedelta
 from typing import Callable, Optional, Tuple, Iterable
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.db.models import Q
 from django.conf import settings
+from django.core.exceptions import ValidationError
 
 from management.group.definer import seed_group, set_system_flag_before_update
 from management.group.model import Group
@@ -50,6 +53,8 @@ from management.role.platform import platform_v2_role_uuid_for
 from management.role.relation_api_dual_write_handler import (
     RelationApiDualWriteHandler,
     SeedingRelationApiDualWriteHandler,
+    _field_values_by_pk,
+    _update_by_pk,
 )
 from management.role.v2_model import CustomRoleV2, RoleV2, SeededRoleV2
 from management.role_binding.model import RoleBinding, RoleBindingPrincipal
@@ -72,6 +77,7 @@ from migration_tool.in_memory_tuples import (
     subject_type,
 )
 from migration_tool.utils import create_relationship
+from rest_framework import serializers
 
 from api.cross_access.model import CrossAccountRequest
 from api.cross_access.relation_api_dual_write_cross_access_handler import (
@@ -2228,6 +2234,44 @@ class DualWriteCustomRolesTestCase(DualWriteTestCase):
             role = self.expect_1_v2_role_with_permissions(permissions)
             self.expect_1_role_binding_to_workspace(workspace, for_v2_roles=[role], for_groups=[str(group.uuid)])
 
+    def test_update_writes_mappings_in_bulk(self):
+        """Test that role updates write binding mappings in bulk, and not at all when they did not change."""
+        role = self.given_v1_role_on_test_workspaces(
+            "r1",
+            default=["inventory:hosts:read"],
+            ws_1=["inventory:hosts:write"],
+            ws_2=["inventory:hosts:write"],
+            ws_3=["inventory:hosts:write"],
+        )
+        group, _ = self.given_group("g1", ["u1"])
+        self.given_roles_assigned_to_group(group, roles=[role])
+
+        def binding_mapping_writes(queries):
+            return [
+                query["sql"].split(" ")[0]
+                for query in queries.captured_queries
+                if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+                and '"management_bindingmapping"' in query["sql"]
+            ]
+
+        with CaptureQueriesContext(connection) as queries:
+            role = self.given_update_to_v1_role_on_test_workspaces(
+                role,
+                default=["inventory:hosts:read"],
+                ws_1=["inventory:hosts:write"],
+                ws_2=["inventory:hosts:write"],
+                ws_3=["inventory:hosts:write"],
+            )
+        self.assertEqual(binding_mapping_writes(queries), [])
+
+        with CaptureQueriesContext(connection) as queries:
+            role = self.given_update_to_v1_role_on_test_workspaces(
+                role, default=["inventory:hosts:read", "inventory:hosts:write"], ws_1=["inventory:hosts:delete"]
+            )
+        self.assertLessEqual(binding_mapping_writes(queries).count("UPDATE"), 1)
+        self.assertEqual(binding_mapping_writes(queries).count("DELETE"), 1)
+        self.assertEqual(BindingMapping.objects.filter(role=role).count(), 2)
+
     def test_partial_overlap(self):
         """Test creating a role where some, but not all, workspaces share the same permissions."""
         role = self.given_v1_role_on_test_workspaces(
@@ -2650,6 +2694,43 @@ class DualWriteCustomRolesTestCase(DualWriteTestCase):
         self.assertFalse(RoleBinding.objects.filter(role__v1_source=role).exists())
 
 
+class UpdateByPkTestCase(TestCase):
+    """Test the bulk writes of V2 roles that replace their save()."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(tenant_name="acct_bulk", org_id="bulk_org")
+        self.role = CustomRoleV2.objects.create(name="bulk_role", tenant=self.tenant)
+        self.old_values = _field_values_by_pk({self.role.pk: self.role})
+
+    def update(self, roles):
+        _update_by_pk(CustomRoleV2, self.old_values, roles, validate=CustomRoleV2.validate_for_save)
+
+    def test_changed_role_is_validated(self):
+        """Test that a changed role failing the validations of save() is not written."""
+        self.role.type = RoleV2.Types.SEEDED
+
+        with self.assertRaises(serializers.ValidationError):
+            self.update([self.role])
+        self.assertEqual(RoleV2.objects.get(pk=self.role.pk).type, RoleV2.Types.CUSTOM)
+
+    def test_new_role_is_validated(self):
+        """Test that a new role failing the validations of save() is not inserted."""
+        with self.assertRaises(ValidationError):
+            self.update([self.role, CustomRoleV2(name="bulk_role", tenant=self.tenant)])
+        self.assertEqual(CustomRoleV2.objects.filter(tenant=self.tenant).count(), 1)
+
+    def test_changed_role_is_touched(self):
+        """Test that the modified time of changed roles advances as it would on save()."""
+        modified = self.role.modified
+        self.role.description = "changed"
+
+        self.update([self.role])
+
+        self.role.refresh_from_db()
+        self.assertEqual(self.role.description, "changed")
+        self.assertGreater(self.role.modified, modified)
+
+
 @override_settings(ATOMIC_RETRY_DISABLED=True)
 class DualWriteCrossAccountReqeustTestCase(DualWriteTestCase):
     user_id: str
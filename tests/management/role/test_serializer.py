@@ -18,7 +18,7 @@ from django.test import TestCase
 from django.test.utils import override_settings
 from unittest.mock import Mock
 from api.models import Tenant
-from management.models import Permission, Workspace
+from management.models import Access, Permission, ResourceDefinition, Workspace
 from management.role.serializer import RoleSerializer, ResourceDefinitionSerializer
 
 import random
@@ -200,6 +200,61 @@ class RoleSerializerTest(TestCase):
         self.assertFalse(update_serializer.is_valid())
         self.assertIn("access", update_serializer.errors)
 
+    def test_create_role_access_uses_constant_queries(self):
+        """Test that creating access for a role does not issue queries per access entry."""
+        tenant = Tenant.objects.get(tenant_name="public")
+        access = []
+        for i in range(10):
+            Permission.objects.create(permission=f"app:resource{i}:read", tenant=tenant)
+            access.append(
+                {
+                    "permission": f"app:resource{i}:read",
+                    "resourceDefinitions": [
+                        {"attributeFilter": {"key": "app.attribute.case", "operation": "equal", "value": str(i)}}
+                    ],
+                }
+            )
+        serializer = self.prepare_serializer({"name": "RoleA", "access": access})
+        self.assertTrue(serializer.is_valid())
+
+        # Role insert, permission lookup, access insert and resource definition insert.
+        with self.assertNumQueries(4):
+            role = serializer.create(serializer.validated_data)
+
+        self.assertEqual(role.access.count(), 10)
+        self.assertEqual(ResourceDefinition.objects.filter(access__role=role).count(), 10)
+
+    def test_update_role_only_applies_access_delta(self):
+        """Test that updating a role keeps unchanged access and only replaces what changed."""
+        tenant = Tenant.objects.get(tenant_name="public")
+        for name in ["app:kept:read", "app:removed:read", "app:added:read"]:
+            Permission.objects.create(permission=name, tenant=tenant)
+        kept = {
+            "permission": "app:kept:read",
+            "resourceDefinitions": [
+                {"attributeFilter": {"key": "app.attribute.case", "operation": "equal", "value": "kept"}}
+            ],
+        }
+        serializer = self.prepare_serializer(
+            {"name": "RoleA", "access": [kept, {"permission": "app:removed:read", "resourceDefinitions": []}]}
+        )
+        self.assertTrue(serializer.is_valid())
+        role = serializer.create(serializer.validated_data)
+        kept_access = role.access.get(permission__permission="app:kept:read")
+
+        serializer = self.prepare_serializer(
+            {"name": "RoleA", "access": [kept, {"permission": "app:added:read", "resourceDefinitions": []}]}
+        )
+        self.assertTrue(serializer.is_valid())
+        role = serializer.update(role, serializer.validated_data)
+
+        self.assertCountEqual(
+            role.access.values_list("permission__permission", flat=True), ["app:kept:read", "app:added:read"]
+        )
+        self.assertTrue(Access.objects.filter(id=kept_access.id).exists())
+        self.assertEqual(kept_access.resourceDefinitions.count(), 1)
+        self.assertFalse(Access.objects.filter(role=role, permission__permission="app:removed:read").exists())
+
 
 @override_settings(WORKSPACE_HIERARCHY_ENABLED=True)
 class ResourceDefinitionTest(TestCase):
@@ -16,15 +16,17 @@
 #
 """Tests for v2 role list filtering when applications are migration-excluded."""
 
+from importlib import import_module
+from unittest.mock import patch
+
+from django.apps import apps
 from django.test import override_settings
 from management.exceptions import InvalidFieldError
 from management.models import Permission
+from management.permission.scope_service import ImplicitResourceService, PermissionScopeCache, Scope
 from management.role.v2_exceptions import InvalidRolePermissionsError
 from management.role.v2_model import RoleV2
-from management.role.v2_role_scope import (
-    v2_role_excluded_application_permission_ids_cache,
-    v2_role_excluded_applications,
-)
+from management.role.v2_role_scope import refresh_v2_role_scopes, v2_role_excluded_applications
 from management.role.v2_service import RoleV2Service
 from management.role_binding.service import RoleBindingService
 from tests.identity_request import IdentityRequest
@@ -37,7 +39,6 @@ class V2RoleScopeTests(IdentityRequest):
     def setUp(self):
         super().setUp()
         self.service = RoleV2Service(tenant=self.tenant)
-        v2_role_excluded_application_permission_ids_cache.invalidate()
 
         self.inv_perm = Permission.objects.create(permission="inventory:hosts:read", tenant=self.tenant)
         self.cost_perm = Permission.objects.create(permission="cost-management:cost:read", tenant=self.tenant)
@@ -52,7 +53,6 @@ class V2RoleScopeTests(IdentityRequest):
         self.mixed_role.permissions.add(self.inv_perm, self.cost_perm)
 
     def tearDown(self):
-        v2_role_excluded_application_permission_ids_cache.invalidate()
         RoleV2.objects.all().delete()
         Permission.objects.filter(tenant=self.tenant).delete()
         super().tearDown()
@@ -62,29 +62,119 @@ class V2RoleScopeTests(IdentityRequest):
             apps = v2_role_excluded_applications()
         self.assertEqual(apps, frozenset({"foo", "bar", "baz"}))
 
+    def _scopes(self, role):
+        role.refresh_from_db(fields=["highest_scope", "out_of_scope"])
+        return role.highest_scope, role.out_of_scope
+
     @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost-management"])
-    def test_permission_ids_cache_matches_table(self):
-        ids = v2_role_excluded_application_permission_ids_cache.permission_ids()
-        expected = frozenset(Permission.objects.filter(application="cost-management").values_list("id", flat=True))
-        self.assertEqual(ids, expected)
-        self.assertIn(self.cost_perm.id, ids)
+    def test_permission_changes_maintain_columns(self):
+        """Adding and removing permissions keeps out_of_scope in step, on the instance as well."""
+        role = RoleV2.objects.create(name="changing_role", description="", tenant=self.tenant)
+        self.assertEqual(self._scopes(role), (Scope.DEFAULT, False))
+
+        role.permissions.add(self.cost_perm)
+        self.assertTrue(role.out_of_scope)
+        self.assertEqual(self._scopes(role), (Scope.DEFAULT, True))
+
+        role.permissions.remove(self.cost_perm)
+        self.assertEqual(self._scopes(role), (Scope.DEFAULT, False))
+
+    @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost-management"])
+    def test_reverse_permission_changes_maintain_columns(self):
+        """Changing roles from the permission side keeps the columns in step."""
+        role = RoleV2.objects.create(name="reverse_role", description="", tenant=self.tenant)
+
+        self.cost_perm.v2_roles.add(role)
+        self.assertEqual(self._scopes(role), (Scope.DEFAULT, True))
+
+        self.cost_perm.v2_roles.clear()
+        self.assertEqual(self._scopes(role), (Scope.DEFAULT, False))
+
+    def test_refresh_picks_up_settings_change(self):
+        """Refreshing after the exclude list changes rewrites only the affected roles."""
+        self.assertEqual(refresh_v2_role_scopes(), 0)
+
+        with override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost-management"]):
+            self.assertEqual(refresh_v2_role_scopes(), 2)
+            self.assertEqual(refresh_v2_role_scopes(), 0)
+
+        self.assertEqual(self._scopes(self.cost_role), (Scope.DEFAULT, True))
+        self.assertEqual(self._scopes(self.mixed_role), (Scope.DEFAULT, True))
+        self.assertEqual(self._scopes(self.inventory_role), (Scope.DEFAULT, False))
 
     @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost-management"])
-    def test_cache_invalidate_picks_up_new_permission(self):
-        v2_role_excluded_application_permission_ids_cache.permission_ids()
-        extra = Permission.objects.create(permission="cost-management:foo:read", tenant=self.tenant)
-        v2_role_excluded_application_permission_ids_cache.invalidate()
-        ids = v2_role_excluded_application_permission_ids_cache.permission_ids()
-        self.assertIn(extra.id, ids)
+    def test_migration_backfills_existing_roles(self):
+        """The migration adding the columns computes them for roles that only have the column defaults."""
+        RoleV2.objects.update(highest_scope=Scope.DEFAULT, out_of_scope=False)
+        migration = import_module("management.migrations.0088_rolev2_highest_scope_out_of_scope")
+
+        migration.backfill_v2_role_scopes(apps, None)
+
+        self.assertEqual(self._scopes(self.cost_role), (Scope.DEFAULT, True))
+        self.assertEqual(self._scopes(self.mixed_role), (Scope.DEFAULT, True))
+        self.assertEqual(self._scopes(self.inventory_role), (Scope.DEFAULT, False))
+
+    def test_malformed_permission_has_default_scope(self):
+        """A malformed permission does not prevent the other roles' columns from being maintained."""
+        malformed = Permission.objects.create(permission="app:test_*:test_*", tenant=self.tenant)
+        role = RoleV2.objects.create(name="malformed_role", description="", tenant=self.tenant)
+        scope_cache = PermissionScopeCache(
+            ImplicitResourceService(root_scope_permissions=["inventory:*:*"], tenant_scope_permissions=[])
+        )
+
+        with patch("management.permission.scope_service.permission_scope_cache", scope_cache):
+            role.permissions.add(malformed, self.inv_perm)
+
+            self.assertEqual(scope_cache.scope_for_permission(malformed.id, malformed.permission), Scope.DEFAULT)
+            self.assertEqual(self._scopes(role), (Scope.ROOT, False))
+
+    def test_columns_match_permission_id_filtering(self):
+        """The column predicates select the same roles as filtering on permission IDs directly."""
+        scope_cache = PermissionScopeCache(
+            ImplicitResourceService(root_scope_permissions=["inventory:*:*"], tenant_scope_permissions=["rbac:*:*"])
+        )
+        rbac_perm = Permission.objects.create(permission="rbac:group:read", tenant=self.tenant)
+        for name, permissions in [
+            ("rbac_role", [rbac_perm]),
+            ("rbac_inv_role", [rbac_perm, self.inv_perm]),
+            ("rbac_cost_role", [rbac_perm, self.cost_perm]),
+            ("empty_role", []),
+        ]:
+            role = RoleV2.objects.create(name=name, description="", tenant=self.tenant)
+            role.permissions.add(*permissions)
+
+        with (
+            patch("management.permission.scope_service.permission_scope_cache", scope_cache),
+            override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost-management"]),
+        ):
+            refresh_v2_role_scopes()
+            roles = RoleV2.objects.filter(tenant=self.tenant)
+
+            excluded_ids = Permission.objects.filter(application="cost-management").values_list("id", flat=True)
+            self.assertCountEqual(
+                roles.excluding_out_of_scope_v2_roles(), roles.exclude(permissions__id__in=excluded_ids).distinct()
+            )
+
+            for matching in ({Scope.DEFAULT}, {Scope.ROOT}, {Scope.TENANT}):
+                expected = roles
+                if Scope.DEFAULT not in matching:
+                    expected = expected.filter(permissions__id__in=scope_cache.ids_for_scopes(matching)).distinct()
+                higher = {scope for scope in Scope if scope > max(matching)}
+                if higher:
+                    expected = expected.exclude(permissions__id__in=scope_cache.ids_for_scopes(higher))
+                with self.subTest(matching=matching):
+                    self.assertCountEqual(roles.with_highest_scope_in(matching), expected)
 
     @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost-management"])
     def test_list_hides_roles_with_any_excluded_application(self):
+        refresh_v2_role_scopes()
         qs = self.service.list({})
         names = set(qs.values_list("name", flat=True))
         self.assertEqual(names, {"inv_role"})
 
     @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["inventory"])
     def test_list_hides_roles_matching_migration_exclude_list(self):
+        refresh_v2_role_scopes()
         qs = self.service.list({})
         names = set(qs.values_list("name", flat=True))
         self.assertEqual(names, {"cost_role"})
@@ -92,6 +182,7 @@ class V2RoleScopeTests(IdentityRequest):
     @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost-management"])
     def test_role_binding_rejects_excluded_app_role(self):
         """Assigning an out-of-scope role to a binding raises InvalidFieldError."""
+        refresh_v2_role_scopes()
         service = RoleBindingService(tenant=self.tenant)
         with self.assertRaises(InvalidFieldError):
             service._get_roles([str(self.cost_role.uuid)])
@@ -840,7 +840,7 @@ class RoleV2ServiceListResourceTypeTests(IdentityRequest):
             root_scope_permissions=["root_app:*:*"],
         )
         test_cache = PermissionScopeCache(scope_service)
-        self._cache_patcher = patch("management.role.v2_service.permission_scope_cache", test_cache)
+        self._cache_patcher = patch("management.permission.scope_service.permission_scope_cache", test_cache)
         self._cache_patcher.start()
 
         self.default_perm = Permission.objects.create(permission="default_app:resource:read", tenant=self.tenant)
@@ -37,7 +37,6 @@ from management.relation_replicator.noop_replicator import NoopReplicator
 from management.relation_replicator.outbox_replicator import OutboxReplicator
 from management.role.definer import seed_roles
 from management.role.v2_model import CustomRoleV2, PlatformRoleV2, RoleV2, SeededRoleV2
-from management.role.v2_role_scope import v2_role_excluded_application_permission_ids_cache
 from management.role.v2_service import RoleV2Service
 from management.tenant_service import V2TenantBootstrapService
 from management.utils import PRINCIPAL_CACHE, as_uuid
@@ -45,7 +44,7 @@ from rbac import urls
 from tests.identity_request import IdentityRequest
 from tests.v2_util import bootstrap_tenant_for_v2_test
 
-CACHE_PATCH_TARGET = "management.role.v2_service.permission_scope_cache"
+CACHE_PATCH_TARGET = "management.permission.scope_service.permission_scope_cache"
 
 
 def _scope_cache(tenant_perms="", root_perms="", default_perms=""):
@@ -151,20 +150,16 @@ class RoleV2RetrieveViewTest(IdentityRequest):
     @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost"])
     def test_retrieve_excluded_app_role_returns_404(self):
         """Test that retrieving a role whose permissions are all from an excluded app returns 404."""
-        v2_role_excluded_application_permission_ids_cache.invalidate()
-        try:
-            excluded_role = CustomRoleV2.objects.create(
-                name="Excluded App Role",
-                description="Has only excluded-app permissions",
-                tenant=self.tenant,
-            )
-            excluded_role.permissions.add(self.permission3)  # cost:reports:read
+        excluded_role = CustomRoleV2.objects.create(
+            name="Excluded App Role",
+            description="Has only excluded-app permissions",
+            tenant=self.tenant,
+        )
+        excluded_role.permissions.add(self.permission3)  # cost:reports:read
 
-            url = self._get_role_url(excluded_role.uuid)
-            response = self.client.get(url, **self.headers)
-            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-        finally:
-            v2_role_excluded_application_permission_ids_cache.invalidate()
+        url = self._get_role_url(excluded_role.uuid)
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_retrieve_platform_role_returns_404(self):
         """Test that retrieving a platform role returns 404 (platform roles are not exposed)."""
@@ -1129,7 +1124,8 @@ class RoleV2ViewSetTests(IdentityRequest):
             "permissions": [{"application": "inventory", "resource_type": "hosts", "operation": "read"}],
         }
 
-        response = self.client.post(self.url, data, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data["name"], "API Test Role")
@@ -1469,18 +1465,14 @@ class RoleV2ViewSetTests(IdentityRequest):
     @override_settings(V2_MIGRATION_APP_EXCLUDE_LIST=["cost"])
     def test_create_role_rejects_migration_excluded_application(self):
         """Permissions in V2_MIGRATION_APP_EXCLUDE_LIST cannot be used on create."""
-        v2_role_excluded_application_permission_ids_cache.invalidate()
-        try:
-            data = {
-                "name": "Excluded App API Role",
-                "description": "Should fail",
-                "permissions": [{"application": "cost", "resource_type": "reports", "operation": "read"}],
-            }
-            response = self.client.post(self.url, data, format="json")
-            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-            self.assertIn("migration-excluded", response.data["detail"])
-        finally:
-            v2_role_excluded_application_permission_ids_cache.invalidate()
+        data = {
+            "name": "Excluded App API Role",
+            "description": "Should fail",
+            "permissions": [{"application": "cost", "resource_type": "reports", "operation": "read"}],
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("migration-excluded", response.data["detail"])
 
     # ==========================================================================
     # Tests for PUT /api/v2/roles/{uuid}/ (update)
@@ -1504,7 +1496,8 @@ class RoleV2ViewSetTests(IdentityRequest):
             "permissions": [{"application": "inventory", "resource_type": "hosts", "operation": "write"}],
         }
 
-        response = self.client.put(update_url, data, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(update_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["name"], "Updated Role")
@@ -1697,7 +1690,8 @@ class RoleV2ViewSetTests(IdentityRequest):
             "permissions": [{"application": "inventory", "resource_type": "hosts", "operation": "read"}],
         }
 
-        response = self.client.put(update_url, data, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(update_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["name"], "Test Role")
@@ -1881,7 +1875,8 @@ class RoleV2ViewSetTests(IdentityRequest):
             "permissions": [{"application": "inventory", "resource_type": "hosts", "operation": "read"}],
         }
 
-        response = self.client.put(update_url, data, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(update_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         self._assert_audit_log(action=AuditLog.EDIT, description=f"V2 role {role.name}:\nEdited permissions")
@@ -1902,7 +1897,8 @@ class RoleV2ViewSetTests(IdentityRequest):
             "permissions": [{"application": "inventory", "resource_type": "hosts", "operation": "read"}],
         }
 
-        response = self.client.put(update_url, data, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(update_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         self._assert_audit_log(
@@ -1911,7 +1907,8 @@ class RoleV2ViewSetTests(IdentityRequest):
 
         data["name"] = "An Even Better Role"
 
-        response = self.client.put(update_url, data, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(update_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         self._assert_audit_log(action=AuditLog.EDIT, description=f"V2 role A Better Role:\nEdited name")
@@ -1962,7 +1959,8 @@ class RoleV2ViewSetTests(IdentityRequest):
     @patch("core.kafka.RBACProducer.send_kafka_message")
     def test_delete(self, send_kafka_message):
         create_response = self._create_role()
-        response = self._request_delete({"ids": [create_response["id"]]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._request_delete({"ids": [create_response["id"]]})
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(RoleV2.objects.filter(uuid=create_response["id"]).exists())
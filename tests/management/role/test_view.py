@@ -404,7 +404,8 @@ class RoleViewsetTests(IdentityRequest):
                 },
                 {"permission": "app:*:read", "resourceDefinitions": []},
             ]
-            response = self.create_role(role_name, in_access_data=access_data)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.create_role(role_name, in_access_data=access_data)
             self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
             # test whether newly created role is added correctly within audit log database
@@ -820,6 +821,20 @@ class RoleViewsetTests(IdentityRequest):
         self.assertEqual(role.get("name"), role_name)
         self.assertEqual(role.get("display_name"), role_display)
 
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_export_roles_streams_the_list(self):
+        """Test that the role export streams the roles of the list, with the requested fields, as NDJSON."""
+        client = APIClient()
+        query = "?application=app&add_fields=groups_in_count"
+        listed = client.get(f"{URL}{query}&limit=1000", **self.headers)
+        response = client.get(f"{reverse('v1_management:role-export')}{query}", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        exported = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(exported, json.loads(json.dumps(listed.data.get("data"), cls=DjangoJSONEncoder)))
+        self.assertIn("groups_in_count", exported[0])
+
     def test_get_role_by_application_single(self):
         """Test that getting roles by application returns roles based on permissions."""
         url = "{}?application={}".format(URL, "app")
@@ -1436,16 +1451,17 @@ class RoleViewsetTests(IdentityRequest):
         role_uuid = response.data.get("uuid")
         url = reverse("v1_management:role-detail", kwargs={"uuid": role_uuid})
         client = APIClient()
-        response = client.patch(
-            url,
-            {
-                "name": updated_name,
-                "display_name": updated_name,
-                "description": updated_description,
-            },
-            format="json",
-            **self.headers,
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(
+                url,
+                {
+                    "name": updated_name,
+                    "display_name": updated_name,
+                    "description": updated_description,
+                },
+                format="json",
+                **self.headers,
+            )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         self.assertIsNotNone(response.data.get("uuid"))
@@ -1525,7 +1541,8 @@ class RoleViewsetTests(IdentityRequest):
             del test_data["uuid"]
             url = reverse("v1_management:role-detail", kwargs={"uuid": role_uuid})
             client = APIClient()
-            response = client.put(url, test_data, format="json", **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.put(url, test_data, format="json", **self.headers)
 
             org_id = self.customer_data["org_id"]
 
@@ -1533,7 +1550,10 @@ class RoleViewsetTests(IdentityRequest):
 
             self.assertIsNotNone(response.data.get("uuid"))
             self.assertEqual(updated_name, response.data.get("name"))
-            self.assertEqual("cost-management:*:*", response.data.get("access")[0]["permission"])
+            self.assertCountEqual(
+                ["cost-management:*:*", "app:*:read"],
+                [access["permission"] for access in response.data.get("access")],
+            )
 
             # test whether newly updated (post) role is added correctly within audit log database
             al_url = "/api/rbac/v1/auditlogs/"
@@ -2019,7 +2039,8 @@ class RoleViewsetTests(IdentityRequest):
             role_uuid = response.data.get("uuid")
             url = reverse("v1_management:role-detail", kwargs={"uuid": role_uuid})
             client = APIClient()
-            response = client.delete(url, **self.headers)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.delete(url, **self.headers)
 
             org_id = self.customer_data["org_id"]
 
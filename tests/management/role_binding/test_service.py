@@ -1007,6 +1007,52 @@ class RoleBindingServiceTests(IdentityRequest):
         self.assertNotIn("Regular public group", group_names)
         self.assertEqual(3, len(groups))
 
+    def test_get_roles_granted_to_principal_direct_and_via_group(self):
+        """Test that roles bound to the principal and to its groups are returned once each."""
+        other_role = RoleV2.objects.create(name="other_role", tenant=self.tenant)
+        other_binding = RoleBinding.objects.create(
+            role=other_role, resource_type="workspace", resource_id=str(self.workspace.id), tenant=self.tenant
+        )
+        RoleBindingGroup.objects.create(group=self.group, binding=other_binding)
+        RoleV2.objects.create(name="unbound_role", tenant=self.tenant)
+
+        roles = self.service.get_roles_granted_to_principal(self.principal)
+
+        self.assertEqual([role.name for role in roles], ["other_role", "test_role"])
+
+    def test_effective_permissions_include_child_roles(self):
+        """Test that a bound platform role grants its seeded children's permissions with a fixed query count."""
+        child_permission = Permission.objects.create(permission="app:child:write", tenant=self.tenant)
+        seeded = SeededRoleV2.objects.create(name="seeded_child", tenant=self.tenant)
+        seeded.permissions.add(child_permission, self.permission)
+        platform = PlatformRoleV2.objects.create(name="platform_role", tenant=self.tenant)
+        platform.children.add(seeded)
+        platform_binding = RoleBinding.objects.create(
+            role=platform, resource_type="workspace", resource_id=str(self.workspace.id), tenant=self.tenant
+        )
+        RoleBindingPrincipal.objects.create(
+            principal=self.principal, binding=platform_binding, source=API_PRINCIPAL_SOURCE
+        )
+
+        with self.assertNumQueries(4):
+            roles = list(self.service.get_roles_granted_to_principal(self.principal))
+            effective = RoleBindingService.effective_permissions(roles)
+
+        self.assertEqual(
+            [(e.role.name, e.permission.permission) for e in effective],
+            [
+                ("platform_role", "app:child:write"),
+                ("platform_role", "app:resource:read"),
+                ("test_role", "app:resource:read"),
+            ],
+        )
+
+    def test_get_roles_granted_to_principal_without_bindings(self):
+        """Test that a principal without bindings is granted no roles."""
+        other = Principal.objects.create(username="unbound", tenant=self.tenant, type=Principal.Types.USER)
+
+        self.assertFalse(self.service.get_roles_granted_to_principal(other).exists())
+
 
 class RoleBindingSerializerTests(IdentityRequest):
     """Tests for RoleBindingByGroupSerializer."""
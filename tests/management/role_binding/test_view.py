@@ -1125,6 +1125,30 @@ class RoleBindingListViewSetTest(IdentityRequest):
         names = [item["role"]["name"] for item in data]
         self.assertEqual(names, sorted(names))
 
+    @override_settings(EXPORT_CHUNK_SIZE=4)
+    @patch(
+        "management.permissions.role_binding_access.RoleBindingKesselAccessPermission.has_permission",
+        return_value=True,
+    )
+    def test_export_streams_the_list(self, mock_permission):
+        """Test that the export streams the filtered and ordered role bindings of the list as NDJSON."""
+        query = f"?order_by=-role.name&fields=role(id,name),subject(id,type),resource(id,name)&role_id={self.roles[0].uuid}"
+        listed = self.client.get(f"{self._get_list_url()}{query}&limit=-1", **self.headers)
+        response = self.client.get(f"{reverse('v2_management:role-bindings-export')}{query}", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        exported = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(exported, json.loads(listed.content)["data"])
+        self.assertEqual(len(exported), 1)
+
+        query = "?order_by=-role.name&fields=role(id,name)"
+        listed = self.client.get(f"{self._get_list_url()}{query}&limit=-1", **self.headers)
+        response = self.client.get(f"{reverse('v2_management:role-bindings-export')}{query}", **self.headers)
+        exported = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(exported, json.loads(listed.content)["data"])
+        self.assertEqual([item["role"]["name"] for item in exported], sorted(role.name for role in self.roles)[::-1])
+
     @patch(
         "management.permissions.role_binding_access.RoleBindingKesselAccessPermission.has_permission",
         return_value=True,
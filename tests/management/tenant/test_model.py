@@ -255,6 +255,34 @@ class V2TenantBootstrapServiceTest(TestCase):
             ),
         )
 
+    def _user(self, user_id: str, org_id: str, is_active: bool) -> User:
+        user = User()
+        user.user_id = user_id
+        user.username = f"user-{user_id}"
+        user.org_id = org_id
+        user.admin = False
+        user.is_active = is_active
+        return user
+
+    def test_update_users_applies_events_for_the_same_user_in_order(self):
+        """A user enabled and then disabled within one batch ends up disabled, and the other way around."""
+        bootstrapped = self.fixture.new_tenant(org_id="o1")
+        default_group_membership = all_of(
+            resource("rbac", "group", bootstrapped.mapping.default_group_uuid),
+            relation("member"),
+            subject("rbac", "principal", "localhost/u1"),
+        )
+        Principal.objects.create(tenant=bootstrapped.tenant, username="user-u1", user_id="u1")
+
+        self.service.update_users([self._user("u1", "o1", is_active=True), self._user("u1", "o1", is_active=False)])
+
+        self.assertFalse(Principal.objects.filter(tenant=bootstrapped.tenant, username="user-u1").exists())
+        self.assertEqual(0, self.tuples.count_tuples(default_group_membership))
+
+        self.service.update_users([self._user("u1", "o1", is_active=False), self._user("u1", "o1", is_active=True)])
+
+        self.assertEqual(1, self.tuples.count_tuples(default_group_membership))
+
     def test_bulk_adding_updating_users(self):
         bootstrapped = self.fixture.new_tenant(org_id="o1")
         self.tuples.clear()
@@ -404,6 +432,26 @@ class V2TenantBootstrapServiceTest(TestCase):
         # Assert no extra principals created
         self.assertEqual(3, Principal.objects.count())
 
+    def test_bulk_import_with_bootstrapped_tenants_skips_their_lookup_and_user_ids(self):
+        bootstrapped = self.fixture.new_tenant(org_id="o1")
+        Principal.objects.create(username="username1", tenant=bootstrapped.tenant)
+        self.tuples.clear()
+
+        user = User()
+        user.user_id = "u1"
+        user.username = "username1"
+        user.org_id = "o1"
+        user.admin = False
+        user.is_active = True
+
+        with patch("management.tenant_service.v2.try_lock_tenants_for_bootstrap") as lock_mock:
+            self.service.import_bulk_users([user], bootstrapped_tenants=[bootstrapped], update_user_ids=False)
+
+        lock_mock.assert_not_called()
+        self.assertIsNone(Principal.objects.get(username="username1").user_id)
+        self.assertAddedToDefaultGroup("localhost/u1", bootstrapped.mapping)
+        self.assertEqual(1, self.tuples.count_tuples())
+
     def test_force_bootstrap_replicates_already_bootstrapped_unready_tenants(self):
         bootstrapped = self.fixture.new_tenant(org_id="o1")
         self.tuples.clear()
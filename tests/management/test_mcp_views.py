@@ -23,10 +23,11 @@ from unittest.mock import patch
 from django.test import override_settings
 from django.urls import clear_url_caches
 from django.utils import timezone
-from management.mcp_views import ApiVersion, ToolConfig, _TOOL_CONFIG, _permission_matches
+from management.mcp_views import ApiVersion, MAX_BATCH_SIZE, ToolConfig, _TOOL_CONFIG, _permission_matches
 from management.models import Access, AuditLog, Group, Permission, Policy, Principal, Role
 from management.role.v2_model import RoleV2
 from management.role_binding.model import RoleBinding, RoleBindingGroup, RoleBindingPrincipal
+from management.role_binding.service import RoleBindingService
 from management.tenant_mapping.model import TenantMapping
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -489,18 +490,60 @@ class MCPViewTests(MCPToolTestMixin, IdentityRequest):
         self.assertEqual(data["error"]["code"], -32602)
         self.assertIn("arguments", data["error"]["message"])
 
-    def test_batch_request_returns_parse_error(self):
-        """Negative: JSON-RPC batch request (array) is not supported and returns -32600."""
+    def test_batch_request_returns_array_of_responses(self):
+        """Positive: JSON-RPC batch returns one response per request, skipping notifications."""
         batch = [
-            {"jsonrpc": "2.0", "method": "initialize", "id": 1, "params": {}},
-            {"jsonrpc": "2.0", "method": "tools/list", "id": 2, "params": {}},
+            {"jsonrpc": "2.0", "method": "tools/list", "id": 1, "params": {}},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "method": "tools/call", "id": 2, "params": {"name": "hello", "arguments": {}}},
+            {"jsonrpc": "2.0", "method": "unknown/method", "id": 3, "params": {}},
         ]
         response = self.client.post(self.url, data=json.dumps(batch), content_type="application/json", **self.headers)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = response.json()
-        self.assertIn("error", data)
-        self.assertNotIn("result", data)
+        self.assertEqual([item["id"] for item in data], [1, 2, 3])
+        self.assertIn("tools", data[0]["result"])
+        self.assertFalse(data[1]["result"]["isError"])
+        self.assertEqual(data[2]["error"]["code"], -32601)
+
+    def test_batch_request_reports_invalid_entries(self):
+        """Negative: invalid entries and initialize in a batch get error responses without failing the batch."""
+        batch = [
+            "not an object",
+            {"jsonrpc": "1.0", "method": "tools/list", "id": 1},
+            {"jsonrpc": "2.0", "method": "initialize", "id": 2, "params": {}},
+            {"jsonrpc": "2.0", "method": "tools/list", "id": 3, "params": {}},
+        ]
+        response = self.client.post(self.url, data=json.dumps(batch), content_type="application/json", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([item["id"] for item in data], [None, 1, 2, 3])
+        self.assertEqual([item.get("error", {}).get("code") for item in data], [-32600, -32600, -32600, None])
+
+    def test_batch_of_notifications_returns_202(self):
+        """Positive: JSON-RPC batch of notifications only returns 202."""
+        batch = [{"jsonrpc": "2.0", "method": "notifications/initialized"}]
+        response = self.client.post(self.url, data=json.dumps(batch), content_type="application/json", **self.headers)
+
+        self.assertEqual(response.status_code, 202)
+
+    def test_empty_batch_returns_invalid_request(self):
+        """Negative: an empty JSON-RPC batch returns a single -32600 error."""
+        response = self.client.post(self.url, data="[]", content_type="application/json", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["error"]["code"], -32600)
+
+    def test_oversized_batch_returns_invalid_request(self):
+        """Negative: a JSON-RPC batch over the size limit returns a single -32600 error."""
+        batch = [{"jsonrpc": "2.0", "method": "tools/list", "id": i} for i in range(MAX_BATCH_SIZE + 1)]
+        response = self.client.post(self.url, data=json.dumps(batch), content_type="application/json", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
         self.assertEqual(data["error"]["code"], -32600)
 
     def test_tools_call_invalid_params_returns_32602(self):
@@ -1699,6 +1742,74 @@ class MCPCheckUserPermissionV2Tests(MCPToolTestMixin, IdentityRequest):
         self.assertEqual(tool_output["matched_permission"], "vulnerability:vulnerability:*")
         self.assertEqual(tool_output["org_version"], "v2")
 
+    def test_v2_permission_via_child_role(self):
+        """Positive: V2 org resolves permissions of the seeded children of a bound platform role."""
+        child = RoleV2.objects.create(name="Vuln Writer", type=RoleV2.Types.SEEDED, tenant=self.tenant)
+        child.permissions.add(
+            Permission.objects.create(permission="vulnerability:vulnerability:write", tenant=self.tenant)
+        )
+        platform = RoleV2.objects.create(name="Vuln Platform", type=RoleV2.Types.PLATFORM, tenant=self.tenant)
+        platform.children.add(child)
+        platform_binding = RoleBinding.objects.create(
+            tenant=self.tenant, role=platform, resource_type="workspace", resource_id="root-workspace-id"
+        )
+        RoleBindingPrincipal.objects.create(binding=platform_binding, principal=self.principal, source="direct")
+
+        response = self._call_tool(
+            "check_user_permission",
+            {"username": self.test_username, "permission": "vulnerability:vulnerability:write"},
+        )
+
+        tool_output = self._get_tool_output(response)
+        self.assertTrue(tool_output["allowed"])
+        self.assertEqual(tool_output["role_name"], "Vuln Platform")
+
+    def test_v2_permission_requires_role_read_access(self):
+        """Permission: V2 check is refused when the caller may not read roles."""
+        with patch(
+            "management.permissions.role_v2_access.WorkspaceInventoryAccessChecker.check_resource_access",
+            return_value=False,
+        ):
+            response = self._call_tool(
+                "check_user_permission",
+                {"username": self.test_username, "permission": "vulnerability:vulnerability:read"},
+            )
+
+        tool_output = self._get_tool_output(response)
+        self.assertFalse(tool_output["allowed"])
+        self.assertIn("error", tool_output)
+
+    def test_v2_batch_resolves_roles_once(self):
+        """Positive: a batch of V2 checks for one user resolves their roles once."""
+        batch = [
+            {
+                "jsonrpc": "2.0",
+                "method": "tools/call",
+                "id": index,
+                "params": {
+                    "name": "check_user_permission",
+                    "arguments": {"username": self.test_username, "permission": permission},
+                },
+            }
+            for index, permission in enumerate(
+                ["vulnerability:vulnerability:read", "vulnerability:vulnerability:write"]
+            )
+        ]
+
+        with patch(
+            "management.mcp_views.RoleBindingService.get_roles_granted_to_principal",
+            autospec=True,
+            side_effect=RoleBindingService.get_roles_granted_to_principal,
+        ) as resolve:
+            response = self.client.post(
+                self.url, data=json.dumps(batch), content_type="application/json", **self.headers
+            )
+
+        self.assertEqual(response.status_code, 200)
+        outputs = [json.loads(item["result"]["content"][0]["text"]) for item in response.json()]
+        self.assertEqual([output["allowed"] for output in outputs], [True, False])
+        resolve.assert_called_once()
+
 
 @override_settings(BYPASS_BOP_VERIFICATION=True, V2_APIS_ENABLED=True)
 class MCPUnifiedSearchRolesV2Tests(MCPToolTestMixin, IdentityRequest):
@@ -365,6 +365,25 @@ class QuerySetTest(TestCase):
         self.assertEqual(queryset.count(), 5)
         self.assertIsNotNone(queryset.last().accessCount)
 
+    def test_get_role_queryset_counts_without_fan_out(self):
+        """Test that role counts stay exact without joining policies against access entries."""
+        role = Role.objects.create(name="counted role", tenant=self.tenant)
+        Role.objects.create(name="empty role", tenant=self.tenant)
+        for index in range(3):
+            permission = Permission.objects.create(permission=f"app:resource{index}:read", tenant=self.tenant)
+            Access.objects.create(permission=permission, role=role, tenant=self.tenant)
+        for index in range(4):
+            policy = Policy.objects.create(name=f"counted policy {index}", tenant=self.tenant)
+            policy.roles.add(role)
+        user = Mock(spec=User, admin=True)
+        req = Mock(user=user, tenant=self.tenant, query_params={})
+
+        queryset = get_role_queryset(req)
+
+        counts = {role.name: (role.policyCount, role.accessCount) for role in queryset}
+        self.assertEqual(counts, {"counted role": (4, 3), "empty role": (0, 0)})
+        self.assertNotIn("COUNT(DISTINCT", str(queryset.query))
+
     @patch(
         "management.principal.proxy.PrincipalProxy.request_filtered_principals",
         return_value={
@@ -32,7 +32,7 @@ from management.models import Workspace
 from management.permissions.system_user_utils import SystemUserAccessResult
 from management.workspace.filters import WorkspaceAccessFilterBackend
 from management.workspace.service import WorkspaceService
-from management.workspace.utils.access import filter_top_level_workspaces
+from management.workspace.utils.access import filter_workspaces_by_ids, get_ancestor_ids
 from rbac import urls
 from tests.identity_request import BaseIdentityRequest
 
@@ -512,8 +512,8 @@ class WorkspacePermissionAndFilterBackendIntegrationTests(TransactionTestCase):
         self.assertTrue(result)
 
 
-class FilterTopLevelWorkspacesTests(TransactionTestCase):
-    """Unit tests for filter_top_level_workspaces optimization."""
+class WorkspaceAccessQueryTests(TransactionTestCase):
+    """Unit tests for the workspace access query helpers."""
 
     def setUp(self):
         """Set up test fixtures with a workspace hierarchy."""
@@ -572,77 +572,33 @@ class FilterTopLevelWorkspacesTests(TransactionTestCase):
         Workspace.objects.all().delete()
         Tenant.objects.all().delete()
 
-    def test_single_workspace_is_top_level(self):
-        """Single workspace with no ancestors in set is top-level."""
-        queryset = Workspace.objects.filter(id=self.ws_a1a.id)
-        result = filter_top_level_workspaces(queryset)
-
-        self.assertEqual(list(result), [self.ws_a1a])
-
-    def test_parent_and_child_only_parent_is_top_level(self):
-        """When parent and child are in set, only parent is top-level."""
-        queryset = Workspace.objects.filter(id__in=[self.ws_a.id, self.ws_a1.id])
-        result = filter_top_level_workspaces(queryset)
-
-        result_ids = set(result.values_list("id", flat=True))
-        self.assertEqual(result_ids, {self.ws_a.id})
-
-    def test_grandparent_and_grandchild_only_grandparent_is_top_level(self):
-        """When grandparent and grandchild are in set (parent not), only grandparent is top-level."""
-        # ws_a is grandparent of ws_a1a, ws_a1 (parent) is not in set
-        queryset = Workspace.objects.filter(id__in=[self.ws_a.id, self.ws_a1a.id])
-        result = filter_top_level_workspaces(queryset)
-
-        result_ids = set(result.values_list("id", flat=True))
-        self.assertEqual(result_ids, {self.ws_a.id})
-
-    def test_siblings_both_are_top_level(self):
-        """Sibling workspaces (no ancestor relationship) are both top-level."""
-        queryset = Workspace.objects.filter(id__in=[self.ws_a.id, self.ws_b.id])
-        result = filter_top_level_workspaces(queryset)
-
-        result_ids = set(result.values_list("id", flat=True))
-        self.assertEqual(result_ids, {self.ws_a.id, self.ws_b.id})
-
-    def test_full_hierarchy_only_root_is_top_level(self):
-        """When full hierarchy is in set, only root is top-level."""
-        all_ids = [
-            self.root.id,
-            self.default.id,
-            self.ws_a.id,
-            self.ws_a1.id,
-            self.ws_a1a.id,
-            self.ws_b.id,
-        ]
-        queryset = Workspace.objects.filter(id__in=all_ids)
-        result = filter_top_level_workspaces(queryset)
-
-        result_ids = set(result.values_list("id", flat=True))
-        self.assertEqual(result_ids, {self.root.id})
-
-    def test_empty_queryset_returns_empty(self):
-        """Empty queryset returns empty result."""
-        queryset = Workspace.objects.none()
-        result = filter_top_level_workspaces(queryset)
-
-        self.assertEqual(list(result), [])
-
-    def test_multiple_branches_multiple_top_levels(self):
-        """Workspaces from different branches are all top-level."""
-        # ws_a1 and ws_b are from different branches
-        queryset = Workspace.objects.filter(id__in=[self.ws_a1.id, self.ws_b.id])
-        result = filter_top_level_workspaces(queryset)
-
-        result_ids = set(result.values_list("id", flat=True))
-        self.assertEqual(result_ids, {self.ws_a1.id, self.ws_b.id})
-
-    def test_deep_hierarchy_with_gaps(self):
-        """Workspace with ancestor in set is not top-level, even with gaps."""
-        # default -> ws_a -> ws_a1 -> ws_a1a
-        # Include default and ws_a1a (skip ws_a and ws_a1)
-        queryset = Workspace.objects.filter(id__in=[self.default.id, self.ws_a1a.id])
-        result = filter_top_level_workspaces(queryset)
-
-        result_ids = set(result.values_list("id", flat=True))
-        # Only default is top-level because ws_a1a has default as ancestor
-        self.assertEqual(result_ids, {self.default.id})
+    def test_filter_workspaces_by_ids(self):
+        """Only the workspaces with the given IDs are kept, whether given as strings or UUIDs."""
+        queryset = filter_workspaces_by_ids(Workspace.objects.all(), [str(self.ws_a.id), self.ws_b.id])
+
+        self.assertEqual(set(queryset.values_list("id", flat=True)), {self.ws_a.id, self.ws_b.id})
+        self.assertEqual(list(filter_workspaces_by_ids(Workspace.objects.all(), [])), [])
+
+    def test_ancestor_ids(self):
+        """Ancestors of every workspace in the set are returned once, including those in the set."""
+        queryset = Workspace.objects.filter(id__in=[self.ws_a1.id, self.ws_a1a.id, self.ws_b.id])
+
+        self.assertEqual(
+            get_ancestor_ids(queryset),
+            {str(self.root.id), str(self.default.id), str(self.ws_a.id), str(self.ws_a1.id)},
+        )
+        self.assertEqual(get_ancestor_ids(Workspace.objects.filter(id=self.root.id)), set())
+        self.assertEqual(get_ancestor_ids(Workspace.objects.none()), set())
+
+    def test_ancestor_ids_stop_at_tenant_boundary(self):
+        """A parent chain reaching into another tenant ends at the last ancestor within the tenant."""
+        other_tenant = Tenant.objects.create(tenant_name="other", org_id="other_org")
+        other_root = Workspace.objects.create(name="Other Root", tenant=other_tenant, type=Workspace.Types.ROOT)
+        Workspace.objects.filter(id=self.ws_a.id).update(parent=other_root)
+
+        queryset = Workspace.objects.filter(id__in=[self.ws_a1a.id, self.ws_b.id])
+
+        self.assertEqual(
+            get_ancestor_ids(queryset),
+            {str(self.root.id), str(self.default.id), str(self.ws_a.id), str(self.ws_a1.id)},
+        )
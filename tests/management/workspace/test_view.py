@@ -2723,6 +2723,19 @@ class WorkspaceTestsList(WorkspaceViewTests):
         self.assertEqual(payload.get("meta").get("count"), Workspace.objects.filter(type="standard").count())
         self.assertType(payload, "standard")
 
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    def test_workspace_export_standard(self):
+        """Export workspaces type=standard as NDJSON, filtered and ordered as on the list."""
+        client = APIClient()
+        listed = client.get(f"{reverse('v2_management:workspace-list')}?type=standard&limit=1000", **self.headers)
+        response = client.get(f"{reverse('v2_management:workspace-export')}?type=standard", **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        exported = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(exported, json.loads(listed.content)["data"])
+        self.assertType({"data": exported}, "standard")
+
     def test_workspace_list_root(self):
         """List workspaces type=root."""
         url = reverse("v2_management:workspace-list")
@@ -2954,6 +2967,34 @@ class WorkspaceTestsList(WorkspaceViewTests):
         self.assertEqual(payload.get("meta").get("count"), 1)
         self.assertEqual(payload.get("data")[0]["name"], "Sales Team Alpha")
 
+    def test_workspace_list_filter_by_name_with_special_characters(self):
+        """Test that regular expression characters in the name filter are matched literally."""
+        Workspace.objects.bulk_create(
+            [
+                Workspace(
+                    name="Sales (EMEA) v1.0+",
+                    tenant=self.tenant,
+                    type="standard",
+                    parent_id=self.default_workspace.id,
+                ),
+                Workspace(
+                    name="Sales EMEA v100",
+                    tenant=self.tenant,
+                    type="standard",
+                    parent_id=self.default_workspace.id,
+                ),
+            ]
+        )
+
+        url = reverse("v2_management:workspace-list")
+        client = APIClient()
+
+        response = client.get(url, {"name": "(emea) v1.0+"}, format="json", **self.headers)
+        payload = response.data
+        self.assertSuccessfulList(response, payload)
+        self.assertEqual(payload.get("meta").get("count"), 1)
+        self.assertEqual(payload.get("data")[0]["name"], "Sales (EMEA) v1.0+")
+
     def test_workspace_list_filter_by_name_empty_string(self):
         """Test that filtering by empty name string returns all workspaces."""
         url = reverse("v2_management:workspace-list")
@@ -0,0 +1,105 @@
+# Benchmark of the audit log list over millions of entries of a single tenant
+
+import json
+import time
+from base64 import urlsafe_b64encode
+
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from management.audit_log.partitions import create_partition, ensure_partitions, existing_partitions, month_start
+from management.models import AuditLog
+from rest_framework import status
+from rest_framework.test import APIClient
+from tests.performance.test_performance_util import build_identity
+
+from api.models import Tenant
+
+N_ENTRIES = 3_000_000
+MONTHS = 24
+N_USERNAMES = 5000
+LIMIT = 100
+REPEAT = 20
+
+ORG_ID = "11111"
+PREFIX = "perf_test"
+
+client = APIClient()
+
+identity = build_identity()
+
+
+def setUp(n_entries=N_ENTRIES):
+    """Seed audit log entries spread over the last months."""
+    print(f"Seeding {n_entries} audit log entries...")
+    tenant, _ = Tenant.objects.get_or_create(org_id=ORG_ID, defaults={"tenant_name": f"{PREFIX}_acct{ORG_ID}"})
+    existing = existing_partitions()
+    for months in range(-MONTHS - 1, 0):
+        month = month_start(timezone.now(), months)
+        if month not in existing:
+            create_partition(month)
+    ensure_partitions()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO management_auditlog (created, principal_username, description, resource_type, action, tenant_id)
+            SELECT
+                now() - (%(months)s * interval '30 days') * random(),
+                %(prefix)s || '_user_' || (i %% %(usernames)s),
+                'Benchmark entry ' || i,
+                'group',
+                'add',
+                %(tenant_id)s
+            FROM generate_series(1, %(entries)s) AS i
+            """,
+            {
+                "months": MONTHS,
+                "prefix": PREFIX,
+                "usernames": N_USERNAMES,
+                "tenant_id": tenant.id,
+                "entries": n_entries,
+            },
+        )
+        cursor.execute("ANALYZE management_auditlog")
+    print("Finished seeding audit log entries")
+
+
+def tearDown():
+    """Delete the seeded entries."""
+    print("Deleting audit log entries...")
+    AuditLog.objects.filter(principal_username__startswith=f"{PREFIX}_user_").delete()
+    print("Finished deleting audit log entries")
+
+
+def cursor_at(entry):
+    """Return the cursor of the page following the given entry."""
+    position = [entry.created.isoformat(), str(entry.id)]
+    return urlsafe_b64encode(json.dumps({"r": False, "p": position}).encode()).decode()
+
+
+def timed(name, query):
+    """Print the average time of listing the audit logs with the given query."""
+    url = f"{reverse('v1_management:auditlog-list')}?{query}"
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        response = client.get(url, **identity.META, follow=True)
+        if response.status_code != status.HTTP_200_OK:
+            raise Exception(f"Received an error status {response.status_code}\n")
+    average = (time.perf_counter() - start) / REPEAT
+    print(f"{name}: {average * 1000:.1f} ms")
+    return average
+
+
+def test_audit_log_list():
+    """Compare offset and keyset pages at increasing depths, and substring searches of the principal username."""
+    entries = AuditLog.objects.filter(tenant__org_id=ORG_ID).order_by("-created", "-id")
+    count = entries.count()
+    print(f"Listing {count} audit log entries, {LIMIT} per page, {REPEAT} requests each")
+
+    timed("First page", f"limit={LIMIT}")
+    for depth in (count // 100, count // 2, count - LIMIT):
+        timed(f"Offset {depth}", f"limit={LIMIT}&offset={depth}")
+        timed(f"Cursor {depth}", f"limit={LIMIT}&cursor={cursor_at(entries[depth - 1])}")
+
+    timed("Username substring", f"limit={LIMIT}&principal_username=user_123")
+    timed("Username exact", f"limit={LIMIT}&principal_username={PREFIX}_user_1234&name_match=exact")
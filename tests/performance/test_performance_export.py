@@ -0,0 +1,91 @@
+# Benchmark of exporting every group of a large tenant, page by page and in one streamed export
+
+import time
+import tracemalloc
+
+from django.db import connection
+from django.urls import reverse
+from management.models import Group
+from rest_framework import status
+from rest_framework.test import APIClient
+from tests.performance.test_performance_util import build_identity
+
+from api.models import Tenant
+
+N_GROUPS = 100_000
+LIMIT = 1000
+
+ORG_ID = "11111"
+PREFIX = "perf_test"
+
+client = APIClient()
+
+identity = build_identity()
+
+
+def setUp(n_groups=N_GROUPS):
+    """Seed groups in a single tenant."""
+    print(f"Seeding {n_groups} groups...")
+    tenant, _ = Tenant.objects.get_or_create(org_id=ORG_ID, defaults={"tenant_name": f"{PREFIX}_acct{ORG_ID}"})
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO management_group
+                (uuid, name, description, created, modified, platform_default, system, admin_default, tenant_id)
+            SELECT gen_random_uuid(), %(prefix)s || '_group_' || i, 'Benchmark group ' || i, now(), now(),
+                false, false, false, %(tenant_id)s
+            FROM generate_series(1, %(groups)s) AS i
+            """,
+            {"prefix": PREFIX, "tenant_id": tenant.id, "groups": n_groups},
+        )
+        cursor.execute("ANALYZE management_group")
+    print("Finished seeding groups")
+
+
+def tearDown():
+    """Delete the seeded groups."""
+    print("Deleting groups...")
+    Group.objects.filter(tenant__org_id=ORG_ID, name__startswith=f"{PREFIX}_group_").delete()
+    print("Finished deleting groups")
+
+
+def timed(name, run):
+    """Print the time and peak traced memory of the given function."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {rows} groups in {elapsed:.1f} s, peak memory {peak / 2**20:.1f} MiB")
+    return elapsed
+
+
+def page_through():
+    """Read every group through the paginated list."""
+    url = f"{reverse('v1_management:group-list')}?limit={LIMIT}"
+    rows = 0
+    while url:
+        response = client.get(url, **identity.META)
+        if response.status_code != status.HTTP_200_OK:
+            raise Exception(f"Received an error status {response.status_code}\n")
+        rows += len(response.data["data"])
+        url = response.data["links"]["next"]
+    return rows
+
+
+def export():
+    """Read every group through the streamed export."""
+    response = client.get(reverse("v1_management:group-export"), **identity.META)
+    if response.status_code != status.HTTP_200_OK:
+        raise Exception(f"Received an error status {response.status_code}\n")
+    return sum(chunk.count(b"\n") for chunk in response.streaming_content)
+
+
+def test_group_export():
+    """Compare reading all the groups of a tenant page by page and in one export."""
+    count = Group.objects.filter(tenant__org_id=ORG_ID).count()
+    print(f"Reading {count} groups, {LIMIT} per page or in one export")
+
+    timed("Pages", page_through)
+    timed("Export", export)
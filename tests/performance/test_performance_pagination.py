@@ -0,0 +1,44 @@
+# Benchmark of reading a deep page of a large group list with offsets and cursors, counted exactly and estimated
+
+import json
+import time
+from base64 import urlsafe_b64encode
+
+from django.urls import reverse
+from management.models import Group
+from rest_framework import status
+from tests.performance.test_performance_export import ORG_ID, client, identity, setUp, tearDown  # noqa: F401
+
+LIMIT = 10
+RUNS = 20
+
+
+def cursor_after(group):
+    """Return the cursor of the page following the given group in the name ordering."""
+    cursor = {"r": False, "p": [group.name, str(group.id)]}
+    return urlsafe_b64encode(json.dumps(cursor).encode("ascii")).decode("ascii")
+
+
+def timed(name, url):
+    """Print the average time of reading the given page."""
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        response = client.get(url, **identity.META)
+        if response.status_code != status.HTTP_200_OK:
+            raise Exception(f"Received an error status {response.status_code}\n")
+    elapsed = (time.perf_counter() - start) / RUNS
+    print(f"{name}: {elapsed * 1000:.1f} ms, count {response.data['meta']['count']}")
+
+
+def test_group_pagination():
+    """Compare reading a page at the end of the group list by offset and by cursor, with exact and estimated counts."""
+    groups = Group.objects.filter(tenant__org_id=ORG_ID).order_by("name", "id")
+    offset = groups.count() - LIMIT
+    url = f"{reverse('v1_management:group-list')}?limit={LIMIT}&order_by=name"
+    cursor = cursor_after(groups[offset - 1])
+    print(f"Reading {LIMIT} groups at offset {offset}, {RUNS} times each")
+
+    timed("Offset, exact count", f"{url}&offset={offset}")
+    timed("Offset, estimated count", f"{url}&offset={offset}&count=estimated")
+    timed("Cursor, exact count", f"{url}&cursor={cursor}")
+    timed("Cursor, estimated count", f"{url}&cursor={cursor}&count=estimated")
@@ -0,0 +1,95 @@
+# Benchmark of filtering the workspace list to the workspaces a principal can access
+
+import re
+import time
+
+from django.db import connection, transaction
+from management.models import Workspace
+from management.relation_replicator.noop_replicator import NoopReplicator
+from management.tenant_service.v2 import V2TenantBootstrapService
+from management.workspace.utils.access import filter_workspaces_by_ids, get_ancestor_ids
+
+from api.models import Tenant
+
+N_WORKSPACES = 100_000
+PERMITTED = (10_000, 100_000)
+LIMIT = 10
+REPEAT = 20
+
+ORG_ID = "11112"
+PREFIX = "perf_ws"
+
+
+def setUp(n_workspaces=N_WORKSPACES):
+    """Seed standard workspaces in two levels under the default workspace of a tenant."""
+    print(f"Seeding {n_workspaces} workspaces...")
+    tenant, _ = Tenant.objects.get_or_create(org_id=ORG_ID, defaults={"tenant_name": f"{PREFIX}_acct{ORG_ID}"})
+    with transaction.atomic():
+        V2TenantBootstrapService(NoopReplicator()).bootstrap_tenant(tenant)
+    default = Workspace.objects.default(tenant=tenant)
+    with connection.cursor() as cursor:
+        # One in a hundred workspaces is a parent of the following ninety-nine.
+        cursor.execute(
+            """
+            INSERT INTO management_workspace (id, name, description, type, tenant_id, parent_id, created, modified)
+            SELECT
+                md5(%(prefix)s || i)::uuid,
+                %(prefix)s || '_' || i,
+                '',
+                'standard',
+                %(tenant_id)s,
+                CASE WHEN i %% 100 = 0 THEN %(default_id)s::uuid ELSE md5(%(prefix)s || (i - i %% 100))::uuid END,
+                now(),
+                now()
+            FROM generate_series(0, %(workspaces)s - 1) AS i
+            ORDER BY i %% 100 <> 0, i
+            """,
+            {"prefix": PREFIX, "tenant_id": tenant.id, "default_id": str(default.id), "workspaces": n_workspaces},
+        )
+        cursor.execute("ANALYZE management_workspace")
+    print("Finished seeding workspaces")
+
+
+def tearDown():
+    """Delete the seeded workspaces."""
+    print("Deleting workspaces...")
+    workspaces = Workspace.objects.filter(tenant__org_id=ORG_ID, name__startswith=f"{PREFIX}_")
+    workspaces.update(parent=None)
+    workspaces.delete()
+    print("Finished deleting workspaces")
+
+
+def timed(name, run):
+    """Print the average time of the given function."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        run()
+    average = (time.perf_counter() - start) / REPEAT
+    print(f"{name}: {average * 1000:.1f} ms")
+    return average
+
+
+def list_page(queryset):
+    """Count the queryset and load its first page, as the paginated list does."""
+    queryset.count()
+    list(queryset.order_by("name")[:LIMIT])
+
+
+def test_workspace_access_filter():
+    """Compare filtering by an IN list and by an unnested array, with and without a name search."""
+    workspaces = Workspace.objects.filter(tenant__org_id=ORG_ID)
+    all_ids = [str(workspace_id) for workspace_id in workspaces.order_by("id").values_list("id", flat=True)]
+    name = "ws_123"
+
+    for permitted in PERMITTED:
+        ids = all_ids[:permitted]
+        print(f"Listing {len(ids)} permitted workspaces of {len(all_ids)}, {LIMIT} per page, {REPEAT} times each")
+
+        timed("IN list", lambda: list_page(workspaces.filter(id__in=ids)))
+        timed("Array join", lambda: list_page(filter_workspaces_by_ids(workspaces, ids)))
+        timed("IN list, name icontains", lambda: list_page(workspaces.filter(id__in=ids, name__icontains=name)))
+        timed(
+            "Array join, name iregex",
+            lambda: list_page(filter_workspaces_by_ids(workspaces, ids).filter(name__iregex=re.escape(name))),
+        )
+        timed("Ancestors", lambda: get_ancestor_ids(filter_workspaces_by_ids(workspaces, ids)))
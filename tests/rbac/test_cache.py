@@ -57,37 +57,44 @@ class AccessCacheTest(TestCase):
         self.tenant.delete()
         super().tearDownClass()
 
+    @patch("management.group.model.AccessCache.delete_policies")
     @patch("management.group.model.AccessCache.delete_policy")
-    def test_group_cache_add_remove_signals(self, cache):
+    def test_group_cache_add_remove_signals(self, cache, cache_many):
         """Test signals attached to Groups"""
         cache.reset_mock()
 
         # If a Principal is added to a group
         self.group_a.principals.add(self.principal_a)
 
-        cache.assert_called_once()
-        cache.assert_called_once_with(self.principal_a.uuid)
+        cache_many.assert_called_once_with([self.principal_a.uuid])
 
-        cache.reset_mock()
+        cache_many.reset_mock()
         # If a Group is added to a Principal
         self.principal_b.group.add(self.group_a)
-        cache.asset_called_once()
-        cache.asset_called_once_with(self.principal_b.uuid)
+        cache.assert_called_once_with(self.principal_b.uuid)
 
         cache.reset_mock()
         # If a Principal is removed from a group
         self.group_a.principals.remove(self.principal_a)
-        cache.assert_called_once()
-        cache.assert_called_once_with(self.principal_a.uuid)
+        cache_many.assert_called_once_with([self.principal_a.uuid])
 
-        cache.reset_mock()
+        cache_many.reset_mock()
         # If a Group is removed from a Principal
         self.principal_b.group.remove(self.group_a)
-        cache.asset_called_once()
-        cache.asset_called_once_with(self.principal_b.uuid)
+        cache.assert_called_once_with(self.principal_b.uuid)
+        cache_many.assert_not_called()
 
+    @patch("management.group.model.AccessCache.delete_policies")
+    def test_group_cache_add_many_signal(self, cache_many):
+        """Test that adding several Principals to a group purges their policies at once."""
+        self.group_a.principals.add(self.principal_a, self.principal_b)
+
+        cache_many.assert_called_once()
+        self.assertCountEqual(cache_many.call_args[0][0], [self.principal_a.uuid, self.principal_b.uuid])
+
+    @patch("management.group.model.AccessCache.delete_policies")
     @patch("management.group.model.AccessCache.delete_policy")
-    def test_group_cache_clear_signals(self, cache):
+    def test_group_cache_clear_signals(self, cache, cache_many):
         # If all groups are removed from a Principal
         self.group_a.principals.add(self.principal_a, self.principal_b)
         cache.reset_mock()
@@ -95,19 +102,18 @@ class AccessCacheTest(TestCase):
         cache.assert_called_once()
         cache.assert_called_once_with(self.principal_a.uuid)
 
-        cache.reset_mock()
+        cache_many.reset_mock()
         # If all Principals are removed from a Group
         self.group_a.principals.clear()
-        cache.asset_called_once()
-        cache.asset_called_once_with(self.principal_b.uuid)
+        cache_many.assert_called_once_with([self.principal_b.uuid])
 
-    @patch("management.group.model.AccessCache.delete_policy")
-    def test_group_cache_delete_group_signal(self, cache):
+    @patch("management.group.model.AccessCache.delete_policies")
+    def test_group_cache_delete_group_signal(self, cache_many):
         self.group_a.principals.add(self.principal_a)
-        cache.reset_mock()
+        cache_many.reset_mock()
         self.group_a.delete()
-        cache.assert_called_once()
-        cache.assert_called_once_with(self.principal_a.uuid)
+        cache_many.assert_called_once()
+        cache_many.assert_called_once_with([self.principal_a.uuid])
 
     @patch("management.policy.model.AccessCache.delete_all_policies_for_tenant")
     @patch("management.policy.model.AccessCache.delete_policy")
@@ -0,0 +1,95 @@
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the database connection settings and metrics."""
+
+import os
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from rbac import database
+from rbac.db_connections import (
+    connection_created_handler,
+    db_connections,
+    db_connections_created_total,
+    request_finished_handler,
+    request_started_handler,
+)
+
+
+class DatabaseConnectionOptionsTest(SimpleTestCase):
+    """Tests for the persistent connection options."""
+
+    def test_defaults(self):
+        """Test that connections are closed per request by default but health checked when reused."""
+        options = database.connection_options()
+        self.assertEqual(options["CONN_MAX_AGE"], 0)
+        self.assertTrue(options["CONN_HEALTH_CHECKS"])
+        self.assertFalse(options["DISABLE_SERVER_SIDE_CURSORS"])
+
+    @patch.dict(
+        os.environ,
+        {
+            "DATABASE_CONN_MAX_AGE": "60",
+            "DATABASE_CONN_HEALTH_CHECKS": "False",
+            "DATABASE_DISABLE_SERVER_SIDE_CURSORS": "True",
+        },
+    )
+    def test_configured(self):
+        """Test that the options are read from the environment."""
+        options = database.connection_options()
+        self.assertEqual(options["CONN_MAX_AGE"], 60)
+        self.assertFalse(options["CONN_HEALTH_CHECKS"])
+        self.assertTrue(options["DISABLE_SERVER_SIDE_CURSORS"])
+
+    def test_config_includes_connection_options(self):
+        """Test that the database config carries the connection options."""
+        self.assertIn("CONN_MAX_AGE", database.config())
+
+
+class DatabaseConnectionMetricsTest(SimpleTestCase):
+    """Tests for the connection gauges."""
+
+    def gauge(self, state):
+        """Return the current value of the gauge for a state."""
+        return db_connections.labels(state=state)._value.get()
+
+    def test_connection_lifecycle(self):
+        """Test that a connection moves between active, idle and closed across requests."""
+        wrapper = Mock(connection=object())
+        active, idle = self.gauge("active"), self.gauge("idle")
+        created = db_connections_created_total._value.get()
+
+        with patch("rbac.db_connections.connections") as connections:
+            connections.all.return_value = [wrapper]
+
+            connection_created_handler(connection=wrapper)
+            self.assertEqual(self.gauge("active"), active + 1)
+            self.assertEqual(db_connections_created_total._value.get(), created + 1)
+
+            request_finished_handler()
+            self.assertEqual(self.gauge("active"), active)
+            self.assertEqual(self.gauge("idle"), idle + 1)
+
+            request_started_handler()
+            self.assertEqual(self.gauge("active"), active + 1)
+            self.assertEqual(self.gauge("idle"), idle)
+
+            wrapper.connection = None
+            request_finished_handler()
+            self.assertEqual(self.gauge("active"), active)
+            self.assertEqual(self.gauge("idle"), idle)